@@ -1,26 +1,63 @@
 # dashboard_defense_usa_avance.py
-import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import closing, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import MappingProxyType
+import argparse
+import bisect
+import functools
+import gzip
+import hashlib
+import importlib
+import inspect
+import json
+import platform
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+import unicodedata
+import urllib.parse
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configuration de la page
-st.set_page_config(
-    page_title="Analyse Stratégique Avancée - États-Unis",
-    page_icon="🇺🇸",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+
+class _ModuleDiffere:
+    """Module importé au premier accès à l'un de ses attributs (démarrage à froid plus rapide)"""
+
+    def __init__(self, nom):
+        self._nom = nom
+        self._module = None
+
+    def __getattr__(self, attribut):
+        if self._module is None:
+            self._module = importlib.import_module(self._nom)
+        return getattr(self._module, attribut)
+
+
+# Modules lourds chargés seulement quand une section en a besoin
+st = _ModuleDiffere('streamlit')
+px = _ModuleDiffere('plotly.express')
+go = _ModuleDiffere('plotly.graph_objects')
+MODULES_DIFFERES = ['streamlit', 'plotly.express', 'plotly.graph_objects', 'plotly.subplots']
+
+
+def make_subplots(*args, **kwargs):
+    """plotly.subplots.make_subplots, importé au premier appel"""
+    return importlib.import_module('plotly.subplots').make_subplots(*args, **kwargs)
 
 # CSS personnalisé avancé
-st.markdown("""
+CSS_PERSONNALISE = """
 <style>
     .main-header {
         font-size: 2.8rem;
@@ -92,14 +129,1710 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+def configure_page():
+    """Configuration de la page et CSS, appliqués au lancement Streamlit (pas à l'import)"""
+    st.set_page_config(
+        page_title="Analyse Stratégique Avancée - États-Unis",
+        page_icon="🇺🇸",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CSS_PERSONNALISE, unsafe_allow_html=True)
+
+
+# Année d'origine des simulations (t = annee - ANNEE_ORIGINE)
+ANNEE_ORIGINE = 2000
+
+# Séries linéaires bornées : valeur = origine + pente * (annee - 2000), bornée par [plancher, plafond]
+SERIES_LINEAIRES = {
+    'PIB_Militaire_Pourcent': (3.0, 0.08, -np.inf, np.inf),
+    'Temps_Mobilisation_Jours': (30, -1.0, 7, np.inf),
+    'Developpement_Technologique': (80, 1.5, -np.inf, 95),
+    'Capacite_Navale': (85, 1.0, -np.inf, 95),
+    'Couverture_AD': (80, 1.2, -np.inf, 94),
+    'Cooperation_Alliances': (75, 1.0, -np.inf, 92),
+    'Cyber_Capabilities': (85, 1.8, -np.inf, 96),
+    'Production_Armements': (80, 1.5, -np.inf, 94),
+    'Partenariats_Strategiques': (60, 1.5, -np.inf, 88),
+    'Bases_Etrangeres': (700, 5, -np.inf, 800),
+    'Stock_Ogives_Nucleaires': (7000, -50, -np.inf, 5800),
+    'Portee_Missiles_Km': (12000, 100, -np.inf, 15000),
+    'Triade_Nucleaire': (95, 0.2, -np.inf, 98),
+    'Porte_Avions': (11, 0.1, -np.inf, 12),
+    'Sous_Marins': (70, 0.5, -np.inf, 75),
+    'Projection_Maritime': (90, 0.5, -np.inf, 96),
+    'Recherche_Defense': (85, 1.0, -np.inf, 95),
+    'Technologies_Emergentes': (80, 1.8, -np.inf, 94),
+    'Exportations_Armes': (15, 0.8, -np.inf, 35),
+}
+
+# Indicateurs calculés pour toutes les sélections, dans l'ordre des colonnes
+INDICATEURS_COMMUNS = [
+    'Budget_Defense_Mds', 'Personnel_Milliers', 'PIB_Militaire_Pourcent',
+    'Exercices_Militaires', 'Readiness_Operative', 'Capacite_Dissuasion',
+    'Temps_Mobilisation_Jours', 'Exercices_Conjoints', 'Developpement_Technologique',
+    'Capacite_Navale', 'Couverture_AD', 'Cooperation_Alliances',
+    'Cyber_Capabilities', 'Production_Armements'
+]
+
+# Indicateurs spécifiques ajoutés selon les priorités de la configuration
+INDICATEURS_PRIORITES = {
+    'nucleaire': ['Stock_Ogives_Nucleaires', 'Portee_Missiles_Km', 'Triade_Nucleaire'],
+    'marine': ['Porte_Avions', 'Sous_Marins', 'Projection_Maritime'],
+    'innovation': ['Recherche_Defense', 'Technologies_Emergentes', 'Exportations_Armes'],
+    'alliances': ['Exercices_OTAN', 'Partenariats_Strategiques', 'Bases_Etrangeres'],
+}
+
+# Indicateurs que la table d'événements peut viser
+INDICATEURS_CONNUS = tuple(dict.fromkeys(INDICATEURS_COMMUNS + [nom for colonnes in INDICATEURS_PRIORITES.values()
+                                                                  for nom in colonnes]))
+
+
+# Paramètres des scénarios de simulation : multiplicateur du taux de croissance budgétaire,
+# choc budgétaire et renforcements (préparation, dissuasion) à partir de l'année du choc
+SCENARIOS = {
+    "Leadership Global": {
+        'croissance_budget': 1.0, 'annee_choc': np.inf, 'choc_budget': 1.0,
+        'bonus_readiness': 0, 'plafond_readiness': 95,
+        'bonus_dissuasion': 0, 'plafond_dissuasion': 96
+    },
+    "Compétition Grandes Puissances": {
+        'croissance_budget': 1.15, 'annee_choc': 2018, 'choc_budget': 1.05,
+        'bonus_readiness': 1, 'plafond_readiness': 96,
+        'bonus_dissuasion': 1, 'plafond_dissuasion': 97
+    },
+    "Guerre Limitée": {
+        'croissance_budget': 1.10, 'annee_choc': 2022, 'choc_budget': 1.20,
+        'bonus_readiness': 3, 'plafond_readiness': 98,
+        'bonus_dissuasion': 1, 'plafond_dissuasion': 97
+    },
+    "Défense Avancée": {
+        'croissance_budget': 1.25, 'annee_choc': 2020, 'choc_budget': 1.10,
+        'bonus_readiness': 2, 'plafond_readiness': 97,
+        'bonus_dissuasion': 2, 'plafond_dissuasion': 98
+    }
+}
+
+SCENARIO_DEFAUT = "Leadership Global"
+
+# Écarts-types relatifs (bases, croissance) et absolu (niveaux, en points) du mode Monte Carlo
+INCERTITUDE_DEFAUT = {'bases': 0.05, 'croissance': 0.10, 'niveaux': 1.0}
+
+# Indicateurs des graphiques multidimensionnels qui reçoivent des bandes d'incertitude
+INDICATEURS_BANDES = [
+    'Readiness_Operative', 'Capacite_Dissuasion', 'Cyber_Capabilities', 'Cooperation_Alliances',
+    'Exercices_Conjoints', 'Exercices_OTAN', 'Partenariats_Strategiques'
+]
+
+# Indicateurs de la comparaison des scénarios
+INDICATEURS_COMPARAISON = ['Budget_Defense_Mds', 'Readiness_Operative', 'Capacite_Dissuasion']
+
+# Événements et régimes géopolitiques, appliqués aux indicateurs sur des années civiles [Début, Fin]
+# (Fin = inf ou vide : sans limite). Effet 'multiplicatif' (facteur) ou 'additif' (terme). Cumul avec les
+# autres événements du même indicateur couvrant la même année :
+#   'cumul'    : les effets se composent (produit des facteurs, somme des termes)
+#   'exclusif' : dans le Groupe, seul le premier événement de la table qui couvre l'année s'applique
+#   'max'      : dans le Groupe, seul l'effet le plus fort s'applique
+# Exposé = 1 : l'effet est modulé par l'exposition de l'entité (facteur ** e, terme * e).
+# Remplaçable sans modifier le code via DASHBOARD_REFERENCES (evenements.csv, .parquet ou table SQLite).
+EVENEMENTS_DEFAUT = {
+    'Événement': ["Guerre contre le terrorisme", "Crise financière", "Pivot vers l'Asie",
+                  # Couverts par le pivot, prioritaire dans le même groupe exclusif (régimes historiques) :
+                  # passer leur cumul à 'cumul' les rend actifs
+                  "Compétition stratégique", "Soutien Ukraine",
+                  "Post-11 septembre", "Réorientation stratégique", "Modernisation",
+                  "Guerre contre le terrorisme", "Compétition grandes puissances"],
+    'Indicateur': ['Budget_Defense_Mds'] * 5 + ['Readiness_Operative'] * 3 + ['Capacite_Dissuasion'] * 2,
+    'Début': [2001, 2008, 2014, 2018, 2022, 2001, 2014, 2020, 2001, 2018],
+    'Fin': [2003, 2010, np.inf, np.inf, np.inf, np.inf, np.inf, np.inf, np.inf, np.inf],
+    'Effet': ['multiplicatif'] * 5 + ['additif'] * 5,
+    'Valeur': [1.25, 0.95, 1.08, 1.12, 1.15, 5, 3, 2, 2, 3],
+    'Cumul': ['exclusif'] * 5 + ['cumul'] * 5,
+    'Groupe': ['regimes_budget'] * 5 + ['paliers_readiness'] * 3 + ['paliers_dissuasion'] * 2,
+    'Exposé': [1] * 5 + [0] * 5,
+}
+
+
+class TableEvenements:
+    """Table d'événements compilée une fois en vecteurs d'effets par année civile, lus en O(années)
+
+    Chaque indicateur concerné reçoit quatre vecteurs sur [premiere, derniere] : facteurs et termes
+    additifs, modulés ou non par l'exposition de l'entité. Au-delà de cette plage, la valeur du bord
+    s'applique : aucun événement n'y commence ni n'y finit. Le coût d'évaluation ne dépend donc pas
+    du nombre d'événements.
+    """
+    EFFETS = ('multiplicatif', 'additif')
+    CUMULS = ('cumul', 'exclusif', 'max')
+
+    @classmethod
+    def valider(cls, table):
+        """Table normalisée (Fin vide : sans limite) ; ValueError si une valeur ne peut pas être compilée"""
+        df = pd.DataFrame(table).reset_index(drop=True)
+        df['Fin'] = pd.to_numeric(df['Fin']).fillna(np.inf)
+        for colonne, valides in (('Effet', cls.EFFETS), ('Cumul', cls.CUMULS),
+                                 ('Indicateur', INDICATEURS_CONNUS)):
+            inconnus = sorted(set(df[colonne]) - set(valides))
+            if inconnus:
+                raise ValueError(f"evenements.{colonne} : valeurs inconnues {inconnus} (attendu : {', '.join(valides)})")
+        for (indicateur, groupe), lignes in df.groupby(['Indicateur', 'Groupe'], sort=False):
+            cumuls = set(lignes['Cumul'])
+            if len(cumuls) > 1:
+                raise ValueError(f"evenements : règles de cumul mélangées {sorted(cumuls)} "
+                                 f"dans le groupe {groupe!r} de {indicateur}")
+            # 'max' compare les valeurs : facteurs et termes additifs ne sont pas comparables
+            if cumuls == {'max'} and lignes['Effet'].nunique() > 1:
+                raise ValueError(f"evenements : effets mélangés dans le groupe 'max' {groupe!r} de {indicateur}")
+        return df
+
+    def __init__(self, table):
+        df = self.valider(table)
+        debuts = df['Début'].to_numpy(dtype=float)
+        fins = df['Fin'].to_numpy(dtype=float)
+        bornes = np.concatenate([debuts[np.isfinite(debuts)], fins[np.isfinite(fins)] + 1])
+        self.premiere = int(bornes.min()) - 1 if len(bornes) else ANNEE_ORIGINE
+        self.derniere = int(bornes.max()) if len(bornes) else ANNEE_ORIGINE
+        annees = np.arange(self.premiere, self.derniere + 1)
+        couvertures = (annees >= debuts[:, None]) & (annees <= fins[:, None])  # (événements, années)
+        valeurs = df['Valeur'].to_numpy(dtype=float)
+        effets = df['Effet'].to_numpy()
+        exposes = df['Exposé'].to_numpy(dtype=float) != 0
+        
+        self.vecteurs = {}
+        for (indicateur, _), lignes in df.groupby(['Indicateur', 'Groupe'], sort=False):
+            vecteurs = self.vecteurs.setdefault(indicateur, {
+                'facteur_expose': np.ones(len(annees)), 'facteur': np.ones(len(annees)),
+                'terme_expose': np.zeros(len(annees)), 'terme': np.zeros(len(annees))})
+            k = lignes.index.to_numpy()
+            couverture = couvertures[k]
+            cumul = lignes['Cumul'].iloc[0]
+            if cumul == 'cumul':
+                # Chaque événement s'applique sur ses années, indépendamment des autres
+                actives = couverture
+            else:
+                # Un seul événement par année : le premier de la table ('exclusif') ou le plus fort ('max'),
+                # choisi avant de regarder son effet
+                if cumul == 'exclusif':
+                    gagnant = couverture.argmax(axis=0)
+                else:
+                    gagnant = np.where(couverture, valeurs[k, None], -np.inf).argmax(axis=0)
+                actives = (np.arange(len(k))[:, None] == gagnant) & couverture.any(axis=0)
+            for effet in self.EFFETS:
+                neutre = 1.0 if effet == 'multiplicatif' else 0.0
+                for expose in (True, False):
+                    masque = (effets[k] == effet) & (exposes[k] == expose)
+                    if masque.any():
+                        contributions = np.where(actives[masque], valeurs[k][masque, None], neutre)
+                        self._appliquer(vecteurs, effet, expose, contributions.prod(axis=0)
+                                        if effet == 'multiplicatif' else contributions.sum(axis=0))
+        self.vecteurs = {indicateur: tuple(v[cle] for cle in ('facteur_expose', 'facteur', 'terme_expose', 'terme'))
+                         for indicateur, v in self.vecteurs.items()}
+
+    def concerne(self, indicateur):
+        """Vrai si au moins un événement de la table porte sur l'indicateur"""
+        return indicateur in self.vecteurs
+
+    @staticmethod
+    def _appliquer(vecteurs, effet, expose, effets):
+        suffixe = '_expose' if expose else ''
+        if effet == 'multiplicatif':
+            vecteurs['facteur' + suffixe] *= effets
+        else:
+            vecteurs['terme' + suffixe] += effets
+
+    def appliquer(self, indicateur, valeurs, annees, exposition=1.0):
+        """valeurs x facteurs + termes des événements couvrant chaque année civile de annees"""
+        vecteurs = self.vecteurs.get(indicateur)
+        if vecteurs is None:
+            return valeurs
+        idx = np.clip(np.floor(annees).astype(np.int64) - self.premiere, 0, self.derniere - self.premiere)
+        facteur_expose, facteur, terme_expose, terme = (v[idx] for v in vecteurs)
+        # x ** 1 et x * 1 sont exacts : sans exposition explicite, les résultats sont ceux des paliers historiques
+        return valeurs * facteur_expose ** exposition * facteur + (terme_expose * exposition + terme)
+
+
+# Table compilée du process, recompilée quand le jeu de référence 'evenements' change de version
+_EVENEMENTS_COMPILES = (None, None)
+_VERROU_EVENEMENTS = threading.Lock()
+
+
+def table_evenements():
+    """Table d'événements courante, compilée une fois par version"""
+    global _EVENEMENTS_COMPILES
+    version = VERSIONS_REFERENCE.get('evenements', 0)
+    compilee_version, table = _EVENEMENTS_COMPILES
+    if compilee_version != version:
+        with _VERROU_EVENEMENTS:
+            compilee_version, table = _EVENEMENTS_COMPILES
+            if compilee_version != version:
+                table = TableEvenements(DONNEES_REFERENCE['evenements'])
+                _EVENEMENTS_COMPILES = (version, table)
+    return table
+
+
+class MoteurSimulation:
+    """Moteur de simulation vectorisé : évalue les séries sur un tableau d'années (ou de périodes fractionnaires)"""
+
+    def __init__(self, series_lineaires=None, evenements=None):
+        series_lineaires = SERIES_LINEAIRES if series_lineaires is None else series_lineaires
+        # Table d'événements propre au moteur ; par défaut, celle du process (rechargeable)
+        self._evenements = None if evenements is None else TableEvenements(evenements)
+        self.noms_lineaires = list(series_lineaires)
+        self.index_lineaire = {nom: i for i, nom in enumerate(self.noms_lineaires)}
+        params = np.array([series_lineaires[nom] for nom in self.noms_lineaires], dtype=float)
+        # Colonnes (n_series, 1) pour diffuser sur l'axe des années
+        self.origines, self.pentes, self.planchers, self.plafonds = (params[:, [k]] for k in range(4))
+
+    @property
+    def evenements(self):
+        return self._evenements or table_evenements()
+
+    @staticmethod
+    def indicateurs(config):
+        """Liste ordonnée des indicateurs produits pour une configuration"""
+        noms = list(INDICATEURS_COMMUNS)
+        priorites = config.get('priorites', [])
+        for priorite, colonnes in INDICATEURS_PRIORITES.items():
+            if priorite in priorites:
+                noms.extend(colonnes)
+        return noms
+
+    def series_lineaires(self, annees, noms=None):
+        """Matrice (séries x années) des séries linéaires bornées, en une seule opération
+
+        Les séries visées par la table d'événements passent par serie, seul point d'application des événements.
+        """
+        t = np.asarray(annees, dtype=float) - ANNEE_ORIGINE
+        if noms is None:
+            noms = self.noms_lineaires
+            origines, pentes, planchers, plafonds = self.origines, self.pentes, self.planchers, self.plafonds
+        else:
+            idx = [self.index_lineaire[nom] for nom in noms]
+            origines, pentes, planchers, plafonds = (
+                self.origines[idx], self.pentes[idx], self.planchers[idx], self.plafonds[idx]
+            )
+        matrice = np.clip(origines + pentes * t, planchers, plafonds)
+        evenements = self.evenements
+        for i, nom in enumerate(noms):
+            if evenements.concerne(nom):
+                matrice[i] = self.serie(nom, annees, {})
+        return matrice
+
+    @staticmethod
+    def periodes(annee_debut, annee_fin, granularite=1):
+        """Périodes de [annee_debut, annee_fin] : années entières, ou années fractionnaires (granularite pas par an)"""
+        if granularite == 1:
+            return np.arange(annee_debut, annee_fin + 1)
+        return annee_debut + np.arange((annee_fin - annee_debut + 1) * granularite) / granularite
+
+    @staticmethod
+    def parametres(config, scenario=None):
+        """Paramètres scalaires d'une configuration sous un scénario"""
+        p = dict(SCENARIOS[scenario or SCENARIO_DEFAUT])
+        p['budget_base'] = config.get('budget_base', 850.0)
+        p['personnel_base'] = config.get('personnel_base', 1346)
+        p['exercices_base'] = config.get('exercices_base', 280)
+        # Paramètres propres à une entité (pays) : neutres pour les configurations historiques
+        p['croissance_budget'] = p['croissance_budget'] * config.get('croissance_budget', 1.0)
+        p['exposition_regimes'] = config.get('exposition_regimes', 1.0)
+        p['decalage_niveau'] = config.get('decalage_niveau', 0.0)
+        return p
+
+    def parametres_lot(self, configs, scenarios):
+        """Paramètres en tableaux (scénarios, configurations, 1) pour l'évaluation par lot"""
+        grille = [[self.parametres(config, scenario) for config in configs] for scenario in scenarios]
+        return {cle: np.array([[p[cle] for p in ligne] for ligne in grille], dtype=float)[..., None]
+                for cle in grille[0][0]}
+
+    # Formules des indicateurs non linéaires, avant événements et plafonds du scénario (voir serie)
+
+    def _budget(self, annees, p):
+        """Budget : croissance et choc propres au scénario"""
+        base = p['budget_base'] * (1 + 0.045 * p['croissance_budget'] * (annees - ANNEE_ORIGINE))
+        return base * np.where(annees >= p['annee_choc'], p['choc_budget'], 1.0)
+
+    def _personnel(self, annees, p):
+        """Effectifs en croissance lente"""
+        return p['personnel_base'] * (1 + 0.003 * (annees - ANNEE_ORIGINE))
+
+    def _exercices(self, annees, p):
+        """Exercices militaires avec saisonnalité"""
+        t = annees - ANNEE_ORIGINE
+        return p['exercices_base'] + 8 * t + 12 * np.sin(2 * np.pi * t / 4)
+
+    def _readiness(self, annees, p):
+        """Préparation opérationnelle : niveau de base, renforcé à partir du choc du scénario"""
+        return 85.0 + p['bonus_readiness'] * (annees >= p['annee_choc']) + p['decalage_niveau']
+
+    def _dissuasion(self, annees, p):
+        """Dissuasion : niveau de base, renforcé à partir du choc du scénario"""
+        return 90.0 + p['bonus_dissuasion'] * (annees >= p['annee_choc']) + p['decalage_niveau']
+
+    def _exercices_conjoints(self, annees, p):
+        """Exercices conjoints : trois régimes successifs"""
+        return p.get('facteur_exercices', 1.0) * np.select(
+            [annees < 2001, annees < 2010],
+            [np.full_like(annees, 50), 80 + (annees - 2001)],
+            default=100 + 3 * (annees - 2010)
+        )
+
+    def _exercices_otan(self, annees, p):
+        """Exercices OTAN : palier à 20 avant 2014 puis croissance plafonnée"""
+        return p.get('facteur_exercices', 1.0) * np.where(annees >= 2014, np.minimum(40 + 2 * (annees - 2014), 80), 20.0)
+
+    FORMULES = {
+        'Budget_Defense_Mds': _budget,
+        'Personnel_Milliers': _personnel,
+        'Exercices_Militaires': _exercices,
+        'Readiness_Operative': _readiness,
+        'Capacite_Dissuasion': _dissuasion,
+        'Exercices_Conjoints': _exercices_conjoints,
+        'Exercices_OTAN': _exercices_otan,
+    }
+
+    # Plafonds propres au scénario, appliqués après les événements
+    PLAFONDS = {'Readiness_Operative': 'plafond_readiness', 'Capacite_Dissuasion': 'plafond_dissuasion'}
+
+    def budget(self, annees, p):
+        """Budget avec régimes géopolitiques (table d'événements), croissance et choc propres au scénario"""
+        return self.serie('Budget_Defense_Mds', annees, p)
+
+    def personnel(self, annees, p):
+        """Effectifs en croissance lente"""
+        return self.serie('Personnel_Milliers', annees, p)
+
+    def exercices(self, annees, p):
+        """Exercices militaires avec saisonnalité"""
+        return self.serie('Exercices_Militaires', annees, p)
+
+    def readiness(self, annees, p):
+        """Préparation opérationnelle par paliers (table d'événements), renforcée à partir du choc du scénario"""
+        return self.serie('Readiness_Operative', annees, p)
+
+    def dissuasion(self, annees, p):
+        """Dissuasion par paliers (table d'événements), renforcée à partir du choc du scénario"""
+        return self.serie('Capacite_Dissuasion', annees, p)
+
+    def exercices_conjoints(self, annees, p=None):
+        """Exercices conjoints : trois régimes successifs"""
+        return self.serie('Exercices_Conjoints', annees, p)
+
+    def exercices_otan(self, annees, p=None):
+        """Exercices OTAN : palier à 20 avant 2014 puis croissance plafonnée"""
+        return self.serie('Exercices_OTAN', annees, p)
+
+    def serie(self, nom, annees, p):
+        """Évalue un indicateur ; les paramètres peuvent être des scalaires ou des tableaux diffusables
+
+        Tendance (bornée pour les séries linéaires), puis événements de la table, modulés par l'exposition
+        de l'entité (1 : pleine, 0 : aucune), puis plafonds du scénario, que les événements ne dépassent pas.
+        """
+        annees = np.asarray(annees, dtype=float)
+        p = {} if p is None else p
+        if nom in self.index_lineaire:
+            i = self.index_lineaire[nom]
+            # Pentes perturbées (runs, séries) du mode Monte Carlo : trajectoires (runs x années)
+            pente = self.pentes[i, 0] * (p['facteur_pentes'][:, [i]] if 'facteur_pentes' in p else 1.0)
+            valeurs = np.clip(self.origines[i, 0] + pente * (annees - ANNEE_ORIGINE),
+                              self.planchers[i, 0], self.plafonds[i, 0])
+        else:
+            valeurs = self.FORMULES[nom](self, annees, p)
+        valeurs = self.evenements.appliquer(nom, valeurs, annees, p.get('exposition_regimes', 1.0))
+        if nom in self.PLAFONDS:
+            return np.minimum(valeurs, p[self.PLAFONDS[nom]]).astype(float)
+        return valeurs
+
+    def tirer_parametres(self, config, scenario, n_runs, rng, incertitude=None):
+        """Tire n_runs jeux de paramètres perturbés (bases, taux de croissance, pentes, niveaux)"""
+        incertitude = INCERTITUDE_DEFAUT if incertitude is None else incertitude
+        p = self.parametres(config, scenario)
+        for cle in ('budget_base', 'personnel_base', 'exercices_base'):
+            p[cle] = p[cle] * (1 + incertitude['bases'] * rng.standard_normal(n_runs))
+        p['croissance_budget'] = p['croissance_budget'] * (1 + incertitude['croissance'] * rng.standard_normal(n_runs))
+        p['facteur_pentes'] = 1 + incertitude['croissance'] * rng.standard_normal((n_runs, len(self.noms_lineaires)))
+        p['decalage_niveau'] = p['decalage_niveau'] + incertitude['niveaux'] * rng.standard_normal(n_runs)
+        p['facteur_exercices'] = 1 + incertitude['bases'] * rng.standard_normal(n_runs)
+        return p
+
+    def serie_perturbee(self, nom, annees, p):
+        """Trajectoires (runs x années) d'un indicateur pour des paramètres tirés"""
+        return np.broadcast_to(self.serie(nom, annees, p), (len(p['decalage_niveau']), len(annees)))
+
+    def monte_carlo(self, annees, config, noms, scenario=None, n_runs=20000, graine=0,
+                    taille_lot=5000, quantiles=(5, 50, 95), incertitude=None):
+        """Quantiles (quantiles x années) de chaque indicateur sur n_runs trajectoires tirées avec une graine
+
+        Les trajectoires sont évaluées par lots de taille_lot dans un unique tampon float32
+        (runs x années) réutilisé d'un indicateur à l'autre, ce qui borne la mémoire.
+        """
+        annees = np.asarray(annees, dtype=float)
+        rng = np.random.default_rng(graine)
+        tirages = self.tirer_parametres(config, scenario, n_runs, rng, incertitude)
+        trajectoires = np.empty((n_runs, len(annees)), dtype=np.float32)
+        resultats = {}
+        for nom in noms:
+            for debut in range(0, n_runs, taille_lot):
+                fin = min(debut + taille_lot, n_runs)
+                p = dict(tirages)
+                for cle, valeur in tirages.items():
+                    if isinstance(valeur, np.ndarray):
+                        # (runs,) -> (lot, 1) pour diffuser sur les années ; (runs, séries) -> (lot, séries)
+                        p[cle] = valeur[debut:fin, None] if valeur.ndim == 1 else valeur[debut:fin]
+                trajectoires[debut:fin] = self.serie_perturbee(nom, annees, p)
+            resultats[nom] = np.percentile(trajectoires, quantiles, axis=0)
+        return resultats
+
+    def evaluer(self, annees, config, noms=None, scenario=None):
+        """Évalue tous les indicateurs demandés ; renvoie un dict nom -> tableau NumPy"""
+        annees = np.asarray(annees, dtype=float)
+        noms = self.indicateurs(config) if noms is None else noms
+        p = self.parametres(config, scenario)
+        # Séries linéaires sans événement évaluées en bloc ; les autres dépendent de l'exposition de l'entité
+        lineaires = [nom for nom in noms if nom in self.index_lineaire and not self.evenements.concerne(nom)]
+        series = dict(zip(lineaires, self.series_lineaires(annees, lineaires)))
+        return {nom: series[nom] if nom in series else self.serie(nom, annees, p) for nom in noms}
+
+    def evaluer_lot(self, annees, configs, scenarios, noms):
+        """Évalue toutes les combinaisons scénario x configuration en une passe : tableau (S, C, indicateurs, années)"""
+        annees = np.asarray(annees, dtype=float)
+        p = self.parametres_lot(configs, scenarios)
+        resultat = np.empty((len(scenarios), len(configs), len(noms), len(annees)), dtype=np.float32)
+        lineaires = [j for j, nom in enumerate(noms)
+                     if nom in self.index_lineaire and not self.evenements.concerne(nom)]
+        if lineaires:
+            # Sans événement, les séries linéaires ne dépendent ni du scénario ni de la configuration
+            resultat[:, :, lineaires, :] = self.series_lineaires(annees, [noms[j] for j in lineaires])
+        for j, nom in enumerate(noms):
+            if j not in lineaires:
+                resultat[:, :, j, :] = self.serie(nom, annees, p)
+        return resultat
+
+    def evaluer_pays(self, annees, configs, noms, scenario=None):
+        """Panel multi-pays en une passe vectorisée : tableau float32 (pays, années, indicateurs)"""
+        return self.evaluer_lot(annees, configs, [scenario or SCENARIO_DEFAUT], noms)[0].transpose(0, 2, 1)
+
+
+class CacheLRU:
+    """Cache LRU borné et thread-safe, partagé par toutes les sessions, avec TTL optionnel"""
+
+    def __init__(self, taille_max=128, ttl=None):
+        self.taille_max = taille_max
+        self.ttl = ttl  # secondes, None = pas d'expiration
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, cle):
+        """Renvoie (trouvé, valeur) et rafraîchit la position LRU de l'entrée"""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None:
+                horodatage, valeur = entree
+                if self.ttl is None or time.monotonic() - horodatage < self.ttl:
+                    self._entrees.move_to_end(cle)
+                    self.hits += 1
+                    return True, valeur
+                del self._entrees[cle]
+            self.misses += 1
+            return False, None
+
+    def put(self, cle, valeur):
+        """Insère une valeur en évinçant les entrées les moins récemment utilisées"""
+        with self._verrou:
+            self._entrees[cle] = (time.monotonic(), valeur)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, cle, calcul):
+        """Renvoie la valeur en cache ou la calcule (hors verrou) puis la mémorise"""
+        trouve, valeur = self.get(cle)
+        if not trouve:
+            valeur = calcul()
+            self.put(cle, valeur)
+        return valeur
+
+    def contient(self, cle):
+        """Indique si une entrée valide existe, sans compter d'accès ni rafraîchir sa position LRU"""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            return entree is not None and (self.ttl is None or time.monotonic() - entree[0] < self.ttl)
+
+    def invalider(self, predicat=None):
+        """Supprime toutes les entrées, ou celles dont la clé vérifie le prédicat"""
+        with self._verrou:
+            if predicat is None:
+                self._entrees.clear()
+            else:
+                for cle in [cle for cle in self._entrees if predicat(cle)]:
+                    del self._entrees[cle]
+
+    def stats(self):
+        """Compteurs du cache"""
+        with self._verrou:
+            total = self.hits + self.misses
+            return {
+                'entrees': len(self._entrees),
+                'taille_max': self.taille_max,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'taux_hit': self.hits / total if total else 0.0
+            }
+
+
+# Cache process des jeux de données générés (clé : sélection, scénario, plage d'années)
+CACHE_DONNEES = CacheLRU(taille_max=256, ttl=None)
+
+# Stocks déjà calculés par (sélection, scénario), étendus incrémentalement quand la plage s'élargit
+CACHE_PREFIXES = CacheLRU(taille_max=64, ttl=None)
+
+# Bornes du curseur d'horizon d'analyse
+HORIZON_MIN, HORIZON_MAX = 1990, 2060
+
+# Granularités proposées : libellé -> nombre de périodes par an
+GRANULARITES = {'Annuelle': 1, 'Mensuelle': 12, 'Hebdomadaire': 52, 'Quotidienne': 365}
+
+# Nombre maximal de points envoyés au navigateur par courbe, et méthodes de réduction
+POINTS_MAX_TRACE = 1500
+METHODES_REDUCTION = {'LTTB': 'lttb', 'Min/Max': 'minmax'}
+REDUCTION_DEFAUT = 'lttb'
+
+# Sections qui dépendent de chaque contrôle ('*' : toutes). Un contrôle qui ne concerne qu'une section
+# est rendu dans le fragment de cette section : le modifier ne relance qu'elle, pas la page entière.
+# Les autres restent dans le sidebar et relancent tout le script.
+DEPENDANCES_CONTROLES = {
+    'type_analyse': '*', 'selection': '*', 'scenario': '*', 'annee_debut': '*', 'annee_fin': '*',
+    'granularite': '*', 'graphiques_compacts': '*', 'rendu_paresseux': '*',
+    'diagnostic': '*',  # panneau du sidebar, hors fragments
+    'reduction': ('tableau',), 'comparer_scenarios': ('tableau',), 'monte_carlo': ('tableau',),
+    'n_runs': ('tableau',), 'graine': ('tableau',),
+    'show_technical': ('technique',), 'show_geopolitical': ('leadership',),
+    'threat_assessment': ('menaces',), 'show_alliances': ('alliances',),
+}
+
+
+def controles_locaux(section):
+    """Contrôles dont seule la section dépend, dans l'ordre de DEPENDANCES_CONTROLES"""
+    return [nom for nom, sections in DEPENDANCES_CONTROLES.items() if sections == (section,)]
+
+# Rendu compact : traces WebGL au-delà de SEUIL_WEBGL points, ordonnées arrondies envoyées en float32
+SEUIL_WEBGL = 1000
+DECIMALES_TRACES = 2
+TRACES_WEBGL = {'scatter': 'scattergl', 'scatterpolar': 'scatterpolargl'}
+
+
+class StockColonnaire:
+    """Stockage colonnaire compact des indicateurs simulés : une matrice préallouée (années x indicateurs)"""
+
+    def __init__(self, annees, indicateurs, dtype=np.float32, valeurs=None):
+        # float32 suffit : indicateurs bornés (< 1e5) affichés avec au plus deux décimales
+        self.annees = np.asarray(annees)
+        self.indicateurs = list(indicateurs)
+        self.index = {nom: j for j, nom in enumerate(self.indicateurs)}
+        if valeurs is None:
+            # Ordre Fortran : chaque colonne est contiguë, et la transposée sert de bloc pandas sans copie
+            valeurs = np.empty((len(self.annees), len(self.indicateurs)), dtype=dtype, order='F')
+        self.valeurs = valeurs
+        self._df = None
+
+    def colonne(self, nom):
+        """Vue (sans copie) sur la colonne d'un indicateur"""
+        return self.valeurs[:, self.index[nom]]
+
+    def ecrire(self, nom, serie):
+        """Écrit une série dans sa colonne préallouée"""
+        self.valeurs[:, self.index[nom]] = serie
+        self._df = None
+
+    def remplir(self, series):
+        """Écrit un dict nom -> série"""
+        for nom, serie in series.items():
+            self.ecrire(nom, serie)
+        return self
+
+    @property
+    def nbytes(self):
+        return self.valeurs.nbytes + self.annees.nbytes
+
+    def couvre(self, debut, fin):
+        """Vrai si le stock contient toute la plage [debut, fin]"""
+        return len(self.annees) > 0 and self.annees[0] <= debut and self.annees[-1] >= fin
+
+    def fenetre(self, debut, fin):
+        """Stock restreint aux années civiles [debut, fin], adossé aux mêmes valeurs (vue sans copie)"""
+        i = np.searchsorted(self.annees, debut, side='left')
+        j = np.searchsorted(self.annees, fin + 1, side='left')
+        if i == 0 and j == len(self.annees):
+            return self
+        return StockColonnaire(self.annees[i:j], self.indicateurs, valeurs=self.valeurs[i:j])
+
+    @staticmethod
+    def concatener(stocks):
+        """Stock couvrant les stocks donnés bout à bout (les lignes existantes sont recopiées, pas recalculées)"""
+        stocks = [stock for stock in stocks if stock is not None]
+        premier = stocks[0]
+        annees = np.concatenate([stock.annees for stock in stocks])
+        resultat = StockColonnaire(annees, premier.indicateurs, dtype=premier.valeurs.dtype)
+        position = 0
+        for stock in stocks:
+            resultat.valeurs[position:position + len(stock.annees)] = stock.valeurs
+            position += len(stock.annees)
+        return resultat
+
+    def to_dataframe(self):
+        """DataFrame adossé à la matrice du stock (aucune copie des valeurs), construit à la demande"""
+        if self._df is None:
+            df = pd.DataFrame(self.valeurs, columns=self.indicateurs, copy=False)
+            df.insert(0, 'Annee', self.annees)
+            self._df = df
+        return self._df
+
+
+class IndexAgregats:
+    """Index précalculé d'un panel (entités x années x indicateurs) : agrégats par groupe, rangs et parts cumulées
+
+    Les requêtes (total ou moyenne d'un groupe, rang d'une entité, top-N, part des N premiers) sont
+    des lectures directes. La modification d'une seule entité met l'index à jour en O(entités x années
+    x indicateurs), sans retrier ni réagréger le panel.
+    """
+
+    def __init__(self, entites, annees, indicateurs, valeurs, groupes):
+        self.entites = list(entites)
+        self.position = {entite: k for k, entite in enumerate(self.entites)}
+        self.annees = np.asarray(annees)
+        self.index_annee = {int(annee): j for j, annee in enumerate(self.annees)}
+        self.indicateurs = list(indicateurs)
+        self.index_indicateur = {nom: i for i, nom in enumerate(self.indicateurs)}
+        self.groupes = list(groupes)
+        self.index_groupe = {nom: g for g, nom in enumerate(self.groupes)}
+        self.valeurs = np.array(valeurs, dtype=np.float64)  # (E, Y, I), copie modifiable
+        self.poids = np.array([groupes[nom] for nom in self.groupes], dtype=np.float64)  # (G, E)
+        self.effectifs = self.poids.sum(axis=1)
+        self.sommes = np.einsum('ge,eyi->gyi', self.poids, self.valeurs)
+        # Ordre décroissant stable : à valeur égale, l'entité de plus petit indice passe devant
+        self.ordre = np.argsort(-self.valeurs, axis=0, kind='stable')
+        self.rangs = np.empty_like(self.ordre)
+        np.put_along_axis(self.rangs, self.ordre, np.arange(len(self.entites))[:, None, None], axis=0)
+        self._parts_cumulees()
+
+    def _parts_cumulees(self):
+        cumuls = np.take_along_axis(self.valeurs, self.ordre, axis=0).cumsum(axis=0)
+        self.parts = cumuls / np.where(cumuls[-1] == 0, 1, cumuls[-1])
+
+    def copie(self):
+        """Copie indépendante, à modifier sans toucher l'index partagé"""
+        copie = object.__new__(IndexAgregats)
+        copie.__dict__.update(self.__dict__)
+        for attribut in ('valeurs', 'sommes', 'ordre', 'rangs', 'parts'):
+            setattr(copie, attribut, getattr(self, attribut).copy())
+        return copie
+
+    def mettre_a_jour(self, entite, valeurs):
+        """Remplace les séries (années x indicateurs) d'une entité et met agrégats, rangs et parts à jour"""
+        e = self.position[entite]
+        valeurs = np.asarray(valeurs, dtype=np.float64)
+        self.sommes += self.poids[:, e, None, None] * (valeurs - self.valeurs[e])
+        self.valeurs[e] = valeurs
+        # Retrait de l'entité à son ancien rang puis insertion au nouveau, pour chaque (année, indicateur)
+        autres = np.arange(len(self.entites)) != e
+        ancien = self.rangs[e]
+        devant = self.valeurs[autres] > valeurs
+        egaux = (self.valeurs[autres] == valeurs) & (np.flatnonzero(autres) < e)[:, None, None]
+        nouveau = (devant | egaux).sum(axis=0)
+        rangs = self.rangs[autres]
+        rangs -= rangs > ancien
+        rangs += rangs >= nouveau
+        self.rangs[autres] = rangs
+        self.rangs[e] = nouveau
+        np.put_along_axis(self.ordre, self.rangs, np.arange(len(self.entites))[:, None, None], axis=0)
+        self._parts_cumulees()
+        return self
+
+    def total(self, groupe, indicateur, annee):
+        return self.sommes[self.index_groupe[groupe], self.index_annee[annee], self.index_indicateur[indicateur]]
+
+    def moyenne(self, groupe, indicateur, annee):
+        return self.total(groupe, indicateur, annee) / max(self.effectifs[self.index_groupe[groupe]], 1)
+
+    def part(self, groupe, reference, indicateur, annee):
+        """Part du total d'un groupe dans celui d'un groupe de référence (ex. UE dans OTAN)"""
+        return self.total(groupe, indicateur, annee) / self.total(reference, indicateur, annee)
+
+    def rang(self, entite, indicateur, annee):
+        """Rang (1 = premier) d'une entité pour une année"""
+        return int(self.rangs[self.position[entite], self.index_annee[annee], self.index_indicateur[indicateur]]) + 1
+
+    def top(self, n, indicateur, annee):
+        """Les n premières entités et leurs valeurs, par ordre décroissant"""
+        j, i = self.index_annee[annee], self.index_indicateur[indicateur]
+        ordre = self.ordre[:n, j, i]
+        return [self.entites[e] for e in ordre], self.valeurs[ordre, j, i]
+
+    def part_cumulee(self, n, indicateur, annee):
+        """Part du total de toutes les entités détenue par les n premières"""
+        return self.parts[min(n, len(self.entites)) - 1, self.index_annee[annee], self.index_indicateur[indicateur]]
+
+    def series_groupes(self, indicateur, moyenne=False):
+        """Séries annuelles par groupe (années x groupes)"""
+        series = self.sommes[:, :, self.index_indicateur[indicateur]]
+        if moyenne:
+            series = series / np.maximum(self.effectifs, 1)[:, None]
+        return pd.DataFrame(series.T, index=self.annees, columns=self.groupes)
+
+
+def indices_lttb(x, y, n_max):
+    """Indices retenus par Largest-Triangle-Three-Buckets : n_max points préservant la forme de la courbe"""
+    n = len(y)
+    if n <= n_max or n_max < 3:
+        return np.arange(n)
+    # n_max - 2 paquets intérieurs ; le premier et le dernier point sont toujours conservés
+    bords = np.linspace(1, n - 1, n_max - 1).astype(np.intp)
+    indices = np.empty(n_max, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for k in range(n_max - 2):
+        debut, fin = bords[k], bords[k + 1]
+        suivant_fin = bords[k + 2] if k + 2 < len(bords) else n
+        # Sommet du triangle : moyenne du paquet suivant
+        xm, ym = x[fin:suivant_fin].mean(), y[fin:suivant_fin].mean()
+        aires = np.abs((x[a] - xm) * (y[debut:fin] - y[a]) - (x[a] - x[debut:fin]) * (ym - y[a]))
+        a = debut + int(np.argmax(aires))
+        indices[k + 1] = a
+    return indices
+
+
+def indices_minmax(y, n_max):
+    """Indices du minimum et du maximum de chaque paquet (n_max // 2 paquets), en une opération vectorisée"""
+    n = len(y)
+    if n <= n_max or n_max < 2:
+        return np.arange(n)
+    taille = -(-n // (n_max // 2))
+    n_paquets = -(-n // taille)
+    paquets = np.full(n_paquets * taille, np.nan)
+    paquets[:n] = y
+    paquets = paquets.reshape(n_paquets, taille)
+    base = np.arange(n_paquets) * taille
+    extremes = np.stack([base + np.nanargmin(paquets, axis=1), base + np.nanargmax(paquets, axis=1)], axis=1)
+    # Min et max dans l'ordre chronologique au sein de chaque paquet
+    return np.unique(extremes)
+
+
+def reduire_serie(x, y, n_max=POINTS_MAX_TRACE, methode=REDUCTION_DEFAUT):
+    """Sous-échantillonne une courbe avant tracé ; renvoie (x, y) inchangés s'ils tiennent dans n_max points"""
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= n_max:
+        return x, y
+    indices = indices_lttb(x.astype(float), y.astype(float), n_max) if methode == 'lttb' else indices_minmax(y, n_max)
+    return x[indices], y[indices]
+
+
+def compacter_tableau(valeurs, decimales=None):
+    """Tableau numérique au type le plus compact : int16/int32 si les valeurs sont entières, float32 sinon"""
+    tableau = np.asarray(valeurs)
+    if tableau.dtype.kind not in 'fiu' or tableau.size == 0:
+        return valeurs
+    if tableau.dtype.kind == 'f':
+        if not np.all(np.isfinite(tableau)) or np.any(tableau != np.round(tableau)):
+            if decimales is not None:
+                tableau = np.round(tableau, decimales)
+            return tableau.astype(np.float32)
+    petit = np.iinfo(np.int16)
+    return tableau.astype(np.int16 if petit.min <= tableau.min() and tableau.max() <= petit.max else np.int32)
+
+
+def compacter_figure(fig, seuil_webgl=SEUIL_WEBGL, decimales=DECIMALES_TRACES):
+    """Copie allégée d'une figure : traces WebGL pour les longues séries, tableaux compacts, gabarit élagué
+
+    La figure d'origine n'est pas modifiée (elle peut provenir d'un cache partagé).
+    """
+    spec = fig.to_plotly_json()
+    for trace, donnees in zip(fig.data, spec['data']):
+        for cle in ('x', 'y', 'z'):
+            valeurs = getattr(trace, cle, None)
+            if valeurs is not None:
+                # Les abscisses gardent leur précision (périodes infra-annuelles), seules y et z sont arrondies
+                donnees[cle] = compacter_tableau(valeurs, None if cle == 'x' else decimales)
+        n_points = max(len(valeurs) for valeurs in (getattr(trace, 'x', None), getattr(trace, 'y', None), ())
+                       if valeurs is not None)
+        x = getattr(trace, 'x', None)
+        if donnees.get('type') in TRACES_WEBGL and x is not None and len(x) > 2 and np.asarray(x).dtype.kind in 'fiu':
+            # Abscisses régulièrement espacées (séries non réduites) : x0 + dx au lieu du tableau
+            pas = np.diff(np.asarray(x, dtype=float))
+            if np.allclose(pas, pas[0], rtol=1e-9, atol=0):
+                del donnees['x']
+                donnees['x0'], donnees['dx'] = float(x[0]), float(pas[0])
+        if n_points > seuil_webgl and donnees.get('type') in TRACES_WEBGL:
+            donnees['type'] = TRACES_WEBGL[donnees['type']]
+    # Le gabarit embarque des valeurs par défaut pour une trentaine de types de traces : seuls ceux utilisés restent
+    gabarit = spec['layout'].get('template')
+    if gabarit and 'data' in gabarit:
+        utilises = {donnees.get('type', 'scatter') for donnees in spec['data']}
+        gabarit['data'] = {type_trace: defauts for type_trace, defauts in gabarit['data'].items()
+                           if type_trace in utilises}
+    return go.Figure(spec)
+
+
+# Pays du moteur multi-pays : budget de base (Md$), effectifs de base (milliers), multiplicateur du taux
+# de croissance budgétaire, exposition aux régimes géopolitiques, appartenance UE / OTAN et groupe
+COLONNES_PAYS = ['Pays', 'Budget_Base_Mds', 'Personnel_Base_Milliers', 'Croissance_Budget',
+                 'Exposition_Regimes', 'UE', 'OTAN', 'Groupe']
+PAYS_REFERENCE = [
+    ("États-Unis", 850.0, 1346, 1.0, 1.0, 0, 1, 'Allié'),
+    ("Royaume-Uni", 75.0, 148, 1.0, 0.5, 0, 1, 'Allié'),
+    ("Canada", 27.0, 68, 1.0, 0.5, 0, 1, 'Allié'),
+    ("Turquie", 16.0, 355, 1.0, 0.5, 0, 1, 'Allié'),
+    ("Norvège", 8.7, 25, 1.1, 0.5, 0, 1, 'Allié'),
+    ("Albanie", 0.4, 8, 1.0, 0.5, 0, 1, 'Allié'),
+    ("Macédoine du Nord", 0.3, 8, 1.0, 0.5, 0, 1, 'Allié'),
+    ("Monténégro", 0.1, 2, 1.0, 0.5, 0, 1, 'Allié'),
+    ("Allemagne", 67.0, 181, 1.1, 0.5, 1, 1, 'Allié'),
+    ("France", 61.0, 203, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Italie", 35.0, 161, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Espagne", 24.0, 122, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Pologne", 32.0, 164, 1.6, 0.5, 1, 1, 'Allié'),
+    ("Pays-Bas", 17.0, 42, 1.1, 0.5, 1, 1, 'Allié'),
+    ("Suède", 8.7, 15, 1.2, 0.5, 1, 1, 'Allié'),
+    ("Belgique", 7.0, 23, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Grèce", 8.0, 132, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Roumanie", 8.0, 69, 1.2, 0.5, 1, 1, 'Allié'),
+    ("Danemark", 7.0, 15, 1.2, 0.5, 1, 1, 'Allié'),
+    ("Finlande", 7.0, 24, 1.2, 0.5, 1, 1, 'Allié'),
+    ("Portugal", 4.3, 27, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Tchéquie", 4.5, 27, 1.1, 0.5, 1, 1, 'Allié'),
+    ("Hongrie", 4.5, 32, 1.1, 0.5, 1, 1, 'Allié'),
+    ("Slovaquie", 2.9, 13, 1.1, 0.5, 1, 1, 'Allié'),
+    ("Bulgarie", 2.1, 37, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Croatie", 1.4, 15, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Lituanie", 2.1, 23, 1.4, 0.5, 1, 1, 'Allié'),
+    ("Lettonie", 1.3, 7, 1.4, 0.5, 1, 1, 'Allié'),
+    ("Estonie", 1.3, 7, 1.4, 0.5, 1, 1, 'Allié'),
+    ("Slovénie", 0.9, 7, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Luxembourg", 0.6, 1, 1.0, 0.5, 1, 1, 'Allié'),
+    ("Autriche", 4.1, 23, 1.0, 0.3, 1, 0, 'Partenaire'),
+    ("Irlande", 1.3, 8, 1.0, 0.3, 1, 0, 'Partenaire'),
+    ("Chypre", 0.5, 12, 1.0, 0.3, 1, 0, 'Partenaire'),
+    ("Malte", 0.1, 2, 1.0, 0.3, 1, 0, 'Partenaire'),
+    ("Japon", 50.0, 247, 0.8, 0.3, 0, 0, 'Partenaire'),
+    ("Corée du Sud", 48.0, 500, 1.1, 0.3, 0, 0, 'Partenaire'),
+    ("Australie", 32.0, 58, 1.1, 0.3, 0, 0, 'Partenaire'),
+    ("Israël", 27.0, 170, 1.0, 0.3, 0, 0, 'Partenaire'),
+    ("Inde", 83.0, 1455, 1.3, 0.2, 0, 0, 'Partenaire'),
+    ("Ukraine", 65.0, 800, 1.0, 0.2, 0, 0, 'Partenaire'),
+    ("Arabie Saoudite", 76.0, 257, 1.0, 0.2, 0, 0, 'Partenaire'),
+    ("Chine", 296.0, 2035, 1.8, 0.2, 0, 0, 'Compétiteur'),
+    ("Russie", 109.0, 1150, 1.3, 0.2, 0, 0, 'Compétiteur'),
+    ("Iran", 10.0, 610, 0.8, 0.2, 0, 0, 'Compétiteur'),
+    ("Corée du Nord", 4.0, 1280, 1.0, 0.2, 0, 0, 'Compétiteur'),
+]
+
+# Indicateurs du panel multi-pays et leur agrégation par groupe (les séries linéaires sont communes à tous)
+INDICATEURS_PAYS = {
+    'Budget_Defense_Mds': 'somme',
+    'Personnel_Milliers': 'somme',
+    'Exercices_Militaires': 'somme',
+    'Readiness_Operative': 'moyenne',
+    'Capacite_Dissuasion': 'moyenne',
+}
+
+# Données de référence statiques des onglets (identiques pour toutes les sessions)
+DONNEES_REFERENCE = {
+    'pays': dict(zip(COLONNES_PAYS, map(list, zip(*PAYS_REFERENCE)))),
+    'evenements': EVENEMENTS_DEFAUT,
+    'projection_regions': {
+        'Région': ['Amérique du Nord', 'Europe', 'Asie-Pacifique',
+                  'Moyen-Orient', 'Amérique Latine', 'Afrique'],
+        'Bases_Militaires': [120, 180, 220, 80, 50, 60],
+        'Effectifs_Milliers': [450, 65, 85, 45, 15, 6],
+        'Exercices_2023': [45, 38, 52, 25, 12, 8]
+    },
+    'leadership_technologique': {
+        'Domaine': ['Aéronautique', 'Naval', 'Spatial', 'Cyber', 'Nucléaire', 'Renseignement'],
+        'Avance_Technologique': [9, 9, 9, 9, 9, 9],  # sur 10
+        'Depenses_RD_Mds': [45, 32, 28, 18, 25, 15]
+    },
+    'avantages_comparatifs': {
+        'Domaine': ['Puissance Navale', 'Supériorité Aérienne', 'Forces Terrestres',
+                   'Capacité Nucléaire', 'Cybersécurité', 'Renseignement', 'Espace'],
+        'Score_USA': [10, 10, 9, 10, 10, 10, 10],
+        'Score_Concurrents': [7, 8, 8, 9, 8, 8, 7]  # Meilleurs concurrents
+    },
+    'systemes_armes': {
+        'Système': ['F-35 Lightning II', 'B-21 Raider', 'Gerald R. Ford',
+                   'Columbia Class', 'DDG(X)', 'Ground Based Strategic Deterrent',
+                   'Hypersonic Strike', 'Space Fence'],
+        'Portée/Puissance': [2200, 15000, 100000, 12000, 9000, 13000, 5000, 36000],
+        'Branche': ['Air Force', 'Air Force', 'Navy', 'Navy', 'Navy', 'Air Force', 'Multi', 'Space Force'],
+        'Statut': ['Opérationnel', 'Développement', 'Opérationnel', 'Développement', 'Développement', 'Développement', 'Test', 'Opérationnel']
+    },
+    'superiorite_technologique': {
+        'Domaine': ['Aviation 5e Génération', 'Porte-avions Nucléaires',
+                  'Sous-marins Furtifs', 'Missiles Hypersoniques',
+                  'Guerre Cyber Offensive', 'Surveillance Spatiale'],
+        'Avance_Annees': [15, 20, 10, 2, 5, 10],
+        'Depenses_RD_Mds': [120, 45, 30, 8, 12, 15]
+    },
+    'reseau_alliances': {
+        'Alliance': ['OTAN', 'ANZUS', 'Traité de Sécurité Japon-USA',
+                    'Corée du Sud-USA', 'Israel-USA', 'Arabie Saoudite-USA',
+                    'QUAD', 'AUKUS'],
+        'Membres': [32, 3, 2, 2, 2, 2, 4, 3],
+        'Année_Création': [1949, 1951, 1960, 1953, 1981, 1945, 2007, 2021],
+        'Niveau_Coopération': [9, 8, 9, 9, 10, 8, 7, 8]  # sur 10
+    },
+    'cooperation_future': {
+        'Domaine': ['Defense Missile Globale', 'Guerre Cyber Collective',
+                   'Espace Militaire', 'Guerre Électronique',
+                   'Renseignement Artificiel', 'Exercices Conjoints Avancés'],
+        'Potentiel': [9, 10, 8, 9, 10, 9]  # sur 10
+    },
+    'matrice_menaces': {
+        'Type de Menace': ['Rivalité Chine', 'Confrontation Russie',
+                         'Guerre Cyber Majeure', 'Prolifération Nucléaire',
+                         'Terrorisme Global', 'Instabilité Moyen-Orient',
+                         'Course Spatiale', 'Crise Taïwan'],
+        'Probabilité': [0.9, 0.7, 0.8, 0.6, 0.5, 0.8, 0.7, 0.6],
+        'Impact': [0.9, 0.8, 0.7, 0.8, 0.6, 0.7, 0.6, 0.9],
+        'Niveau_Preparation': [0.8, 0.7, 0.9, 0.6, 0.9, 0.7, 0.8, 0.7]
+    },
+    'capacites_reponse': {
+        'Scénario': ['Conflit Hauturier Chine', 'Crise Ukraine/Russie',
+                   'Attaque Cyber Majeure', 'Crise Nucléaire Corée Nord',
+                   'Crise Détroit Taïwan', 'Terrorisme Global'],
+        'Puissance_Navale': [0.9, 0.7, 0.3, 0.6, 0.9, 0.4],
+        'Supériorité_Aérienne': [0.8, 0.8, 0.2, 0.7, 0.9, 0.6],
+        'Cybersécurité': [0.6, 0.5, 0.9, 0.4, 0.5, 0.7],
+        'Alliances': [0.7, 0.9, 0.6, 0.5, 0.7, 0.8]
+    }
+}
+
+def _schema_table(table):
+    """Schéma déduit d'une table intégrée : 'nombre' si toutes les valeurs sont numériques, 'texte' sinon"""
+    return {colonne: 'nombre' if all(isinstance(valeur, (int, float)) for valeur in valeurs) else 'texte'
+            for colonne, valeurs in table.items()}
+
+
+# Colonnes obligatoires des jeux de référence chargés depuis des fichiers ; les colonnes en plus sont conservées
+SCHEMAS_REFERENCE = {nom: _schema_table(table) for nom, table in DONNEES_REFERENCE.items()}
+SCHEMAS_REFERENCE.update({
+    'capacites_militaires': {'Branche': 'texte', 'budget': 'nombre', 'personnel': 'nombre'},
+    'projets_alliances': {'Projet': 'texte', 'pays': 'texte', 'type': 'texte', 'statut': 'texte'},
+})
+
+# Valeurs des cellules vides admises dans un jeu chargé (les autres colonnes du schéma sont obligatoires)
+VALEURS_PAR_DEFAUT = {'evenements': {'Fin': np.inf}}
+
+# Contrôles propres à un jeu, après le schéma : lèvent ValueError avant que la table intégrée soit remplacée
+VALIDATEURS_REFERENCE = {'evenements': TableEvenements}
+
+# Version de chaque jeu de référence, incluse dans les clés du cache de figures
+VERSIONS_REFERENCE = {}
+
+# Cache process des figures statiques, partagé entre sessions
+CACHE_FIGURES = CacheLRU(taille_max=64, ttl=None)
+
+
+# Instrumentation des chemins critiques : histogrammes de durée et d'allocation par section
+
+# Bornes des histogrammes (secondes, octets)
+BORNES_DUREE = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BORNES_OCTETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+
+
+class Histogramme:
+    """Histogramme cumulatif à bornes fixes, au format des histogrammes Prometheus"""
+
+    def __init__(self, bornes):
+        self.bornes = bornes
+        self.comptes = [0] * (len(bornes) + 1)
+        self.somme = 0.0
+        self.total = 0
+
+    def observer(self, valeur):
+        self.comptes[bisect.bisect_left(self.bornes, valeur)] += 1
+        self.somme += valeur
+        self.total += 1
+
+    def lignes_prometheus(self, metrique, etiquettes):
+        lignes = []
+        cumul = 0
+        for borne, compte in zip(list(self.bornes) + ['+Inf'], self.comptes):
+            cumul += compte
+            lignes.append(f'{metrique}_bucket{{{etiquettes},le="{borne}"}} {cumul}')
+        lignes.append(f'{metrique}_sum{{{etiquettes}}} {self.somme}')
+        lignes.append(f'{metrique}_count{{{etiquettes}}} {self.total}')
+        return lignes
+
+
+class Instrumentation:
+    """Métriques process : durée et allocations par section, mesures du rerun courant et état des caches
+
+    Le suivi des allocations (tracemalloc) est coûteux et global au process ; il n'est actif
+    que si DASHBOARD_TRACEMALLOC=1 ou après activer_allocations().
+    """
+
+    def __init__(self):
+        self.durees = {}
+        self.allocations = {}
+        self.caches = {}
+        self.reruns = 0
+        self._verrou = threading.Lock()
+        self._local = threading.local()
+        self._serveur = None
+        if os.environ.get('DASHBOARD_TRACEMALLOC') == '1':
+            self.activer_allocations()
+
+    def activer_allocations(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def mesurer(self, nom):
+        """Mesure la durée (et l'allocation nette si tracemalloc est actif) d'un bloc"""
+        suivi = tracemalloc.is_tracing()
+        avant = tracemalloc.get_traced_memory()[0] if suivi else 0
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            duree = time.perf_counter() - debut
+            octets = max(tracemalloc.get_traced_memory()[0] - avant, 0) if suivi else None
+            self.observer(nom, duree, octets)
+
+    def observer(self, nom, duree, octets=None):
+        with self._verrou:
+            self.durees.setdefault(nom, Histogramme(BORNES_DUREE)).observer(duree)
+            if octets is not None:
+                self.allocations.setdefault(nom, Histogramme(BORNES_OCTETS)).observer(octets)
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is not None:
+            rerun.append({'Section': nom, 'Durée (ms)': duree * 1e3,
+                          'Allocation (Ko)': None if octets is None else octets / 1024})
+
+    def debut_rerun(self):
+        """Démarre la collecte des mesures du rerun du thread courant (un thread par session Streamlit)"""
+        self._local.rerun = []
+        with self._verrou:
+            self.reruns += 1
+
+    def mesures_rerun(self):
+        return list(getattr(self._local, 'rerun', None) or [])
+
+    def rerun_courant(self):
+        """Mesures du rerun du thread courant, à rattacher aux threads de calcul auxquels il délègue"""
+        return getattr(self._local, 'rerun', None)
+
+    def rattacher_rerun(self, rerun):
+        self._local.rerun = rerun
+
+    def exposition_prometheus(self):
+        """Métriques au format texte Prometheus (version 0.0.4)"""
+        lignes = [
+            '# HELP dashboard_section_duration_seconds Durée des sections, simulations et générations.',
+            '# TYPE dashboard_section_duration_seconds histogram'
+        ]
+        with self._verrou:
+            for nom, histo in sorted(self.durees.items()):
+                lignes += histo.lignes_prometheus('dashboard_section_duration_seconds', f'section="{nom}"')
+            lignes += [
+                '# HELP dashboard_section_allocated_bytes Allocation nette des sections (tracemalloc).',
+                '# TYPE dashboard_section_allocated_bytes histogram'
+            ]
+            for nom, histo in sorted(self.allocations.items()):
+                lignes += histo.lignes_prometheus('dashboard_section_allocated_bytes', f'section="{nom}"')
+            lignes += [
+                '# HELP dashboard_reruns_total Reruns du script Streamlit.',
+                '# TYPE dashboard_reruns_total counter',
+                f'dashboard_reruns_total {self.reruns}'
+            ]
+        statistiques = {nom: cache.stats() for nom, cache in self.caches.items()}
+        for metrique, cle, aide, type_ in (
+                ('dashboard_cache_hits_total', 'hits', 'Accès au cache servis depuis le cache.', 'counter'),
+                ('dashboard_cache_misses_total', 'misses', 'Accès au cache ayant nécessité un calcul.', 'counter'),
+                ('dashboard_cache_evictions_total', 'evictions', 'Entrées évincées (LRU).', 'counter'),
+                ('dashboard_cache_entries', 'entrees', 'Entrées présentes dans le cache.', 'gauge')):
+            lignes += [f'# HELP {metrique} {aide}', f'# TYPE {metrique} {type_}']
+            lignes += [f'{metrique}{{cache="{nom}"}} {stats[cle]}' for nom, stats in statistiques.items()]
+        return '\n'.join(lignes) + '\n'
+
+    def demarrer_serveur(self, port, hote='0.0.0.0'):
+        """Sert /metrics sur un thread dédié (une seule fois par process)"""
+        if self._serveur is not None:
+            return self._serveur
+        instrumentation = self
+
+        class GestionnaireMetriques(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                corps = instrumentation.exposition_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        self._serveur = ThreadingHTTPServer((hote, port), GestionnaireMetriques)
+        threading.Thread(target=self._serveur.serve_forever, daemon=True).start()
+        return self._serveur
+
+
+# Métriques process, partagées par toutes les sessions
+METRIQUES = Instrumentation()
+METRIQUES.caches['donnees'] = CACHE_DONNEES
+METRIQUES.caches['figures'] = CACHE_FIGURES
+METRIQUES.caches['prefixes'] = CACHE_PREFIXES
+
+
+def instrumenter(classe, prefixes):
+    """Enveloppe les méthodes de la classe dont le nom commence par un des préfixes"""
+    for nom, attribut in list(vars(classe).items()):
+        if callable(attribut) and nom.startswith(prefixes):
+            def envelopper(methode, etiquette):
+                @functools.wraps(methode)
+                def methode_instrumentee(*args, **kwargs):
+                    with METRIQUES.mesurer(etiquette):
+                        return methode(*args, **kwargs)
+                return methode_instrumentee
+            setattr(classe, nom, envelopper(attribut, nom))
+    return classe
+
+
+# Pool partagé par les sessions pour les calculs lourds des sections (données et figures, sans appel
+# streamlit) ; les emplacements st.empty sont remplis par le thread du script
+POOL_CALCUL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='calcul')
+
+
+def soumettre_calcul(fonction, *args, **kwargs):
+    """Exécute fonction sur POOL_CALCUL ; ses mesures sont comptées dans le rerun appelant"""
+    rerun = METRIQUES.rerun_courant()
+    def executer():
+        # Le thread du pool sert d'autres sessions : il est détaché du rerun une fois la tâche finie
+        precedent = METRIQUES.rerun_courant()
+        METRIQUES.rattacher_rerun(rerun)
+        try:
+            return fonction(*args, **kwargs)
+        finally:
+            METRIQUES.rattacher_rerun(precedent)
+    return POOL_CALCUL.submit(executer)
+
+
+class PlanificateurPrechauffage:
+    """Précalcule en arrière-plan les données et figures les plus demandées, au démarrage puis périodiquement
+
+    Ordre de priorité : combinaisons (sélection, scénario, années, granularité) par fréquence d'accès
+    observée, avec oubli progressif à chaque cycle, puis toutes les sélections x scénarios sur l'horizon
+    par défaut. Au plus `limite` calculs simultanés ; les entrées déjà en cache sont ignorées. Les
+    fréquences sont conservées dans `fichier` pour qu'un redémarrage préchauffe d'abord les favoris.
+    """
+
+    def __init__(self, limite=2, periode=600.0, fichier=None, capacite=None, oubli=0.9):
+        self.limite = limite
+        self.periode = periode  # secondes entre deux cycles
+        self.fichier = fichier
+        self.capacite = capacite  # combinaisons préchauffées par cycle, défaut : moitié de CACHE_DONNEES
+        self.oubli = oubli
+        self.frequences = Counter()
+        self.cycles = 0
+        self.dernier_cycle = {}
+        self._verrou = threading.Lock()
+        self._arret = threading.Event()
+        self._thread = None
+
+    def enregistrer_acces(self, cle):
+        """Compte une demande (selection, scenario, annee_debut, annee_fin, granularite) d'une session ou de l'API"""
+        with self._verrou:
+            self.frequences[cle] += 1
+
+    def candidats(self, dashboard):
+        """Combinaisons à préchauffer, par priorité décroissante"""
+        with self._verrou:
+            observees = [cle for cle, _ in self.frequences.most_common()]
+        par_defaut = [(selection, scenario, 2000, 2027, 1)
+                      for scenario in SCENARIOS for selection in selections_instantane(dashboard)]
+        capacite = self.capacite or CACHE_DONNEES.taille_max // 2
+        return list(dict.fromkeys(observees + par_defaut))[:capacite]
+
+    def prechauffer(self, dashboard=None):
+        """Un cycle : figures statiques, données par priorité puis index pays par scénario ; renvoie le bilan"""
+        dashboard = dashboard or obtenir_dashboard()
+        debut = time.perf_counter()
+        cles = [cle for cle in self.candidats(dashboard) if not CACHE_DONNEES.contient(cle)]
+        taches = [functools.partial(dashboard.get_reference_figure, nom, compacte=True)
+                  for nom in dashboard.define_reference_figures()]
+        taches += [functools.partial(dashboard.get_cached_data, *cle) for cle in cles]
+        taches += [functools.partial(dashboard.get_country_index, scenario) for scenario in SCENARIOS]
+        # Soumission dans l'ordre de priorité : le pool borné les traite dans cet ordre
+        with ThreadPoolExecutor(max_workers=self.limite, thread_name_prefix='prechauffage') as pool:
+            futurs = [pool.submit(tache) for tache in taches]
+        erreurs = [repr(futur.exception()) for futur in futurs if futur.exception() is not None]
+        return {'date': datetime.now().isoformat(timespec='seconds'), 'combinaisons': len(cles),
+                'taches': len(taches), 'erreurs': erreurs, 'duree_s': round(time.perf_counter() - debut, 3)}
+
+    def vieillir(self):
+        """Oubli progressif : les combinaisons délaissées perdent leur priorité"""
+        with self._verrou:
+            for cle in list(self.frequences):
+                self.frequences[cle] *= self.oubli
+                if self.frequences[cle] < 0.01:
+                    del self.frequences[cle]
+
+    def charger(self):
+        if not self.fichier or not os.path.exists(self.fichier):
+            return
+        with open(self.fichier, encoding='utf-8') as f:
+            lignes = json.load(f)
+        with self._verrou:
+            for *cle, frequence in lignes:
+                self.frequences[tuple(cle)] += frequence
+
+    def sauvegarder(self):
+        with self._verrou:
+            lignes = [[*cle, frequence] for cle, frequence in self.frequences.most_common()]
+        temporaire = self.fichier + '.tmp'
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(lignes, f, ensure_ascii=False)
+        os.replace(temporaire, self.fichier)
+
+    def _boucle(self):
+        while True:
+            bilan = self.prechauffer()
+            self.vieillir()
+            if self.fichier:
+                try:
+                    self.sauvegarder()
+                except OSError as erreur:
+                    bilan['erreurs'].append(repr(erreur))
+            self.dernier_cycle = bilan
+            self.cycles += 1
+            if self._arret.wait(self.periode):
+                return
+
+    def demarrer(self, limite=None, periode=None, fichier=None):
+        """Lance le cycle périodique sur un thread dédié (une seule fois par process)"""
+        with self._verrou:
+            if self._thread is not None:
+                return self._thread
+            self.limite = limite or self.limite
+            self.periode = periode or self.periode
+            self.fichier = fichier or self.fichier
+        self.charger()
+        with self._verrou:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._boucle, name='prechauffage', daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def arreter(self):
+        self._arret.set()
+
+    def etat(self):
+        return {'actif': self._thread is not None and self._thread.is_alive(), 'cycles': self.cycles,
+                'combinaisons_suivies': len(self.frequences), **self.dernier_cycle}
+
+
+# Préchauffage des caches du process ; fréquences relevées dès l'import, cycle lancé par demarrer_prechauffage
+PRECHAUFFAGE = PlanificateurPrechauffage()
+
+
+def demarrer_prechauffage():
+    """Démarre le préchauffage, sauf si DASHBOARD_PRECHAUFFAGE=0
+
+    DASHBOARD_PRECHAUFFAGE_LIMITE (calculs simultanés), DASHBOARD_PRECHAUFFAGE_PERIODE (secondes) et
+    DASHBOARD_PRECHAUFFAGE_FICHIER (fréquences conservées entre redémarrages) le configurent.
+    """
+    if os.environ.get('DASHBOARD_PRECHAUFFAGE') == '0':
+        return None
+    limite = os.environ.get('DASHBOARD_PRECHAUFFAGE_LIMITE')
+    periode = os.environ.get('DASHBOARD_PRECHAUFFAGE_PERIODE')
+    return PRECHAUFFAGE.demarrer(int(limite) if limite else None, float(periode) if periode else None,
+                                 os.environ.get('DASHBOARD_PRECHAUFFAGE_FICHIER'))
+
+
+
+def mettre_a_jour_reference(nom, donnees=None):
+    """Remplace (ou signale la modification d') un jeu de référence et invalide les figures qui en dépendent
+
+    Un jeu refusé par son validateur lève ValueError et laisse la table en place.
+    """
+    if nom in VALIDATEURS_REFERENCE:
+        VALIDATEURS_REFERENCE[nom](DONNEES_REFERENCE[nom] if donnees is None else donnees)
+    if donnees is not None:
+        DONNEES_REFERENCE[nom] = donnees
+    VERSIONS_REFERENCE[nom] = VERSIONS_REFERENCE.get(nom, 0) + 1
+    CACHE_FIGURES.invalider(lambda cle: any(ref == nom for ref, _ in cle[1]))
+    if nom == 'evenements':
+        # Toutes les séries simulées dépendent de la table d'événements
+        CACHE_DONNEES.invalider()
+        CACHE_PREFIXES.invalider()
+
+
+EXTENSIONS_SOURCES = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet',
+                      '.sqlite': 'sqlite', '.sqlite3': 'sqlite', '.db': 'sqlite'}
+
+# Tables lues et validées, partagées par toutes les sessions (clé : chemin, table, date de modification)
+CACHE_SOURCES = CacheLRU(taille_max=32, ttl=None)
+METRIQUES.caches['sources'] = CACHE_SOURCES
+
+
+def lire_source(chemin, table=None):
+    """Lit un fichier CSV ou Parquet, ou une table d'une base SQLite (ouverte en lecture seule)"""
+    format_source = EXTENSIONS_SOURCES.get(os.path.splitext(chemin)[1].lower())
+    if format_source == 'csv':
+        return pd.read_csv(chemin)
+    if format_source == 'parquet':
+        return pd.read_parquet(chemin)
+    if format_source == 'sqlite':
+        with closing(sqlite3.connect(f"file:{chemin}?mode=ro", uri=True)) as connexion:
+            return pd.read_sql_query(f'SELECT * FROM "{table}"', connexion)
+    raise ValueError(f"Format de source non pris en charge : {chemin}")
+
+
+def valider_schema(nom, df, schema=None):
+    """Vérifie les colonnes obligatoires d'un jeu chargé et convertit ses colonnes numériques"""
+    schema = SCHEMAS_REFERENCE.get(nom, {}) if schema is None else schema
+    manquantes = [colonne for colonne in schema if colonne not in df.columns]
+    if manquantes:
+        raise ValueError(f"{nom} : colonnes manquantes {manquantes}")
+    for colonne, defaut in VALEURS_PAR_DEFAUT.get(nom, {}).items():
+        df[colonne] = df[colonne].fillna(defaut)
+    for colonne, type_attendu in schema.items():
+        valeurs = pd.to_numeric(df[colonne], errors='coerce') if type_attendu == 'nombre' else df[colonne]
+        if valeurs.isna().any():
+            raise ValueError(f"{nom}.{colonne} : {int(valeurs.isna().sum())} valeurs manquantes ou invalides "
+                             f"(attendu : {type_attendu})")
+        df[colonne] = valeurs
+    if nom in VALIDATEURS_REFERENCE:
+        VALIDATEURS_REFERENCE[nom](df)
+    return df
+
+
+def table_en_dictionnaire(table, cle):
+    """Table de référence -> dict indexé par la colonne cle (format de define_military_capabilities)"""
+    lignes = pd.DataFrame(table).to_dict('records')
+    return {ligne.pop(cle): {champ: valeur for champ, valeur in ligne.items() if pd.notna(valeur)}
+            for ligne in lignes}
+
+
+class EnregistrementFige:
+    """Base des enregistrements de référence : attributs déclarés dans __slots__ (pas de __dict__), figés à la construction"""
+    __slots__ = ()
+
+    def __init__(self, **valeurs):
+        for nom in self.__slots__:
+            object.__setattr__(self, nom, valeurs[nom])
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __delattr__(self, nom):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+
+class FicheReference(EnregistrementFige, Mapping):
+    """Ligne d'une table de référence (branche, projet) : champs en lecture seule, lus comme un dict"""
+    __slots__ = ('nom', 'champs')
+
+    def __init__(self, nom, champs):
+        super().__init__(nom=nom, champs=MappingProxyType(dict(champs)))
+
+    def __getitem__(self, cle):
+        return self.champs[cle]
+
+    def __iter__(self):
+        return iter(self.champs)
+
+    def __len__(self):
+        return len(self.champs)
+
+    def __repr__(self):
+        return f"FicheReference({self.nom!r}, {dict(self.champs)!r})"
+
+
+class RegistreReference(EnregistrementFige):
+    """Options du sidebar, capacités militaires et projets d'alliances, construits une fois par version des sources"""
+    __slots__ = ('versions', 'branches_options', 'programmes_options', 'military_capabilities', 'alliance_projects')
+
+    @classmethod
+    def construire(cls, dashboard, versions):
+        def fiches(table):
+            return MappingProxyType({nom: FicheReference(nom, champs) for nom, champs in table.items()})
+        return cls(versions=versions,
+                   branches_options=tuple(dashboard.define_branches_options()),
+                   programmes_options=tuple(dashboard.define_programmes_options()),
+                   military_capabilities=fiches(dashboard.define_military_capabilities()),
+                   alliance_projects=fiches(dashboard.define_alliance_projects()))
+
+
+# Registre courant du process ; remplacé (jamais modifié) quand une source de référence change de version
+REGISTRE_REFERENCE = None
+_VERROU_REGISTRE = threading.Lock()
+
+
+def registre_reference(dashboard):
+    """Registre partagé par toutes les sessions, reconstruit seulement après un rechargement de ses sources"""
+    global REGISTRE_REFERENCE
+    versions = (VERSIONS_REFERENCE.get('capacites_militaires', 0), VERSIONS_REFERENCE.get('projets_alliances', 0))
+    registre = REGISTRE_REFERENCE
+    if registre is None or registre.versions != versions:
+        with _VERROU_REGISTRE:
+            registre = REGISTRE_REFERENCE
+            if registre is None or registre.versions != versions:
+                registre = REGISTRE_REFERENCE = RegistreReference.construire(dashboard, versions)
+    return registre
+
+
+class EtatSession:
+    """Choix utilisateur de la session Streamlit courante, rangés dans st.session_state
+
+    L'instance du dashboard est partagée par tout le process : rien de propre à une session n'est
+    stocké sur elle. Hors session (headless, benchmarks, API), les valeurs par défaut s'appliquent.
+    """
+    CLE = '_etat_dashboard'
+    DEFAUTS = {'graphiques_compacts': True, 'reduction': REDUCTION_DEFAUT, 'comparer_scenarios': False,
+               'monte_carlo': False, 'n_runs': 20000, 'graine': 0, 'show_technical': True,
+               'show_geopolitical': True, 'threat_assessment': True, 'show_alliances': True}
+
+    def _stockage(self):
+        contexte = importlib.import_module('streamlit.runtime.scriptrunner').get_script_run_ctx(suppress_warning=True)
+        return None if contexte is None else contexte.session_state
+
+    def get(self, nom, defaut=None):
+        stockage = self._stockage()
+        etat = stockage[self.CLE] if stockage is not None and self.CLE in stockage else {}
+        return etat.get(nom, self.DEFAUTS.get(nom, defaut))
+
+    def mettre_a_jour(self, valeurs):
+        """Enregistre les choix de la session courante (sans effet hors session)"""
+        stockage = self._stockage()
+        if stockage is not None:
+            etat = dict(stockage[self.CLE]) if self.CLE in stockage else {}
+            etat.update(valeurs)
+            stockage[self.CLE] = etat
+
+
+class ChargeurReference:
+    """Chargement asynchrone des jeux de référence depuis des fichiers CSV, Parquet ou SQLite
+
+    Les sources sont lues et validées en parallèle sur un pool de threads ; chaque jeu chargé remplace
+    la table intégrée via mettre_a_jour_reference. Tant qu'une source est en cours de chargement, seules
+    les figures qui en dépendent sont remplacées par un message d'attente.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.sources = {}  # nom -> (chemin, table SQLite ou None)
+        self.futurs = {}
+        self._pool = None
+        self._verrou = threading.Lock()
+
+    def declarer(self, nom, chemin, table=None):
+        """Associe un jeu de référence à un fichier (et à une table pour SQLite)"""
+        self.sources[nom] = (chemin, table)
+
+    def declarer_dossier(self, dossier):
+        """Déclare chaque <nom>.csv / <nom>.parquet du dossier et chaque table de ses bases SQLite"""
+        for fichier in sorted(os.listdir(dossier)):
+            chemin = os.path.join(dossier, fichier)
+            nom, extension = os.path.splitext(fichier)
+            format_source = EXTENSIONS_SOURCES.get(extension.lower())
+            if format_source == 'sqlite':
+                with closing(sqlite3.connect(f"file:{chemin}?mode=ro", uri=True)) as connexion:
+                    tables = [ligne[0] for ligne in
+                              connexion.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+                for table in tables:
+                    self.declarer(table, chemin, table)
+            elif format_source is not None:
+                self.declarer(nom, chemin)
+
+    def _charger(self, nom, chemin, table):
+        cle = (chemin, table, os.path.getmtime(chemin))
+        df = CACHE_SOURCES.get_or_compute(cle, lambda: valider_schema(nom, lire_source(chemin, table)))
+        # Un fichier inchangé renvoie la même table : les figures en cache restent valides
+        if DONNEES_REFERENCE.get(nom) is not df:
+            mettre_a_jour_reference(nom, df)
+        return df
+
+    def lancer(self, noms=None, recharger=False):
+        """Soumet le chargement des sources sans attendre ; une source déjà soumise ne l'est qu'avec recharger"""
+        with self._verrou:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='reference')
+            for nom in (self.sources if noms is None else noms):
+                futur = self.futurs.get(nom)
+                if futur is not None and not (recharger and futur.done()):
+                    continue
+                chemin, table = self.sources[nom]
+                self.futurs[nom] = self._pool.submit(self._charger, nom, chemin, table)
+        return self
+
+    def en_attente(self, noms):
+        """Jeux de la liste dont le chargement n'est pas terminé"""
+        return [nom for nom in noms if nom in self.futurs and not self.futurs[nom].done()]
+
+    def attendre(self, noms=None, delai=None):
+        """Attend la fin des chargements (tous par défaut) ; renvoie les jeux encore en attente"""
+        noms = list(self.futurs) if noms is None else noms
+        wait([self.futurs[nom] for nom in noms if nom in self.futurs], timeout=delai)
+        return self.en_attente(noms)
+
+    def etat(self):
+        """Statut de chaque source déclarée ; en cas d'erreur, la table intégrée reste en place"""
+        etats = {}
+        for nom, (chemin, table) in self.sources.items():
+            futur = self.futurs.get(nom)
+            if futur is None:
+                statut = 'déclarée'
+            elif not futur.done():
+                statut = 'en cours'
+            elif futur.exception() is not None:
+                statut = f"{type(futur.exception()).__name__}: {futur.exception()}"
+            else:
+                statut = 'chargée'
+            etats[nom] = {'source': chemin if table is None else f"{chemin}:{table}", 'statut': statut}
+        return etats
+
+
+CHARGEUR_REFERENCE = ChargeurReference()
+
+
+def initialiser_references(attendre=False):
+    """Déclare le dossier DASHBOARD_REFERENCES (une fois par process) et lance son chargement"""
+    dossier = os.environ.get('DASHBOARD_REFERENCES')
+    if dossier and not CHARGEUR_REFERENCE.sources:
+        CHARGEUR_REFERENCE.declarer_dossier(dossier)
+    CHARGEUR_REFERENCE.lancer()
+    if attendre:
+        CHARGEUR_REFERENCE.attendre()
+    return CHARGEUR_REFERENCE
+
+
+# Format des instantanés Arrow ; à incrémenter si la disposition des fichiers change
+VERSION_INSTANTANE = 1
+
+
+def empreinte_moteur(dashboard, selections):
+    """Empreinte du code du moteur, de ses tables de paramètres et des configurations des sélections"""
+    contenu = json.dumps({
+        'moteur': inspect.getsource(MoteurSimulation) + inspect.getsource(TableEvenements),
+        'series': SERIES_LINEAIRES,
+        'scenarios': SCENARIOS,
+        'indicateurs': [INDICATEURS_COMMUNS, INDICATEURS_PRIORITES],
+        'evenements': pd.DataFrame(DONNEES_REFERENCE['evenements']).to_dict('list'),
+        'configs': {selection: dashboard.get_advanced_config(selection) for selection in selections}
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(contenu.encode()).hexdigest()
+
+
+class InstantaneArrow:
+    """Jeux générés précalculés, lus en mémoire mappée depuis des fichiers Arrow IPC, sans copie
+
+    ecrire_instantane produit un fichier par sélection x scénario x granularité et un manifeste.
+    Chaque process worker mappe les mêmes fichiers : les pages sont partagées par le cache du
+    système, d'où un seul exemplaire des données par hôte quel que soit le nombre de workers.
+    """
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        chemin = os.path.join(dossier, 'manifeste.json')
+        self.date = os.path.getmtime(chemin)
+        with open(chemin, encoding='utf-8') as f:
+            self.manifeste = json.load(f)
+        self.entrees = {(entree['selection'], entree['scenario'], entree['granularite']): entree['fichier']
+                        for entree in self.manifeste['entrees']}
+        selections = list(dict.fromkeys(selection for selection, _, _ in self.entrees))
+        # Un instantané produit par un autre moteur ou d'autres configurations est ignoré
+        self.valide = (self.manifeste.get('version') == VERSION_INSTANTANE and
+                       self.manifeste.get('empreinte') == empreinte_moteur(obtenir_dashboard(), selections))
+        self.version_evenements = VERSIONS_REFERENCE.get('evenements', 0)
+        self._tables = {}
+        self._verrou = threading.Lock()
+
+    def couvre(self, selection, scenario, annee_debut, annee_fin, granularite=1):
+        """Vrai si l'instantané contient la combinaison demandée sur toute la plage [annee_debut, annee_fin]"""
+        return (self.valide and self.version_evenements == VERSIONS_REFERENCE.get('evenements', 0)
+                and (selection, scenario or SCENARIO_DEFAUT, granularite) in self.entrees
+                and self.manifeste['annee_debut'] <= annee_debut and annee_fin <= self.manifeste['annee_fin'])
+
+    def dataframe(self, selection, scenario=None, granularite=1):
+        """DataFrame adossé au fichier mappé (colonnes en lecture seule, aucune copie), ouvert une fois par process"""
+        cle = (selection, scenario or SCENARIO_DEFAUT, granularite)
+        with self._verrou:
+            if cle not in self._tables:
+                pa = importlib.import_module('pyarrow')
+                source = pa.memory_map(os.path.join(self.dossier, self.entrees[cle]), 'r')
+                table = importlib.import_module('pyarrow.ipc').open_file(source).read_all()
+                # Un bloc par colonne : chaque colonne pandas pointe directement sur son tampon Arrow
+                self._tables[cle] = table.to_pandas(split_blocks=True)
+            return self._tables[cle]
+
+    def fenetre(self, selection, scenario, annee_debut, annee_fin, granularite=1):
+        """Lignes des années civiles [annee_debut, annee_fin] (vue sur le fichier mappé)"""
+        df = self.dataframe(selection, scenario, granularite)
+        annees = df['Annee'].to_numpy()
+        i = np.searchsorted(annees, annee_debut, side='left')
+        j = np.searchsorted(annees, annee_fin + 1, side='left')
+        return df.iloc[i:j].reset_index(drop=True)
+
+    def etat(self):
+        """Résumé pour le panneau de diagnostic"""
+        return {'dossier': self.dossier, 'jeux': len(self.entrees), 'ouverts': len(self._tables),
+                'valide': self.valide, 'plage': f"{self.manifeste['annee_debut']}-{self.manifeste['annee_fin']}"}
+
+
+# Instantané servi par ce process (DASHBOARD_INSTANTANE), None s'il n'y en a pas
+INSTANTANE = None
+
+
+def ouvrir_instantane(dossier=None):
+    """Ouvre l'instantané du dossier (défaut : DASHBOARD_INSTANTANE), ou le rouvre si son manifeste a changé"""
+    global INSTANTANE
+    dossier = dossier or os.environ.get('DASHBOARD_INSTANTANE')
+    if not dossier or not os.path.exists(os.path.join(dossier, 'manifeste.json')):
+        return INSTANTANE
+    if (INSTANTANE is None or INSTANTANE.dossier != dossier or
+            INSTANTANE.date != os.path.getmtime(os.path.join(dossier, 'manifeste.json')) or
+            INSTANTANE.version_evenements != VERSIONS_REFERENCE.get('evenements', 0)):
+        INSTANTANE = InstantaneArrow(dossier)
+    return INSTANTANE
+
 
 class DefenseUSADashboardAvance:
     def __init__(self):
-        self.branches_options = self.define_branches_options()
-        self.programmes_options = self.define_programmes_options()
-        self.military_capabilities = self.define_military_capabilities()
-        self.alliance_projects = self.define_alliance_projects()
+        self.moteur = MoteurSimulation()
+        self.etat = EtatSession()
+    
+    # Données de référence lues dans le registre immuable du process (construit une fois, pas à chaque rerun)
+    
+    @property
+    def branches_options(self):
+        return registre_reference(self).branches_options
+    
+    @property
+    def programmes_options(self):
+        return registre_reference(self).programmes_options
+    
+    @property
+    def military_capabilities(self):
+        return registre_reference(self).military_capabilities
+    
+    @property
+    def alliance_projects(self):
+        return registre_reference(self).alliance_projects
+    
+    @property
+    def graphiques_compacts(self):
+        """Choix de la session courante (la même instance sert toutes les sessions)"""
+        return self.etat.get('graphiques_compacts')
         
     def define_branches_options(self):
         return [
@@ -117,6 +1850,8 @@ class DefenseUSADashboardAvance:
         ]
     
     def define_military_capabilities(self):
+        if 'capacites_militaires' in DONNEES_REFERENCE:
+            return table_en_dictionnaire(DONNEES_REFERENCE['capacites_militaires'], 'Branche')
         return {
             "US Army": {
                 "budget": 185.0,
@@ -161,7 +1896,22 @@ class DefenseUSADashboardAvance:
             }
         }
     
+    def alliance_projects_table(self):
+        """Lignes à plat des projets d'alliances pour les tableaux et la carte"""
+        alliance_data = []
+        for nom, specs in self.alliance_projects.items():
+            alliance_data.append({
+                'Projet': nom,
+                'Pays Participants': specs['pays'],
+                'Type': specs['type'],
+                'Statut': specs['statut'],
+                'Détails': specs.get('objectif', specs.get('localisation', specs.get('technologies', 'N/A')))
+            })
+        return alliance_data
+    
     def define_alliance_projects(self):
+        if 'projets_alliances' in DONNEES_REFERENCE:
+            return table_en_dictionnaire(DONNEES_REFERENCE['projets_alliances'], 'Projet')
         return {
             "Commandement Cyber OTAN": {"pays": "OTAN", "type": "Cybersécurité", "statut": "Opérationnel", "localisation": "Belgique/États-Unis"},
             "Defense Missile Européenne": {"pays": "OTAN", "type": "Defense missile", "statut": "Déploiement", "objectif": "Couverture Europe"},
@@ -170,60 +1920,193 @@ class DefenseUSADashboardAvance:
             "AUKUS": {"pays": "USA/UK/Australie", "type": "Partage technologique", "statut": "Actif", "technologies": "Sous-marins nucléaires"}
         }
     
-    def generate_advanced_data(self, selection):
+    def generate_advanced_data(self, selection, scenario=None, annee_debut=2000, annee_fin=2027, granularite=1):
         """Génère des données avancées et détaillées pour les États-Unis"""
-        annees = list(range(2000, 2028))
-        
+        stock, config = self.generate_advanced_store(selection, scenario, annee_debut, annee_fin, granularite)
+        return stock.to_dataframe(), config
+    
+    def generate_advanced_store(self, selection, scenario=None, annee_debut=2000, annee_fin=2027, granularite=1):
+        """Stock colonnaire float32 des indicateurs simulés pour une sélection, à granularite périodes par an"""
+        annees = self.moteur.periodes(annee_debut, annee_fin, granularite)
         config = self.get_advanced_config(selection)
         
-        data = {
-            'Annee': annees,
-            'Budget_Defense_Mds': self.simulate_advanced_budget(annees, config),
-            'Personnel_Milliers': self.simulate_advanced_personnel(annees, config),
-            'PIB_Militaire_Pourcent': self.simulate_military_gdp_percentage(annees),
-            'Exercices_Militaires': self.simulate_advanced_exercises(annees, config),
-            'Readiness_Operative': self.simulate_advanced_readiness(annees),
-            'Capacite_Dissuasion': self.simulate_advanced_deterrence(annees),
-            'Temps_Mobilisation_Jours': self.simulate_advanced_mobilization(annees),
-            'Exercices_Conjoints': self.simulate_joint_exercises(annees),
-            'Developpement_Technologique': self.simulate_tech_development(annees),
-            'Capacite_Navale': self.simulate_naval_capacity(annees),
-            'Couverture_AD': self.simulate_air_defense_coverage(annees),
-            'Cooperation_Alliances': self.simulate_alliance_cooperation(annees),
-            'Cyber_Capabilities': self.simulate_cyber_capabilities(annees),
-            'Production_Armements': self.simulate_weapon_production(annees)
-        }
-        
-        # Données spécifiques aux programmes
-        if 'nucleaire' in config.get('priorites', []):
-            data.update({
-                'Stock_Ogives_Nucleaires': self.simulate_nuclear_arsenal(annees),
-                'Portee_Missiles_Km': self.simulate_missile_range(annees),
-                'Triade_Nucleaire': self.simulate_nuclear_triad(annees)
-            })
-        
-        if 'marine' in config.get('priorites', []):
-            data.update({
-                'Porte_Avions': self.simulate_aircraft_carriers(annees),
-                'Sous_Marins': self.simulate_submarines(annees),
-                'Projection_Maritime': self.simulate_maritime_projection(annees)
-            })
+        # Toutes les séries (communes et spécifiques aux priorités) en une passe vectorisée
+        indicateurs = self.moteur.indicateurs(config)
+        stock = StockColonnaire(annees, indicateurs)
+        stock.remplir(self.moteur.evaluer(annees, config, indicateurs, scenario))
         
-        if 'innovation' in config.get('priorites', []):
-            data.update({
-                'Recherche_Defense': self.simulate_defense_research(annees),
-                'Technologies_Emergentes': self.simulate_emerging_tech(annees),
-                'Exportations_Armes': self.simulate_weapon_exports(annees)
-            })
+        return stock, config
+    
+    def get_cached_data(self, selection, scenario=None, annee_debut=2000, annee_fin=2027, granularite=1):
+        """Couple (DataFrame, config) mis en cache par sélection, scénario, plage d'années et granularité"""
+        def calculer():
+            if INSTANTANE is not None and INSTANTANE.couvre(selection, scenario, annee_debut, annee_fin, granularite):
+                # Lecture sans copie de l'instantané mappé, partagé avec les autres workers de l'hôte
+                return (INSTANTANE.fenetre(selection, scenario, annee_debut, annee_fin, granularite),
+                        self.get_advanced_config(selection))
+            stock, config = self.get_incremental_store(selection, scenario, annee_debut, annee_fin, granularite)
+            return stock.to_dataframe(), config
+        return CACHE_DONNEES.get_or_compute((selection, scenario, annee_debut, annee_fin, granularite), calculer)
+    
+    def get_incremental_store(self, selection, scenario=None, annee_debut=2000, annee_fin=2027, granularite=1):
+        """Stock couvrant [annee_debut, annee_fin], obtenu en étendant celui déjà calculé pour la sélection
         
-        if 'alliances' in config.get('priorites', []):
-            data.update({
-                'Exercices_OTAN': self.simulate_nato_exercises(annees),
-                'Partenariats_Strategiques': self.simulate_strategic_partnerships(annees),
-                'Bases_Etrangeres': self.simulate_foreign_bases(annees)
-            })
+        Seules les années ajoutées avant ou après la plage connue sont simulées ; les lignes
+        existantes sont reprises sans recalcul.
+        """
+        cle = (selection, scenario, granularite)
+        trouve, entree = CACHE_PREFIXES.get(cle)
+        if not trouve:
+            stock, config = self.generate_advanced_store(selection, scenario, annee_debut, annee_fin, granularite)
+            CACHE_PREFIXES.put(cle, (stock, config))
+        else:
+            stock, config = entree
+            if not stock.couvre(annee_debut, annee_fin):
+                premiere, derniere = int(stock.annees[0]), int(stock.annees[-1])
+                avant = apres = None
+                if annee_debut < premiere:
+                    avant, _ = self.generate_advanced_store(selection, scenario, annee_debut, premiere - 1, granularite)
+                if annee_fin > derniere:
+                    apres, _ = self.generate_advanced_store(selection, scenario, derniere + 1, annee_fin, granularite)
+                stock = StockColonnaire.concatener([avant, stock, apres])
+                CACHE_PREFIXES.put(cle, (stock, config))
+        return stock.fenetre(annee_debut, annee_fin), config
+    
+    def define_reference_figures(self):
+        """Figures statiques : nom -> (jeux de référence dont elles dépendent, constructeur)"""
+        return {
+            'projection_regions': (['projection_regions'], self.build_projection_regions_figure),
+            'leadership_technologique': (['leadership_technologique'], self.build_leadership_technologique_figure),
+            'contributions_branches': (['capacites_militaires'], self.build_contributions_branches_figure),
+            'avantages_comparatifs': (['avantages_comparatifs'], self.build_avantages_comparatifs_figure),
+            'systemes_armes': (['systemes_armes'], self.build_systemes_armes_figure),
+            'superiorite_technologique': (['superiorite_technologique'], self.build_superiorite_technologique_figure),
+            'reseau_alliances': (['reseau_alliances'], self.build_reseau_alliances_figure),
+            'cooperation_future': (['cooperation_future'], self.build_cooperation_future_figure),
+            'matrice_menaces': (['matrice_menaces'], self.build_matrice_menaces_figure),
+            'capacites_reponse': (['capacites_reponse'], self.build_capacites_reponse_figure),
+            'carte_alliances': (['projets_alliances'], self.build_carte_alliances_figure)
+        }
+    
+    def get_reference_figure(self, nom, compacte=False):
+        """Figure statique construite une fois par process, reconstruite si ses données de référence changent
+
+        Avec compacte, renvoie sa copie allégée par compacter_figure, elle aussi mise en cache sous la
+        même clé versionnée. Renvoie None tant qu'une des sources dont elle dépend est en cours de chargement.
+        """
+        references, construire = self.define_reference_figures()[nom]
+        if CHARGEUR_REFERENCE.en_attente(references):
+            return None
+        cle = (nom, tuple((ref, VERSIONS_REFERENCE.get(ref, 0)) for ref in references))
+        if compacte:
+            return CACHE_FIGURES.get_or_compute(
+                cle + ('compacte',), lambda: compacter_figure(CACHE_FIGURES.get_or_compute(cle, construire)))
+        return CACHE_FIGURES.get_or_compute(cle, construire)
+    
+    def generate_scenario_batch(self, selections, scenarios=None, annee_debut=2000, annee_fin=2027):
+        """Évalue toutes les combinaisons scénario x sélection en un seul calcul par lot"""
+        scenarios = list(SCENARIOS) if scenarios is None else list(scenarios)
+        annees = np.arange(annee_debut, annee_fin + 1)
+        configs = [self.get_advanced_config(selection) for selection in selections]
+        # Union ordonnée des indicateurs de toutes les sélections
+        indicateurs = list(dict.fromkeys(nom for config in configs for nom in self.moteur.indicateurs(config)))
+        valeurs = self.moteur.evaluer_lot(annees, configs, scenarios, indicateurs)
+        return {'annees': annees, 'selections': list(selections), 'scenarios': scenarios,
+                'indicateurs': indicateurs, 'valeurs': valeurs}
+    
+    def get_scenario_comparison(self, selection, indicateurs, annee_debut=2000, annee_fin=2027):
+        """DataFrame long (Scenario, Annee, indicateurs) de tous les scénarios pour une sélection, en cache"""
+        def calculer():
+            lot = self.generate_scenario_batch([selection], annee_debut=annee_debut, annee_fin=annee_fin)
+            colonnes = [lot['indicateurs'].index(nom) for nom in indicateurs]
+            # (S, 1, I, Y) -> (S * Y, I)
+            valeurs = lot['valeurs'][:, 0, colonnes, :].transpose(0, 2, 1).reshape(-1, len(colonnes))
+            df = pd.DataFrame(valeurs, columns=indicateurs)
+            df.insert(0, 'Annee', np.tile(lot['annees'], len(lot['scenarios'])))
+            df.insert(0, 'Scenario', np.repeat(lot['scenarios'], len(lot['annees'])))
+            return df
+        cle = ('comparaison_scenarios', selection, tuple(indicateurs), annee_debut, annee_fin)
+        return CACHE_DONNEES.get_or_compute(cle, calculer)
+    
+    @staticmethod
+    def cle_monte_carlo(selection, scenario=None, n_runs=20000, graine=0, annee_debut=2000, annee_fin=2027):
+        """Clé des bandes Monte Carlo dans CACHE_DONNEES"""
+        return ('monte_carlo', selection, scenario, n_runs, graine, annee_debut, annee_fin)
+    
+    def get_monte_carlo_bands(self, selection, scenario=None, n_runs=20000, graine=0,
+                              annee_debut=2000, annee_fin=2027):
+        """Bandes P5/P50/P95 des indicateurs de l'analyse multidimensionnelle, en cache par graine"""
+        config = self.get_advanced_config(selection)
+        noms = [nom for nom in INDICATEURS_BANDES if nom in self.moteur.indicateurs(config)]
+        annees = np.arange(annee_debut, annee_fin + 1)
+        cle = self.cle_monte_carlo(selection, scenario, n_runs, graine, annee_debut, annee_fin)
+        return CACHE_DONNEES.get_or_compute(
+            cle, lambda: self.moteur.monte_carlo(annees, config, noms, scenario, n_runs, graine)
+        )
+    
+    def get_country_configs(self):
+        """Configurations du moteur par pays, dérivées de la table de référence 'pays'"""
+        pays = pd.DataFrame(DONNEES_REFERENCE['pays'])
+        budgets = pays['Budget_Base_Mds'].to_numpy(dtype=float)
+        # Exercices et niveaux relatifs à la référence américaine (850 Md$, 280 exercices)
+        exercices = 280 * np.sqrt(budgets / 850.0)
+        decalages = 4 * np.log10(budgets / 850.0)
+        configs = [{'budget_base': budget, 'personnel_base': personnel, 'exercices_base': exercice,
+                    'croissance_budget': croissance, 'exposition_regimes': exposition, 'decalage_niveau': decalage}
+                   for budget, personnel, exercice, croissance, exposition, decalage in zip(
+                       budgets, pays['Personnel_Base_Milliers'], exercices, pays['Croissance_Budget'],
+                       pays['Exposition_Regimes'], decalages)]
+        return pays, configs
+    
+    def generate_country_panel(self, scenario=None, annee_debut=2000, annee_fin=2027):
+        """Panel (pays x années x indicateurs) de tous les pays de référence, calculé en une passe"""
+        pays, configs = self.get_country_configs()
+        annees = np.arange(annee_debut, annee_fin + 1)
+        indicateurs = list(INDICATEURS_PAYS)
+        return {'pays': pays, 'annees': annees, 'indicateurs': indicateurs,
+                'valeurs': self.moteur.evaluer_pays(annees, configs, indicateurs, scenario)}
+    
+    def get_country_panel(self, scenario=None, annee_debut=2000, annee_fin=2027):
+        """Panel multi-pays en cache par scénario, plage d'années et version de la table des pays"""
+        cle = ('pays', scenario, annee_debut, annee_fin, VERSIONS_REFERENCE.get('pays', 0))
+        return CACHE_DONNEES.get_or_compute(
+            cle, lambda: self.generate_country_panel(scenario, annee_debut, annee_fin))
+    
+    def define_country_groups(self, pays):
+        """Groupes d'agrégation : nom -> masque booléen sur les pays"""
+        ue, otan = pays['UE'].to_numpy() == 1, pays['OTAN'].to_numpy() == 1
+        return {
+            'UE': ue,
+            'OTAN': otan,
+            'OTAN hors États-Unis': otan & (pays['Pays'].to_numpy() != "États-Unis"),
+            'UE hors OTAN': ue & ~otan,
+            'Compétiteurs': pays['Groupe'].to_numpy() == 'Compétiteur',
+        }
+    
+    def get_country_index(self, scenario=None, annee_debut=2000, annee_fin=2027, ajustements=()):
+        """Index des agrégats UE/OTAN, construit une fois par panel et partagé entre sessions
         
-        return pd.DataFrame(data), config
+        ajustements : tuple de (pays, facteur budgétaire) appliqués incrémentalement sur une copie
+        de l'index partagé ; seul le pays ajusté est réévalué.
+        """
+        cle = ('index_pays', scenario, annee_debut, annee_fin, VERSIONS_REFERENCE.get('pays', 0))
+        def construire():
+            panel = self.get_country_panel(scenario, annee_debut, annee_fin)
+            return IndexAgregats(panel['pays']['Pays'], panel['annees'], panel['indicateurs'],
+                                 panel['valeurs'], self.define_country_groups(panel['pays']))
+        index = CACHE_DONNEES.get_or_compute(cle, construire)
+        if not ajustements:
+            return index
+        def ajuster():
+            _, configs = self.get_country_configs()
+            ajuste = index.copie()
+            for nom, facteur in ajustements:
+                config = dict(configs[ajuste.position[nom]])
+                config['budget_base'] = config['budget_base'] * facteur
+                ajuste.mettre_a_jour(nom, self.moteur.evaluer_pays(ajuste.annees, [config], ajuste.indicateurs,
+                                                                   scenario)[0])
+            return ajuste
+        return CACHE_DONNEES.get_or_compute(cle + (tuple(ajustements),), ajuster)
     
     def get_advanced_config(self, selection):
         """Configuration avancée avec plus de détails pour les États-Unis"""
@@ -269,156 +2152,112 @@ class DefenseUSADashboardAvance:
             "priorites": ["defense_generique"]
         })
     
-    def simulate_advanced_budget(self, annees, config):
+    def simulate_advanced_budget(self, annees, config, scenario=None):
         """Simulation avancée du budget avec variations géopolitiques"""
-        budget_base = config.get('budget_base', 850.0)
-        budgets = []
-        for annee in annees:
-            base = budget_base * (1 + 0.045 * (annee - 2000))
-            # Variations selon événements géopolitiques
-            if 2001 <= annee <= 2003:  # Guerre contre le terrorisme
-                base *= 1.25
-            elif 2008 <= annee <= 2010:  # Crise financière
-                base *= 0.95
-            elif annee >= 2014:  # Pivot vers l'Asie
-                base *= 1.08
-            elif annee >= 2018:  # Compétition stratégique
-                base *= 1.12
-            elif annee >= 2022:  # Soutien Ukraine
-                base *= 1.15
-            budgets.append(base)
-        return budgets
+        return self.moteur.budget(annees, self.moteur.parametres(config, scenario))
     
     def simulate_advanced_personnel(self, annees, config):
         """Simulation avancée des effectifs"""
-        personnel_base = config.get('personnel_base', 1346)
-        return [personnel_base * (1 + 0.003 * (annee - 2000)) for annee in annees]
+        return self.moteur.personnel(annees, self.moteur.parametres(config))
     
     def simulate_military_gdp_percentage(self, annees):
         """Pourcentage du PIB consacré à la défense"""
-        return [3.0 + 0.08 * (annee - 2000) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['PIB_Militaire_Pourcent'])[0]
     
     def simulate_advanced_exercises(self, annees, config):
         """Exercices militaires avec saisonnalité"""
-        base = config.get('exercices_base', 280)
-        return [base + 8 * (annee - 2000) + 12 * np.sin(2 * np.pi * (annee - 2000)/4) for annee in annees]
+        return self.moteur.exercices(annees, self.moteur.parametres(config))
     
-    def simulate_advanced_readiness(self, annees):
+    def simulate_advanced_readiness(self, annees, scenario=None):
         """Préparation opérationnelle avancée"""
-        readiness = []
-        for annee in annees:
-            base = 85  # Départ élevé
-            if annee >= 2001:  # Post-9/11
-                base += 5
-            if annee >= 2014:  # Réorientation stratégique
-                base += 3
-            if annee >= 2020:  # Modernisation
-                base += 2
-            readiness.append(min(base, 95))
-        return readiness
-    
-    def simulate_advanced_deterrence(self, annees):
+        return self.moteur.readiness(annees, self.moteur.parametres({}, scenario))
+    
+    def simulate_advanced_deterrence(self, annees, scenario=None):
         """Capacité de dissuasion avancée"""
-        deterrence = []
-        for annee in annees:
-            base = 90  # Départ très élevé
-            if annee >= 2001:
-                base += 2  # Guerre contre le terrorisme
-            if annee >= 2018:
-                base += 3  # Compétition grandes puissances
-            deterrence.append(min(base, 96))
-        return deterrence
+        return self.moteur.dissuasion(annees, self.moteur.parametres({}, scenario))
     
     def simulate_advanced_mobilization(self, annees):
         """Temps de mobilisation avancé"""
-        return [max(30 - 1.0 * (annee - 2000), 7) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Temps_Mobilisation_Jours'])[0]
     
     def simulate_joint_exercises(self, annees):
         """Exercices conjoints avec alliés"""
-        exercises = []
-        for annee in annees:
-            if annee < 2001:
-                exercises.append(50)
-            elif annee < 2010:
-                exercises.append(80 + (annee - 2001))
-            else:
-                exercises.append(100 + 3 * (annee - 2010))
-        return exercises
+        return self.moteur.exercices_conjoints(annees)
     
     def simulate_tech_development(self, annees):
         """Développement technologique global"""
-        return [min(80 + 1.5 * (annee - 2000), 95) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Developpement_Technologique'])[0]
     
     def simulate_naval_capacity(self, annees):
         """Capacité navale globale"""
-        return [min(85 + 1.0 * (annee - 2000), 95) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Capacite_Navale'])[0]
     
     def simulate_air_defense_coverage(self, annees):
         """Couverture de défense anti-aérienne"""
-        return [min(80 + 1.2 * (annee - 2000), 94) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Couverture_AD'])[0]
     
     def simulate_alliance_cooperation(self, annees):
         """Coopération avec alliances"""
-        return [min(75 + 1.0 * (annee - 2000), 92) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Cooperation_Alliances'])[0]
     
     def simulate_cyber_capabilities(self, annees):
         """Capacités cybernétiques"""
-        return [min(85 + 1.8 * (annee - 2000), 96) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Cyber_Capabilities'])[0]
     
     def simulate_weapon_production(self, annees):
         """Production d'armements (indice)"""
-        return [min(80 + 1.5 * (annee - 2000), 94) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Production_Armements'])[0]
     
     def simulate_nato_exercises(self, annees):
         """Exercices OTAN"""
-        return [min(40 + 2 * (annee - 2014), 80) for annee in annees if annee >= 2014] + [20] * (2014 - min(annees))
+        return self.moteur.exercices_otan(annees)
     
     def simulate_strategic_partnerships(self, annees):
         """Partenariats stratégiques"""
-        return [min(60 + 1.5 * (annee - 2000), 88) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Partenariats_Strategiques'])[0]
     
     def simulate_foreign_bases(self, annees):
         """Bases militaires à l'étranger"""
-        return [min(700 + 5 * (annee - 2000), 800) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Bases_Etrangeres'])[0]
     
     def simulate_nuclear_arsenal(self, annees):
         """Arsenal nucléaire"""
-        return [min(7000 - 50 * (annee - 2000), 5800) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Stock_Ogives_Nucleaires'])[0]
     
     def simulate_missile_range(self, annees):
         """Portée moyenne des missiles (km)"""
-        return [min(12000 + 100 * (annee - 2000), 15000) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Portee_Missiles_Km'])[0]
     
     def simulate_nuclear_triad(self, annees):
         """Capacité de triade nucléaire"""
-        return [min(95 + 0.2 * (annee - 2000), 98) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Triade_Nucleaire'])[0]
     
     def simulate_aircraft_carriers(self, annees):
         """Porte-avions opérationnels"""
-        return [min(11 + 0.1 * (annee - 2000), 12) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Porte_Avions'])[0]
     
     def simulate_submarines(self, annees):
         """Sous-marins stratégiques"""
-        return [min(70 + 0.5 * (annee - 2000), 75) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Sous_Marins'])[0]
     
     def simulate_maritime_projection(self, annees):
         """Projection maritime"""
-        return [min(90 + 0.5 * (annee - 2000), 96) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Projection_Maritime'])[0]
     
     def simulate_defense_research(self, annees):
         """Recherche défense"""
-        return [min(85 + 1.0 * (annee - 2000), 95) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Recherche_Defense'])[0]
     
     def simulate_emerging_tech(self, annees):
         """Technologies émergentes"""
-        return [min(80 + 1.8 * (annee - 2000), 94) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Technologies_Emergentes'])[0]
     
     def simulate_weapon_exports(self, annees):
         """Exportations d'armes (milliards USD)"""
-        return [min(15 + 0.8 * (annee - 2000), 35) for annee in annees]
+        return self.moteur.series_lineaires(annees, ['Exportations_Armes'])[0]
     
-    def display_advanced_header(self):
-        """En-tête avancé avec plus d'informations"""
+    def display_advanced_header(self, annee_debut=2000, annee_fin=2027):
+        """En-tête avancé avec plus d'informations, pour l'horizon choisi dans le sidebar"""
         st.markdown('<h1 class="main-header">🇺🇸 ANALYSE STRATÉGIQUE AVANCÉE - ÉTATS-UNIS</h1>', 
                    unsafe_allow_html=True)
         
@@ -428,9 +2267,9 @@ class DefenseUSADashboardAvance:
             <div style='text-align: center; background: linear-gradient(135deg, #0033A0, #B22234, #FFFFFF); 
             padding: 1rem; border-radius: 10px; color: white; margin: 1rem 0;'>
             <h3>🛡️ PUISSANCE MILITAIRE AMÉRICAINE - LEADERSHIP GLOBAL</h3>
-            <p><strong>Analyse multidimensionnelle des capacités militaires et de la stratégie globale (2000-2027)</strong></p>
+            <p><strong>Analyse multidimensionnelle des capacités militaires et de la stratégie globale ({}-{})</strong></p>
             </div>
-            """, unsafe_allow_html=True)
+            """.format(annee_debut, annee_fin), unsafe_allow_html=True)
     
     def create_advanced_sidebar(self):
         """Sidebar avancé avec plus d'options"""
@@ -453,33 +2292,79 @@ class DefenseUSADashboardAvance:
         
         # Options avancées
         st.sidebar.markdown("### 🔧 OPTIONS AVANCÉES")
-        show_geopolitical = st.sidebar.checkbox("Contexte géopolitique", value=True)
-        show_alliances = st.sidebar.checkbox("Analyse des alliances", value=True)
-        show_technical = st.sidebar.checkbox("Détails techniques", value=True)
-        threat_assessment = st.sidebar.checkbox("Évaluation des menaces", value=True)
+        # Les options propres à une section sont dans son fragment (voir DEPENDANCES_CONTROLES)
+        rendu_paresseux = st.sidebar.checkbox("Rendu de l'onglet actif uniquement", value=True)
+        diagnostic = st.sidebar.checkbox("Panneau de diagnostic", value=False)
+        graphiques_compacts = st.sidebar.checkbox("Graphiques compacts (WebGL, float32)", value=True)
         
         # Paramètres de simulation
         st.sidebar.markdown("### ⚙️ PARAMÈTRES DE SIMULATION")
-        scenario = st.sidebar.selectbox("Scénario:", ["Leadership Global", "Compétition Grandes Puissances", "Guerre Limitée", "Défense Avancée"])
+        scenario = st.sidebar.selectbox("Scénario:", list(SCENARIOS))
+        annee_debut, annee_fin = st.sidebar.slider("Horizon d'analyse:", HORIZON_MIN, HORIZON_MAX, (2000, 2027))
+        granularite = st.sidebar.selectbox("Granularité:", list(GRANULARITES))
         
         return {
             'selection': selection,
             'type_analyse': type_analyse,
-            'show_geopolitical': show_geopolitical,
-            'show_alliances': show_alliances,
-            'show_technical': show_technical,
-            'threat_assessment': threat_assessment,
-            'scenario': scenario
+            'rendu_paresseux': rendu_paresseux,
+            'diagnostic': diagnostic,
+            'graphiques_compacts': graphiques_compacts,
+            'scenario': scenario,
+            'annee_debut': annee_debut,
+            'annee_fin': annee_fin,
+            'granularite': GRANULARITES[granularite]
+        }
+    
+    def define_section_controls(self):
+        """Contrôles propres à une section : nom -> constructeur(valeurs déjà lues, valeur mémorisée)"""
+        reductions = list(METHODES_REDUCTION.values())
+        return {
+            'reduction': lambda lues, memo: METHODES_REDUCTION[st.radio(
+                "Réduction des courbes:", list(METHODES_REDUCTION), index=reductions.index(memo),
+                horizontal=True, key='reduction')],
+            'comparer_scenarios': lambda lues, memo: st.checkbox(
+                "Comparer tous les scénarios", value=memo, key='comparer_scenarios'),
+            'monte_carlo': lambda lues, memo: st.checkbox(
+                "Incertitude Monte Carlo (P5-P95)", value=memo, key='monte_carlo'),
+            'n_runs': lambda lues, memo: st.select_slider(
+                "Trajectoires:", [1000, 5000, 10000, 20000, 50000], value=memo, key='n_runs') if lues['monte_carlo'] else memo,
+            'graine': lambda lues, memo: int(st.number_input(
+                "Graine:", min_value=0, value=memo, step=1, key='graine')) if lues['monte_carlo'] else memo,
+            'show_technical': lambda lues, memo: st.checkbox("Détails techniques", value=memo, key='show_technical'),
+            'show_geopolitical': lambda lues, memo: st.checkbox("Contexte géopolitique", value=memo,
+                                                                key='show_geopolitical'),
+            'threat_assessment': lambda lues, memo: st.checkbox("Évaluation des menaces", value=memo,
+                                                                key='threat_assessment'),
+            'show_alliances': lambda lues, memo: st.checkbox("Analyse des alliances", value=memo,
+                                                             key='show_alliances'),
         }
     
+    def create_section_controls(self, section):
+        """Contrôles locaux de la section, lus dans son fragment et mémorisés dans l'état de session
+
+        La valeur mémorisée sert de défaut : un contrôle retrouve son état quand sa section, non
+        affichée pendant quelques reruns (rendu paresseux), est à nouveau rendue.
+        """
+        noms = controles_locaux(section['cle'])
+        if not noms:
+            return {}
+        constructeurs = self.define_section_controls()
+        valeurs = {}
+        inactive = section['controle'] in noms and not self.etat.get(section['controle'])
+        with st.expander("⚙️ Options de la section", expanded=inactive):
+            for nom in noms:
+                valeurs[nom] = constructeurs[nom](valeurs, self.etat.get(nom))
+        self.etat.mettre_a_jour(valeurs)
+        return valeurs
+    
     def display_strategic_metrics(self, df, config):
         """Métriques stratégiques avancées"""
         st.markdown('<h3 class="section-header">🎯 TABLEAU DE BORD STRATÉGIQUE ÉTATS-UNIS</h3>', 
                    unsafe_allow_html=True)
         
-        derniere_annee = df['Annee'].max()
-        data_actuelle = df[df['Annee'] == derniere_annee].iloc[0]
-        data_2000 = df[df['Annee'] == 2000].iloc[0]
+        data_actuelle = df.iloc[df['Annee'].argmax()]
+        data_2000 = df.iloc[df['Annee'].argmin()]
+        derniere_annee = np.floor(data_actuelle['Annee'])
         
         # Première ligne de métriques
         col1, col2, col3, col4 = st.columns(4)
@@ -487,11 +2372,11 @@ class DefenseUSADashboardAvance:
         with col1:
             st.markdown("""
             <div class="metric-card">
-                <h4>💰 BUDGET DÉFENSE 2027</h4>
+                <h4>💰 BUDGET DÉFENSE {:.0f}</h4>
                 <h2>{:.0f} Md$</h2>
                 <p>📈 {:.1f}% du PIB américain</p>
             </div>
-            """.format(data_actuelle['Budget_Defense_Mds'], data_actuelle['PIB_Militaire_Pourcent']), 
+            """.format(derniere_annee, data_actuelle['Budget_Defense_Mds'], data_actuelle['PIB_Militaire_Pourcent']), 
             unsafe_allow_html=True)
         
         with col2:
@@ -564,74 +2449,298 @@ class DefenseUSADashboardAvance:
                 f"+{(data_actuelle['Readiness_Operative'] - data_2000['Readiness_Operative']):.1f}%"
             )
     
-    def create_comprehensive_analysis(self, df, config):
-        """Analyse complète multidimensionnelle"""
+    def add_uncertainty_band(self, fig, annees, bande, nom, couleur=None, **kwargs):
+        """Ajoute une bande P5-P95 remplie et la médiane P50 en pointillés"""
+        p5, p50, p95 = bande
+        remplissage = 'rgba(120, 120, 120, 0.15)'
+        if couleur and couleur.startswith('#'):
+            r, g, b = (int(couleur[i:i + 2], 16) for i in (1, 3, 5))
+            remplissage = f'rgba({r}, {g}, {b}, 0.15)'
+        fig.add_trace(go.Scatter(x=annees, y=p95, mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'), **kwargs)
+        fig.add_trace(go.Scatter(x=annees, y=p5, mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor=remplissage,
+                                 name=f"{nom} P5-P95", hoverinfo='skip'), **kwargs)
+        fig.add_trace(go.Scatter(x=annees, y=p50, mode='lines', name=f"{nom} P50",
+                                 line=dict(color=couleur, width=1, dash='dash')), **kwargs)
+    
+    def annees_bandes(self, df):
+        """Années entières couvertes par df : abscisses des bandes Monte Carlo, toujours annuelles"""
+        return np.arange(int(np.floor(df['Annee'].min())), int(np.floor(df['Annee'].max())) + 1)
+    
+    def build_capabilities_figure(self, df, bandes=None, reduction=REDUCTION_DEFAUT):
+        """Évolution des capacités principales"""
+        fig = go.Figure()
+        
+        capacites = ['Readiness_Operative', 'Capacite_Dissuasion', 'Cyber_Capabilities', 'Cooperation_Alliances']
+        noms = ['Préparation Opér.', 'Dissuasion Strat.', 'Capacités Cyber', 'Leadership Alliances']
+        couleurs = ['#0033A0', '#B22234', '#4B0082', '#228B22']
+        
+        for i, (cap, nom, couleur) in enumerate(zip(capacites, noms, couleurs)):
+            if cap in df.columns:
+                x, y = reduire_serie(df['Annee'], df[cap], methode=reduction)
+                fig.add_trace(go.Scatter(
+                    x=x, y=y,
+                    mode='lines', name=nom,
+                    line=dict(color=couleur, width=4),
+                    hovertemplate=f"{nom}: %{{y:.1f}}%<extra></extra>"
+                ))
+                if bandes and cap in bandes:
+                    self.add_uncertainty_band(fig, self.annees_bandes(df), bandes[cap], nom, couleur)
+        
+        premiere, derniere = self.annees_bandes(df)[[0, -1]]
+        fig.update_layout(
+            title=f"📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES USA ({premiere}-{derniere})",
+            xaxis_title="Année",
+            yaxis_title="Niveau de Capacité (%)",
+            height=500,
+            template="plotly_white",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
+    
+    def build_strategic_alliances_figure(self, df, bandes=None, reduction=REDUCTION_DEFAUT):
+        """Alliances stratégiques sur deux axes ; None si la sélection n'a aucune série d'alliance"""
+        strategic_data = []
+        strategic_names = []
+        strategic_columns = []
+        
+        if 'Exercices_Conjoints' in df.columns:
+            strategic_data.append(df['Exercices_Conjoints'])
+            strategic_names.append('Exercices Conjoints')
+            strategic_columns.append('Exercices_Conjoints')
+        
+        if 'Exercices_OTAN' in df.columns:
+            strategic_data.append(df['Exercices_OTAN'])
+            strategic_names.append('Exercices OTAN')
+            strategic_columns.append('Exercices_OTAN')
+        
+        if 'Partenariats_Strategiques' in df.columns:
+            strategic_data.append(df['Partenariats_Strategiques'])
+            strategic_names.append('Partenariats Strat.')
+            strategic_columns.append('Partenariats_Strategiques')
+        
+        if not strategic_data:
+            return None
+        
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        
+        for i, (data, nom, colonne) in enumerate(zip(strategic_data, strategic_names, strategic_columns)):
+            x, y = reduire_serie(df['Annee'], data, methode=reduction)
+            fig.add_trace(
+                go.Scatter(x=x, y=y, name=nom,
+                         line=dict(width=4)),
+                secondary_y=(i > 0)
+            )
+            if bandes and colonne in bandes:
+                self.add_uncertainty_band(fig, self.annees_bandes(df), bandes[colonne], nom,
+                                          secondary_y=(i > 0))
+        
+        fig.update_layout(
+            title="🤝 ALLIANCES STRATÉGIQUES - ÉVOLUTION COMPARÉE",
+            height=500,
+            template="plotly_white"
+        )
+        return fig
+    
+    def create_comprehensive_analysis(self, df, config, bandes=None, reduction=REDUCTION_DEFAUT, bandes_differees=None):
+        """Analyse complète multidimensionnelle ; les courbes longues sont réduites à POINTS_MAX_TRACE points
+
+        bandes_differees : Future des bandes Monte Carlo ; s'il n'est pas encore terminé, les courbes
+        s'affichent d'abord seules, puis sont redessinées avec leurs bandes dès que celles-ci sont calculées.
+        """
         st.markdown('<h3 class="section-header">📊 ANALYSE MULTIDIMENSIONNELLE ÉTATS-UNIS</h3>', 
                    unsafe_allow_html=True)
         
-        # Graphiques principaux
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Évolution des capacités principales
-            fig = go.Figure()
-            
-            capacites = ['Readiness_Operative', 'Capacite_Dissuasion', 'Cyber_Capabilities', 'Cooperation_Alliances']
-            noms = ['Préparation Opér.', 'Dissuasion Strat.', 'Capacités Cyber', 'Leadership Alliances']
-            couleurs = ['#0033A0', '#B22234', '#4B0082', '#228B22']
-            
-            for i, (cap, nom, couleur) in enumerate(zip(capacites, noms, couleurs)):
-                if cap in df.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df['Annee'], y=df[cap],
-                        mode='lines', name=nom,
-                        line=dict(color=couleur, width=4),
-                        hovertemplate=f"{nom}: %{{y:.1f}}%<extra></extra>"
-                    ))
-            
-            fig.update_layout(
-                title="📈 ÉVOLUTION DES CAPACITÉS STRATÉGIQUES USA (2000-2027)",
-                xaxis_title="Année",
-                yaxis_title="Niveau de Capacité (%)",
-                height=500,
-                template="plotly_white",
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        # Graphiques principaux
+        col1, col2 = st.columns(2)
+        emplacements = col1.empty(), col2.empty()
+        
+        def taches(bandes):
+            return [(emplacements[0], lambda: self.build_capabilities_figure(df, bandes, reduction), False),
+                    (emplacements[1], lambda: self.build_strategic_alliances_figure(df, bandes, reduction), True)]
+        
+        if bandes_differees is not None and bandes_differees.done():
+            bandes, bandes_differees = bandes_differees.result(), None
+        self.afficher_figures(self.lancer_figures(taches(bandes)))
+        if bandes_differees is not None:
+            self.afficher_figures(self.lancer_figures(taches(bandes_differees.result())))
+    
+    def build_projection_regions_figure(self):
+        """Bases militaires par région"""
+        projection_df = pd.DataFrame(DONNEES_REFERENCE['projection_regions'])
+        fig = px.bar(projection_df, x='Région', y='Bases_Militaires',
+                    title="🌍 PROJECTION DE PUISSANCE - BASES MILITAIRES PAR RÉGION",
+                    color='Bases_Militaires',
+                    color_continuous_scale='blues')
+        fig.update_layout(height=400)
+        return fig
+    
+    def build_leadership_technologique_figure(self):
+        """Leadership technologique par domaine"""
+        tech_df = pd.DataFrame(DONNEES_REFERENCE['leadership_technologique'])
+        fig = px.scatter(tech_df, x='Depenses_RD_Mds', y='Avance_Technologique',
+                       size='Depenses_RD_Mds', color='Domaine',
+                       title="🚀 LEADERSHIP TECHNOLOGIQUE MILITAIRE",
+                       size_max=30)
+        fig.update_layout(height=300)
+        return fig
+    
+    def build_contributions_branches_figure(self):
+        """Répartition budgétaire par branche"""
+        contributions_data = []
+        for branche, data in self.military_capabilities.items():
+            contributions_data.append({
+                'Branche': branche,
+                'Budget (Md$)': data['budget'],
+                'Personnel (K)': data['personnel'],
+                'Équipements Principaux': data.get('equipements', 'Non spécifié'),
+                'Technologies': data.get('technologies', 'Non spécifié')
+            })
+
+        contributions_df = pd.DataFrame(contributions_data)
+
+        fig = px.bar(contributions_df, x='Branche', y='Budget (Md$)',
+                    title="💰 RÉPARTITION BUDGÉTAIRE PAR BRANCHE",
+                    color='Budget (Md$)',
+                    color_continuous_scale='reds')
+        fig.update_layout(height=400)
+        return fig
+    
+    def build_avantages_comparatifs_figure(self):
+        """Avantages comparatifs face aux meilleurs concurrents"""
+        advantages_df = pd.DataFrame(DONNEES_REFERENCE['avantages_comparatifs'])
+        fig = go.Figure(data=[
+            go.Bar(name='États-Unis', x=advantages_df['Domaine'], y=advantages_df['Score_USA']),
+            go.Bar(name='Meilleurs Concurrents', x=advantages_df['Domaine'], y=advantages_df['Score_Concurrents'])
+        ])
+        fig.update_layout(title="📊 AVANTAGES COMPARATIFS STRATÉGIQUES (0-10)",
+                         barmode='group', height=400)
+        return fig
+    
+    def build_systemes_armes_figure(self):
+        """Systèmes d'armes avancés"""
+        systems_df = pd.DataFrame(DONNEES_REFERENCE['systemes_armes'])
+        fig = px.scatter(systems_df, x='Portée/Puissance', y='Branche', 
+                       size='Portée/Puissance', color='Branche',
+                       hover_name='Système', log_x=True,
+                       title="🚀 SYSTÈMES D'ARMES AVANCÉS DES ÉTATS-UNIS",
+                       size_max=30)
+        fig.update_layout(height=500)
+        return fig
+    
+    def build_superiorite_technologique_figure(self):
+        """Supériorité technologique et investissements R&D"""
+        superior_df = pd.DataFrame(DONNEES_REFERENCE['superiorite_technologique'])
+        fig = go.Figure()
+        fig.add_trace(go.Bar(name='Avance (années)', x=superior_df['Domaine'], 
+                            y=superior_df['Avance_Annees'],
+                            marker_color='#0033A0'))
+        fig.add_trace(go.Scatter(name='Dépenses R&D (Md$)', x=superior_df['Domaine'], 
+                               y=superior_df['Depenses_RD_Mds'],
+                               yaxis='y2', mode='lines+markers',
+                               line=dict(color='#B22234', width=3)))
+
+        fig.update_layout(title="📈 SUPÉRIORITÉ TECHNOLOGIQUE ET INVESTISSEMENTS",
+                         yaxis2=dict(title='Dépenses R&D (Md$)', overlaying='y', side='right'),
+                         height=500)
+        return fig
+    
+    def build_reseau_alliances_figure(self):
+        """Réseau d'alliances stratégiques"""
+        alliance_df = pd.DataFrame(DONNEES_REFERENCE['reseau_alliances'])
+        fig = px.scatter(alliance_df, x='Année_Création', y='Niveau_Coopération',
+                       size='Membres', color='Alliance',
+                       title="🌐 RÉSEAU D'ALLIANCES STRATÉGIQUES",
+                       size_max=30)
+        fig.update_layout(height=400)
+        return fig
+    
+    def build_cooperation_future_figure(self):
+        """Potentiel de coopération future"""
+        future_coop_df = pd.DataFrame(DONNEES_REFERENCE['cooperation_future'])
+        fig = px.bar(future_coop_df, x='Domaine', y='Potentiel',
+                    title="🔮 POTENTIEL DE COOPÉRATION FUTURE",
+                    color='Potentiel',
+                    color_continuous_scale='reds')
+        fig.update_layout(height=300)
+        return fig
+    
+    def build_matrice_menaces_figure(self):
+        """Matrice probabilité / impact des menaces"""
+        threats_df = pd.DataFrame(DONNEES_REFERENCE['matrice_menaces'])
+        fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
+                       size='Niveau_Preparation', color='Type de Menace',
+                       title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
+                       size_max=30)
+        fig.update_layout(height=500)
+        return fig
+    
+    def build_capacites_reponse_figure(self):
+        """Capacités de réponse par scénario"""
+        response_df = pd.DataFrame(DONNEES_REFERENCE['capacites_reponse'])
+        fig = go.Figure(data=[
+            go.Bar(name='Puissance Navale', x=response_df['Scénario'], y=response_df['Puissance_Navale']),
+            go.Bar(name='Supériorité Aérienne', x=response_df['Scénario'], y=response_df['Supériorité_Aérienne']),
+            go.Bar(name='Cybersécurité', x=response_df['Scénario'], y=response_df['Cybersécurité']),
+            go.Bar(name='Alliances', x=response_df['Scénario'], y=response_df['Alliances'])
+        ])
+        fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR DOMAINE",
+                         barmode='group', height=500)
+        return fig
+    
+    def build_carte_alliances_figure(self):
+        """Carte (treemap) des projets d'alliances"""
+        alliance_df = pd.DataFrame(self.alliance_projects_table())
+        fig = px.treemap(alliance_df, path=['Type', 'Projet'],
+                        title="🤝 CARTE DES ALLIANCES STRATÉGIQUES",
+                        color='Type')
+        fig.update_layout(height=500)
+        return fig
+    
+    def build_budget_scenarios_figure(self, comparaison):
+        """Budget défense par scénario"""
+        fig = px.line(comparaison, x='Annee', y='Budget_Defense_Mds', color='Scenario',
+                      title="💰 BUDGET DÉFENSE PAR SCÉNARIO (Md$)")
+        fig.update_layout(height=400, template="plotly_white")
+        return fig
+    
+    def build_preparation_scenarios_figure(self, comparaison):
+        """Préparation et dissuasion par scénario, sur deux axes"""
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        for scenario, groupe in comparaison.groupby('Scenario', sort=False):
+            fig.add_trace(go.Scatter(x=groupe['Annee'], y=groupe['Readiness_Operative'],
+                                     name=f"Préparation - {scenario}", line=dict(width=3)),
+                          secondary_y=False)
+            fig.add_trace(go.Scatter(x=groupe['Annee'], y=groupe['Capacite_Dissuasion'],
+                                     name=f"Dissuasion - {scenario}", line=dict(width=2, dash='dot')),
+                          secondary_y=True)
+        fig.update_layout(title="🛡️ PRÉPARATION ET DISSUASION PAR SCÉNARIO",
+                          height=400, template="plotly_white")
+        return fig
+    
+    def create_scenario_comparison(self, controls, comparaison=None):
+        """Comparaison côte à côte des scénarios, calculée en une seule passe
+
+        comparaison : Future du tableau de comparaison s'il a déjà été lancé en arrière-plan.
+        """
+        st.markdown('<h3 class="section-header">🧭 COMPARAISON DES SCÉNARIOS</h3>', 
+                   unsafe_allow_html=True)
+        
+        if comparaison is None:
+            comparaison = soumettre_calcul(self.get_scenario_comparison, controls['selection'],
+                                           INDICATEURS_COMPARAISON, controls['annee_debut'], controls['annee_fin'])
         
-        with col2:
-            # Analyse des alliances stratégiques
-            strategic_data = []
-            strategic_names = []
-            
-            if 'Exercices_Conjoints' in df.columns:
-                strategic_data.append(df['Exercices_Conjoints'])
-                strategic_names.append('Exercices Conjoints')
-            
-            if 'Exercices_OTAN' in df.columns:
-                strategic_data.append(df['Exercices_OTAN'])
-                strategic_names.append('Exercices OTAN')
-            
-            if 'Partenariats_Strategiques' in df.columns:
-                strategic_data.append(df['Partenariats_Strategiques'])
-                strategic_names.append('Partenariats Strat.')
-            
-            if strategic_data:
-                fig = make_subplots(specs=[[{"secondary_y": True}]])
-                
-                for i, (data, nom) in enumerate(zip(strategic_data, strategic_names)):
-                    fig.add_trace(
-                        go.Scatter(x=df['Annee'], y=data, name=nom,
-                                 line=dict(width=4)),
-                        secondary_y=(i > 0)
-                    )
-                
-                fig.update_layout(
-                    title="🤝 ALLIANCES STRATÉGIQUES - ÉVOLUTION COMPARÉE",
-                    height=500,
-                    template="plotly_white"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+        col1, col2 = st.columns(2)
+        emplacements = col1.empty(), col2.empty()
+        for emplacement in emplacements:
+            emplacement.caption("⏳ Simulation des scénarios...")
+        # Attente dans le thread du script : un calcul du pool n'attend jamais un autre calcul du pool
+        comparaison = comparaison.result()
+        self.afficher_figures(self.lancer_figures([
+            (emplacements[0], lambda: self.build_budget_scenarios_figure(comparaison), False),
+            (emplacements[1], lambda: self.build_preparation_scenarios_figure(comparaison), False),
+        ]))
     
     def create_geopolitical_analysis(self, df, config):
         """Analyse géopolitique avancée"""
@@ -666,36 +2775,10 @@ class DefenseUSADashboardAvance:
         
         with col2:
             # Projection de puissance globale
-            projection_data = {
-                'Région': ['Amérique du Nord', 'Europe', 'Asie-Pacifique', 
-                          'Moyen-Orient', 'Amérique Latine', 'Afrique'],
-                'Bases_Militaires': [120, 180, 220, 80, 50, 60],
-                'Effectifs_Milliers': [450, 65, 85, 45, 15, 6],
-                'Exercices_2023': [45, 38, 52, 25, 12, 8]
-            }
-            projection_df = pd.DataFrame(projection_data)
-            
-            fig = px.bar(projection_df, x='Région', y='Bases_Militaires',
-                        title="🌍 PROJECTION DE PUISSANCE - BASES MILITAIRES PAR RÉGION",
-                        color='Bases_Militaires',
-                        color_continuous_scale='blues')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('projection_regions')
             
             # Leadership technologique
-            tech_data = {
-                'Domaine': ['Aéronautique', 'Naval', 'Spatial', 'Cyber', 'Nucléaire', 'Renseignement'],
-                'Avance_Technologique': [9, 9, 9, 9, 9, 9],  # sur 10
-                'Depenses_RD_Mds': [45, 32, 28, 18, 25, 15]
-            }
-            tech_df = pd.DataFrame(tech_data)
-            
-            fig = px.scatter(tech_df, x='Depenses_RD_Mds', y='Avance_Technologique',
-                           size='Depenses_RD_Mds', color='Domaine',
-                           title="🚀 LEADERSHIP TECHNOLOGIQUE MILITAIRE",
-                           size_max=30)
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('leadership_technologique')
     
     def create_branch_analysis(self, df, config):
         """Analyse des capacités par branche"""
@@ -706,24 +2789,7 @@ class DefenseUSADashboardAvance:
         
         with col1:
             # Contributions des branches
-            contributions_data = []
-            for branche, data in self.military_capabilities.items():
-                contributions_data.append({
-                    'Branche': branche,
-                    'Budget (Md$)': data['budget'],
-                    'Personnel (K)': data['personnel'],
-                    'Équipements Principaux': data.get('equipements', 'Non spécifié'),
-                    'Technologies': data.get('technologies', 'Non spécifié')
-                })
-            
-            contributions_df = pd.DataFrame(contributions_data)
-            
-            fig = px.bar(contributions_df, x='Branche', y='Budget (Md$)',
-                        title="💰 RÉPARTITION BUDGÉTAIRE PAR BRANCHE",
-                        color='Budget (Md$)',
-                        color_continuous_scale='reds')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('contributions_branches')
         
         with col2:
             # Spécialisations stratégiques
@@ -739,21 +2805,7 @@ class DefenseUSADashboardAvance:
             """, unsafe_allow_html=True)
             
             # Avantages comparatifs
-            advantages_data = {
-                'Domaine': ['Puissance Navale', 'Supériorité Aérienne', 'Forces Terrestres', 
-                           'Capacité Nucléaire', 'Cybersécurité', 'Renseignement', 'Espace'],
-                'Score_USA': [10, 10, 9, 10, 10, 10, 10],
-                'Score_Concurrents': [7, 8, 8, 9, 8, 8, 7]  # Meilleurs concurrents
-            }
-            advantages_df = pd.DataFrame(advantages_data)
-            
-            fig = go.Figure(data=[
-                go.Bar(name='États-Unis', x=advantages_df['Domaine'], y=advantages_df['Score_USA']),
-                go.Bar(name='Meilleurs Concurrents', x=advantages_df['Domaine'], y=advantages_df['Score_Concurrents'])
-            ])
-            fig.update_layout(title="📊 AVANTAGES COMPARATIFS STRATÉGIQUES (0-10)",
-                             barmode='group', height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('avantages_comparatifs')
     
     def create_technical_analysis(self, df, config):
         """Analyse technique détaillée"""
@@ -764,48 +2816,11 @@ class DefenseUSADashboardAvance:
         
         with col1:
             # Analyse des systèmes d'armes avancés
-            systems_data = {
-                'Système': ['F-35 Lightning II', 'B-21 Raider', 'Gerald R. Ford', 
-                           'Columbia Class', 'DDG(X)', 'Ground Based Strategic Deterrent',
-                           'Hypersonic Strike', 'Space Fence'],
-                'Portée/Puissance': [2200, 15000, 100000, 12000, 9000, 13000, 5000, 36000],
-                'Branche': ['Air Force', 'Air Force', 'Navy', 'Navy', 'Navy', 'Air Force', 'Multi', 'Space Force'],
-                'Statut': ['Opérationnel', 'Développement', 'Opérationnel', 'Développement', 'Développement', 'Développement', 'Test', 'Opérationnel']
-            }
-            systems_df = pd.DataFrame(systems_data)
-            
-            fig = px.scatter(systems_df, x='Portée/Puissance', y='Branche', 
-                           size='Portée/Puissance', color='Branche',
-                           hover_name='Système', log_x=True,
-                           title="🚀 SYSTÈMES D'ARMES AVANCÉS DES ÉTATS-UNIS",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('systemes_armes')
         
         with col2:
             # Analyse de la supériorité technologique
-            superiority_data = {
-                'Domaine': ['Aviation 5e Génération', 'Porte-avions Nucléaires', 
-                          'Sous-marins Furtifs', 'Missiles Hypersoniques',
-                          'Guerre Cyber Offensive', 'Surveillance Spatiale'],
-                'Avance_Annees': [15, 20, 10, 2, 5, 10],
-                'Depenses_RD_Mds': [120, 45, 30, 8, 12, 15]
-            }
-            superior_df = pd.DataFrame(superiority_data)
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='Avance (années)', x=superior_df['Domaine'], 
-                                y=superior_df['Avance_Annees'],
-                                marker_color='#0033A0'))
-            fig.add_trace(go.Scatter(name='Dépenses R&D (Md$)', x=superior_df['Domaine'], 
-                                   y=superior_df['Depenses_RD_Mds'],
-                                   yaxis='y2', mode='lines+markers',
-                                   line=dict(color='#B22234', width=3)))
-            
-            fig.update_layout(title="📈 SUPÉRIORITÉ TECHNOLOGIQUE ET INVESTISSEMENTS",
-                             yaxis2=dict(title='Dépenses R&D (Md$)', overlaying='y', side='right'),
-                             height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('superiorite_technologique')
             
             # Innovations en cours
             st.markdown("""
@@ -828,22 +2843,7 @@ class DefenseUSADashboardAvance:
         
         with col1:
             # Réseau d'alliances
-            alliance_data = {
-                'Alliance': ['OTAN', 'ANZUS', 'Traité de Sécurité Japon-USA', 
-                            'Corée du Sud-USA', 'Israel-USA', 'Arabie Saoudite-USA',
-                            'QUAD', 'AUKUS'],
-                'Membres': [32, 3, 2, 2, 2, 2, 4, 3],
-                'Année_Création': [1949, 1951, 1960, 1953, 1981, 1945, 2007, 2021],
-                'Niveau_Coopération': [9, 8, 9, 9, 10, 8, 7, 8]  # sur 10
-            }
-            alliance_df = pd.DataFrame(alliance_data)
-            
-            fig = px.scatter(alliance_df, x='Année_Création', y='Niveau_Coopération',
-                           size='Membres', color='Alliance',
-                           title="🌐 RÉSEAU D'ALLIANCES STRATÉGIQUES",
-                           size_max=30)
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('reseau_alliances')
         
         with col2:
             # Avantages des alliances
@@ -859,20 +2859,7 @@ class DefenseUSADashboardAvance:
             """, unsafe_allow_html=True)
             
             # Domaines de coopération future
-            future_coop_data = {
-                'Domaine': ['Defense Missile Globale', 'Guerre Cyber Collective', 
-                           'Espace Militaire', 'Guerre Électronique',
-                           'Renseignement Artificiel', 'Exercices Conjoints Avancés'],
-                'Potentiel': [9, 10, 8, 9, 10, 9]  # sur 10
-            }
-            future_coop_df = pd.DataFrame(future_coop_data)
-            
-            fig = px.bar(future_coop_df, x='Domaine', y='Potentiel',
-                        title="🔮 POTENTIEL DE COOPÉRATION FUTURE",
-                        color='Potentiel',
-                        color_continuous_scale='reds')
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('cooperation_future')
     
     def create_threat_assessment(self, df, config):
         """Évaluation avancée des menaces"""
@@ -883,46 +2870,11 @@ class DefenseUSADashboardAvance:
         
         with col1:
             # Matrice des menaces avancées
-            threats_data = {
-                'Type de Menace': ['Rivalité Chine', 'Confrontation Russie', 
-                                 'Guerre Cyber Majeure', 'Prolifération Nucléaire',
-                                 'Terrorisme Global', 'Instabilité Moyen-Orient',
-                                 'Course Spatiale', 'Crise Taïwan'],
-                'Probabilité': [0.9, 0.7, 0.8, 0.6, 0.5, 0.8, 0.7, 0.6],
-                'Impact': [0.9, 0.8, 0.7, 0.8, 0.6, 0.7, 0.6, 0.9],
-                'Niveau_Preparation': [0.8, 0.7, 0.9, 0.6, 0.9, 0.7, 0.8, 0.7]
-            }
-            threats_df = pd.DataFrame(threats_data)
-            
-            fig = px.scatter(threats_df, x='Probabilité', y='Impact', 
-                           size='Niveau_Preparation', color='Type de Menace',
-                           title="🎯 MATRICE RISQUES - PROBABILITÉ VS IMPACT",
-                           size_max=30)
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('matrice_menaces')
         
         with col2:
             # Capacités de réponse par domaine
-            response_data = {
-                'Scénario': ['Conflit Hauturier Chine', 'Crise Ukraine/Russie', 
-                           'Attaque Cyber Majeure', 'Crise Nucléaire Corée Nord',
-                           'Crise Détroit Taïwan', 'Terrorisme Global'],
-                'Puissance_Navale': [0.9, 0.7, 0.3, 0.6, 0.9, 0.4],
-                'Supériorité_Aérienne': [0.8, 0.8, 0.2, 0.7, 0.9, 0.6],
-                'Cybersécurité': [0.6, 0.5, 0.9, 0.4, 0.5, 0.7],
-                'Alliances': [0.7, 0.9, 0.6, 0.5, 0.7, 0.8]
-            }
-            response_df = pd.DataFrame(response_data)
-            
-            fig = go.Figure(data=[
-                go.Bar(name='Puissance Navale', x=response_df['Scénario'], y=response_df['Puissance_Navale']),
-                go.Bar(name='Supériorité Aérienne', x=response_df['Scénario'], y=response_df['Supériorité_Aérienne']),
-                go.Bar(name='Cybersécurité', x=response_df['Scénario'], y=response_df['Cybersécurité']),
-                go.Bar(name='Alliances', x=response_df['Scénario'], y=response_df['Alliances'])
-            ])
-            fig.update_layout(title="🛡️ CAPACITÉS DE RÉPONSE PAR DOMAINE",
-                             barmode='group', height=500)
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_reference_figure('capacites_reponse')
         
         # Recommandations stratégiques
         st.markdown("""
@@ -944,27 +2896,13 @@ class DefenseUSADashboardAvance:
         st.markdown('<h3 class="section-header">🤝 BASE DE DONNÉES DES ALLIANCES STRATÉGIQUES</h3>', 
                    unsafe_allow_html=True)
         
-        alliance_data = []
-        for nom, specs in self.alliance_projects.items():
-            alliance_data.append({
-                'Projet': nom,
-                'Pays Participants': specs['pays'],
-                'Type': specs['type'],
-                'Statut': specs['statut'],
-                'Détails': specs.get('objectif', specs.get('localisation', specs.get('technologies', 'N/A')))
-            })
-        
-        alliance_df = pd.DataFrame(alliance_data)
+        alliance_data = self.alliance_projects_table()
         
-        # Affichage interactif
+        # Affichage interactif : la liste des projets s'affiche pendant la construction de la carte
         col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            fig = px.treemap(alliance_df, path=['Type', 'Projet'],
-                            title="🤝 CARTE DES ALLIANCES STRATÉGIQUES",
-                            color='Type')
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
+        compacte = self.graphiques_compacts
+        carte = self.lancer_figures(
+            [(col1.empty(), lambda: self.get_reference_figure('carte_alliances', compacte), False)], compacter=False)
         
         with col2:
             st.markdown("""
@@ -982,53 +2920,247 @@ class DefenseUSADashboardAvance:
                 """, unsafe_allow_html=True)
             
             st.markdown("</div>", unsafe_allow_html=True)
+        
+        self.afficher_figures(carte)
+    
+    def create_country_comparison(self, df, config, controls):
+        """Comparaison multi-pays : totaux UE/OTAN et classement, lus dans l'index des agrégats"""
+        st.markdown('<h3 class="section-header">🇪🇺 COMPARAISON UE / OTAN / COMPÉTITEURS</h3>', 
+                   unsafe_allow_html=True)
+        
+        pays, _ = self.get_country_configs()
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            indicateur = st.selectbox("Indicateur comparé:", list(INDICATEURS_PAYS), key='indicateur_pays')
+        with col2:
+            # Ajustement d'un seul pays : l'index partagé est copié puis mis à jour incrémentalement
+            pays_ajuste = st.selectbox("Ajuster le budget de:", ["Aucun"] + list(pays['Pays']), key='pays_ajuste')
+        with col3:
+            facteur = st.number_input("Facteur:", min_value=0.1, max_value=5.0, value=1.0, step=0.1,
+                                      key='facteur_pays', disabled=pays_ajuste == "Aucun")
+        ajustements = () if pays_ajuste == "Aucun" or facteur == 1.0 else ((pays_ajuste, float(facteur)),)
+        index = self.get_country_index(controls['scenario'], controls['annee_debut'], controls['annee_fin'],
+                                       ajustements)
+        
+        derniere_annee = int(index.annees[-1])
+        somme = INDICATEURS_PAYS[indicateur] == 'somme'
+        agreger = index.total if somme else index.moyenne
+        format_valeur = "{:,.0f}" if somme else "{:.1f}"
+        
+        # Totaux (ou moyennes) de la dernière année
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric(f"🇪🇺 UE {derniere_annee}", format_valeur.format(agreger('UE', indicateur, derniere_annee)))
+        with col2:
+            st.metric(f"🛡️ OTAN {derniere_annee}", format_valeur.format(agreger('OTAN', indicateur, derniere_annee)))
+        with col3:
+            st.metric("🌍 OTAN hors États-Unis",
+                      format_valeur.format(agreger('OTAN hors États-Unis', indicateur, derniere_annee)))
+        with col4:
+            if somme:
+                st.metric("📊 Part UE dans l'OTAN",
+                          f"{index.part('UE', 'OTAN', indicateur, derniere_annee) * 100:.1f}%")
+            else:
+                st.metric("⚔️ Compétiteurs", format_valeur.format(agreger('Compétiteurs', indicateur, derniere_annee)))
+        
+        col5, col6, col7 = st.columns(3)
+        with col5:
+            st.metric("🇺🇸 Rang des États-Unis", f"{index.rang('États-Unis', indicateur, derniere_annee)}"
+                      f" / {len(index.entites)}")
+        with col6:
+            if somme:
+                st.metric("🏅 Part des 5 premiers",
+                          f"{index.part_cumulee(5, indicateur, derniere_annee) * 100:.1f}%")
+        with col7:
+            if ajustements:
+                st.metric(f"🎚️ Rang de {pays_ajuste}", f"{index.rang(pays_ajuste, indicateur, derniere_annee)}")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            groupes = index.series_groupes(indicateur, moyenne=not somme)
+            fig = go.Figure()
+            for groupe in groupes.columns:
+                fig.add_trace(go.Scatter(x=groupes.index, y=groupes[groupe], mode='lines', name=groupe,
+                                         line=dict(width=3)))
+            agregation = "total" if somme else "moyenne"
+            fig.update_layout(title=f"📈 {indicateur} - {agregation} par groupe",
+                              height=450, template="plotly_white")
+            self.render_figure(fig)
+        
+        with col2:
+            n = st.slider("Pays classés:", 5, len(index.entites), min(20, len(index.entites)), key='top_pays')
+            noms, valeurs = index.top(n, indicateur, derniere_annee)
+            groupe_par_pays = dict(zip(pays['Pays'], pays['Groupe']))
+            classement = pd.DataFrame({'Pays': noms, 'Groupe': [groupe_par_pays[nom] for nom in noms],
+                                       indicateur: valeurs})
+            fig = px.bar(classement, x=indicateur, y='Pays', color='Groupe', orientation='h',
+                         title=f"🏆 TOP {n} {derniere_annee}",
+                         color_discrete_map={'Allié': '#0033A0', 'Partenaire': '#228B22', 'Compétiteur': '#B22234'})
+            fig.update_layout(height=max(450, 22 * n), template="plotly_white",
+                              yaxis=dict(categoryorder='total ascending'))
+            self.render_figure(fig)
+    
+    def define_sections(self):
+        """Sections du dashboard : clé (DEPENDANCES_CONTROLES), titre, rendu, contrôle d'activation et besoin des données"""
+        return [
+            {'cle': 'tableau', 'titre': "📊 Tableau de Bord", 'rendu': self.render_dashboard_section,
+             'controle': None, 'donnees': True, 'avec_controles': True},
+            {'cle': 'technique', 'titre': "🔬 Analyse Technique", 'rendu': self.create_technical_analysis,
+             'controle': 'show_technical', 'donnees': False},
+            {'cle': 'leadership', 'titre': "🌍 Leadership Global", 'rendu': self.create_geopolitical_analysis,
+             'controle': 'show_geopolitical', 'donnees': False},
+            {'cle': 'branches', 'titre': "⚔️ Branches Militaires", 'rendu': self.create_branch_analysis,
+             'controle': None, 'donnees': False},
+            {'cle': 'menaces', 'titre': "⚠️ Évaluation Menaces", 'rendu': self.create_threat_assessment,
+             'controle': 'threat_assessment', 'donnees': False},
+            {'cle': 'alliances', 'titre': "🤝 Alliances Stratégiques", 'rendu': lambda df, config: self.create_alliance_database(),
+             'controle': 'show_alliances', 'donnees': False},
+            {'cle': 'pays', 'titre': "🇪🇺 Comparaison UE/OTAN", 'rendu': self.create_country_comparison,
+             'controle': None, 'donnees': False, 'avec_controles': True},
+            {'cle': 'synthese', 'titre': "💎 Synthèse Stratégique", 'rendu': self.create_strategic_synthesis,
+             'controle': None, 'donnees': False, 'avec_controles': True}
+        ]
+    
+    def render_dashboard_section(self, df, config, controls):
+        """Onglet tableau de bord : métriques d'abord, puis chaque graphique dès que ses données sont prêtes"""
+        # Calculs lourds lancés en arrière-plan avant l'affichage des métriques
+        bandes = bandes_differees = comparaison = None
+        if controls['monte_carlo']:
+            parametres = (controls['selection'], controls['scenario'], controls['n_runs'], controls['graine'],
+                          controls['annee_debut'], controls['annee_fin'])
+            if CACHE_DONNEES.contient(self.cle_monte_carlo(*parametres)):
+                # Bandes déjà en cache : chaque graphique n'est dessiné qu'une fois, avec ses bandes
+                bandes = self.get_monte_carlo_bands(*parametres)
+            else:
+                bandes_differees = soumettre_calcul(self.get_monte_carlo_bands, *parametres)
+        if controls['comparer_scenarios']:
+            comparaison = soumettre_calcul(self.get_scenario_comparison, controls['selection'],
+                                           INDICATEURS_COMPARAISON, controls['annee_debut'], controls['annee_fin'])
+        self.display_strategic_metrics(df, config)
+        self.create_comprehensive_analysis(df, config, bandes, controls['reduction'], bandes_differees)
+        if controls['comparer_scenarios']:
+            self.create_scenario_comparison(controls, comparaison)
+    
+    def render_section(self, section, controls, charger_donnees):
+        """Rend une section si elle est activée ; les données ne sont générées que si elle en a besoin"""
+        if section['controle'] and not controls[section['controle']]:
+            return False
+        if section['donnees']:
+            df, config = charger_donnees()
+        else:
+            df, config = None, self.get_advanced_config(controls['selection'])
+        if section.get('avec_controles'):
+            section['rendu'](df, config, controls)
+        else:
+            section['rendu'](df, config)
+        return True
+    
+    def render_section_fragment(self, section, controls, charger_donnees):
+        """Rend la section dans un fragment Streamlit : ses contrôles locaux ne relancent qu'elle
+
+        Lors d'un rerun du fragment, Streamlit rappelle cette fonction avec les contrôles du sidebar
+        et le chargeur de données du dernier rerun complet.
+        """
+        @st.fragment
+        def fragment():
+            controles = dict(controls, **self.create_section_controls(section))
+            if not self.render_section(section, controles, charger_donnees):
+                st.info("Section désactivée dans ses options.")
+        fragment()
+    
+    def render_figure(self, fig, conteneur=None, compacte=False):
+        """Affiche une figure Plotly (dans conteneur si fourni, ex. un st.empty), allégée par
+        compacter_figure si le mode graphiques compacts est actif et qu'elle ne l'est pas déjà"""
+        conteneur = st if conteneur is None else conteneur
+        if fig is None:
+            conteneur.info("⏳ Données de référence en cours de chargement...")
+            return
+        if self.graphiques_compacts and not compacte:
+            fig = compacter_figure(fig)
+        conteneur.plotly_chart(fig, use_container_width=True)
+    
+    def render_reference_figure(self, nom):
+        """Affiche une figure de référence ; sa version compacte vient du cache, sans recompaction au rerun"""
+        self.render_figure(self.get_reference_figure(nom, self.graphiques_compacts), compacte=True)
+    
+    def lancer_figures(self, taches, compacter=True):
+        """Lance la construction (et la compaction) des figures sur POOL_CALCUL
+
+        taches : liste de (emplacement st.empty, construction, facultative). Une construction qui
+        renvoie None vide son emplacement si elle est facultative, sinon y signale un chargement en cours.
+        compacter=False : les constructions renvoient déjà la forme voulue (ex. figures de référence en cache).
+        """
+        compacte = compacter and self.graphiques_compacts  # lu ici : l'état de session n'est pas accessible aux threads de calcul
+        def construire(construction):
+            fig = construction()
+            return compacter_figure(fig) if compacte and fig is not None else fig
+        lancees = []
+        for emplacement, construction, facultative in taches:
+            emplacement.caption("⏳ Construction du graphique...")
+            lancees.append((soumettre_calcul(construire, construction), emplacement, facultative))
+        return lancees
+    
+    def afficher_figures(self, lancees):
+        """Remplit chaque emplacement dès que sa figure est prête, dans l'ordre de fin des calculs"""
+        emplacements = {futur: (emplacement, facultative) for futur, emplacement, facultative in lancees}
+        for futur in as_completed(emplacements):
+            emplacement, facultative = emplacements[futur]
+            fig = futur.result()
+            if fig is None and facultative:
+                emplacement.empty()
+            else:
+                self.render_figure(fig, emplacement, compacte=True)
+    
+    def display_debug_panel(self):
+        """Panneau de diagnostic : mesures du rerun courant et état des caches"""
+        with st.sidebar.expander("🩺 DIAGNOSTIC DU RERUN", expanded=True):
+            mesures = METRIQUES.mesures_rerun()
+            if mesures:
+                st.dataframe(pd.DataFrame(mesures).round(2), hide_index=True, use_container_width=True)
+            st.dataframe(pd.DataFrame({nom: cache.stats() for nom, cache in METRIQUES.caches.items()}).T,
+                         use_container_width=True)
+            if CHARGEUR_REFERENCE.sources:
+                st.dataframe(pd.DataFrame(CHARGEUR_REFERENCE.etat()).T, use_container_width=True)
+            st.caption("Préchauffage : " + ", ".join(f"{cle} = {valeur}" for cle, valeur in PRECHAUFFAGE.etat().items()))
+            if INSTANTANE is not None:
+                st.caption("Instantané : " + ", ".join(f"{cle} = {valeur}" for cle, valeur in INSTANTANE.etat().items()))
+            st.caption(f"Reruns du process : {METRIQUES.reruns}")
     
     def run_advanced_dashboard(self):
         """Exécute le dashboard avancé complet"""
+        METRIQUES.debut_rerun()
+        
         # Sidebar avancé
         controls = self.create_advanced_sidebar()
+        self.etat.mettre_a_jour(controls)
         
         # Header avancé
-        self.display_advanced_header()
-        
-        # Génération des données avancées
-        df, config = self.generate_advanced_data(controls['selection'])
-        
-        # Navigation par onglets avancés
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "📊 Tableau de Bord", 
-            "🔬 Analyse Technique", 
-            "🌍 Leadership Global", 
-            "⚔️ Branches Militaires",
-            "⚠️ Évaluation Menaces",
-            "🤝 Alliances Stratégiques",
-            "💎 Synthèse Stratégique"
-        ])
+        self.display_advanced_header(controls['annee_debut'], controls['annee_fin'])
         
-        with tab1:
-            self.display_strategic_metrics(df, config)
-            self.create_comprehensive_analysis(df, config)
+        # Génération des données avancées, différée jusqu'à la première section qui en a besoin
+        def charger_donnees():
+            cle = (controls['selection'], controls['scenario'], controls['annee_debut'], controls['annee_fin'],
+                   controls['granularite'])
+            PRECHAUFFAGE.enregistrer_acces(cle)
+            return self.get_cached_data(*cle)
         
-        with tab2:
-            self.create_technical_analysis(df, config)
+        sections = self.define_sections()
+        titres = [section['titre'] for section in sections]
         
-        with tab3:
-            if controls['show_geopolitical']:
-                self.create_geopolitical_analysis(df, config)
-        
-        with tab4:
-            self.create_branch_analysis(df, config)
-        
-        with tab5:
-            if controls['threat_assessment']:
-                self.create_threat_assessment(df, config)
-        
-        with tab6:
-            if controls['show_alliances']:
-                self.create_alliance_database()
+        if controls['rendu_paresseux']:
+            # Seule la section active construit ses DataFrames et figures
+            titre_actif = st.radio("Section:", titres, horizontal=True,
+                                   key='section_active', label_visibility="collapsed")
+            self.render_section_fragment(sections[titres.index(titre_actif)], controls, charger_donnees)
+        else:
+            # Navigation par onglets avancés
+            for onglet, section in zip(st.tabs(titres), sections):
+                with onglet:
+                    self.render_section_fragment(section, controls, charger_donnees)
         
-        with tab7:
-            self.create_strategic_synthesis(df, config, controls)
+        if controls['diagnostic']:
+            self.display_debug_panel()
     
     def create_strategic_synthesis(self, df, config, controls):
         """Synthèse stratégique finale"""
@@ -1131,7 +3263,932 @@ class DefenseUSADashboardAvance:
         </div>
         """, unsafe_allow_html=True)
 
+instrumenter(DefenseUSADashboardAvance, ('generate_', 'simulate_', 'create_', 'display_', 'run_advanced_dashboard'))
+instrumenter(MoteurSimulation, ('evaluer', 'monte_carlo'))
+
+
+# Instance unique du process, partagée par les reruns et les sessions (leurs choix vivent dans EtatSession)
+DASHBOARD = None
+_VERROU_DASHBOARD = threading.Lock()
+
+
+def obtenir_dashboard():
+    """Instance du dashboard du process, créée au premier appel"""
+    global DASHBOARD
+    if DASHBOARD is None:
+        with _VERROU_DASHBOARD:
+            if DASHBOARD is None:
+                DASHBOARD = DefenseUSADashboardAvance()
+    return DASHBOARD
+
+
+# Balayage de paramètres headless (budget_base, personnel_base, exercices_base par branche)
+
+# Indicateurs de résultat du balayage ; True = plus petit est meilleur
+CRITERES_BALAYAGE = {
+    'Readiness_Operative': False,
+    'Capacite_Dissuasion': False,
+    'Temps_Mobilisation_Jours': True,
+    'Budget_Par_Soldat_kUSD': False,
+    'Exercices_Par_Millier': False,
+    'Budget_Cumule_Mds': True,
+}
+
+# Facteurs appliqués à la base d'une branche quand un axe du balayage n'est pas fourni
+FACTEURS_BALAYAGE_DEFAUT = np.linspace(0.5, 1.5, 11)
+
+
+def _axes_balayage(config, budgets=None, personnels=None, exercices=None):
+    """Valeurs de chaque axe ; à défaut, ±50 % autour de la base de la configuration"""
+    p = MoteurSimulation.parametres(config)
+    return [
+        np.asarray(valeurs if valeurs is not None else p[cle] * FACTEURS_BALAYAGE_DEFAUT, dtype=float)
+        for valeurs, cle in ((budgets, 'budget_base'), (personnels, 'personnel_base'),
+                             (exercices, 'exercices_base'))
+    ]
+
+
+def _evaluer_lot_balayage(branche, axes, debut, fin, scenario=None, annee_debut=2000, annee_fin=2027,
+                          critere='Readiness_Operative', top=10, garder_tout=False):
+    """Évalue les combinaisons [debut, fin) de la grille d'une branche (exécuté dans un process du pool)
+
+    Renvoie (lot complet ou None, top-N local) : le classement est réduit dans le worker
+    pour que le process parent ne fusionne que de petits tableaux.
+    """
+    moteur = MoteurSimulation()
+    annees = np.arange(annee_debut, annee_fin + 1, dtype=float)
+    config = obtenir_dashboard().get_advanced_config(branche)
+    
+    # Combinaisons reconstruites depuis leurs indices : seuls les axes transitent entre process
+    indices = np.unravel_index(np.arange(debut, fin), [len(axe) for axe in axes])
+    budgets, personnels, exercices = (axe[i] for axe, i in zip(axes, indices))
+    p = moteur.parametres(config, scenario)
+    p.update(budget_base=budgets[:, None], personnel_base=personnels[:, None], exercices_base=exercices[:, None])
+    
+    budget = moteur.budget(annees, p)
+    personnel = moteur.personnel(annees, p)
+    n = fin - debut
+    lot = pd.DataFrame({
+        'Branche': branche,
+        'Budget_Base': budgets,
+        'Personnel_Base': personnels,
+        'Exercices_Base': exercices,
+        'Readiness_Operative': np.broadcast_to(moteur.readiness(annees, p)[..., -1], n),
+        'Capacite_Dissuasion': np.broadcast_to(moteur.dissuasion(annees, p)[..., -1], n),
+        'Temps_Mobilisation_Jours': np.broadcast_to(moteur.serie('Temps_Mobilisation_Jours', annees, p)[-1], n),
+        'Budget_Cumule_Mds': budget.sum(axis=1),
+        'Budget_Par_Soldat_kUSD': budget[:, -1] / personnel[:, -1] * 1e3,
+        'Exercices_Par_Millier': moteur.exercices(annees, p)[:, -1] / personnel[:, -1],
+    })
+    return (lot if garder_tout else None), _classer(lot, critere, top)
+
+
+def _ecrire_resultats(chemin, df, etat):
+    """Ajoute un lot de résultats au fichier de sortie (CSV, ou Parquet si l'extension l'indique)"""
+    if chemin.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if 'writer' not in etat:
+            etat['writer'] = pq.ParquetWriter(chemin, table.schema)
+        etat['writer'].write_table(table)
+    else:
+        df.to_csv(chemin, mode='a' if etat.get('entete') else 'w', header=not etat.get('entete'), index=False)
+        etat['entete'] = True
+
+
+def _classer(df, critere, top):
+    """Top-N par branche selon le critère, départagé par les autres indicateurs de résultat"""
+    cles = [critere] + [c for c in CRITERES_BALAYAGE if c != critere]
+    return (df.sort_values(cles, ascending=[CRITERES_BALAYAGE[c] for c in cles], kind='stable')
+              .groupby('Branche', sort=False).head(top))
+
+
+def balayer_parametres(branches=None, budgets=None, personnels=None, exercices=None, scenario=None,
+                       annee_debut=2000, annee_fin=2027, sortie=None, critere='Readiness_Operative',
+                       top=10, taille_lot=20000, n_workers=None):
+    """Balayage de la grille budgets x personnels x exercices pour chaque branche sur un pool de process
+
+    Chaque lot est écrit dans `sortie` dès qu'il est terminé ; seul le classement top-N
+    courant est conservé en mémoire. Renvoie le classement final par branche.
+    """
+    if critere not in CRITERES_BALAYAGE:
+        raise ValueError(f"Critère inconnu : {critere} (attendu : {', '.join(CRITERES_BALAYAGE)})")
+    if branches is None:
+        branches = obtenir_dashboard().branches_options
+    
+    etat = {}
+    classement = None
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = []
+        for branche in branches:
+            config = obtenir_dashboard().get_advanced_config(branche)
+            axes = _axes_balayage(config, budgets, personnels, exercices)
+            taille = int(np.prod([len(axe) for axe in axes]))
+            for debut in range(0, taille, taille_lot):
+                futures.append(pool.submit(_evaluer_lot_balayage, branche, axes, debut,
+                                           min(debut + taille_lot, taille), scenario, annee_debut, annee_fin,
+                                           critere, top, bool(sortie)))
+        try:
+            for future in as_completed(futures):
+                lot, meilleurs = future.result()
+                if sortie:
+                    _ecrire_resultats(sortie, lot, etat)
+                courant = meilleurs if classement is None else pd.concat([classement, meilleurs], ignore_index=True)
+                classement = _classer(courant, critere, top)
+        finally:
+            if 'writer' in etat:
+                etat['writer'].close()
+    
+    # Regroupement par branche dans l'ordre demandé, rang conservé à l'intérieur de chaque branche
+    ordre = pd.Categorical(classement['Branche'], categories=list(dict.fromkeys(branches)), ordered=True)
+    return classement.iloc[np.argsort(ordre.codes, kind='stable')].reset_index(drop=True)
+
+
+def _plage(texte):
+    """Axe de balayage : 'debut:fin:pas' (bornes incluses) ou liste 'a,b,c'"""
+    if ':' in texte:
+        debut, fin, pas = (float(v) for v in texte.split(':'))
+        return np.arange(debut, fin + pas / 2, pas)
+    return np.array([float(v) for v in texte.split(',')])
+
+
+def commande_balayage(argv):
+    """Point d'entrée CLI : python Dashboard.py balayage [options]"""
+    parser = argparse.ArgumentParser(prog='Dashboard.py balayage',
+                                     description="Balayage de paramètres headless par branche")
+    parser.add_argument('--branches', nargs='+', help="Branches à balayer (défaut : toutes)")
+    parser.add_argument('--budget', type=_plage, help="budget_base, ex. 100:400:10")
+    parser.add_argument('--personnel', type=_plage, help="personnel_base, ex. 100:600:25")
+    parser.add_argument('--exercices', type=_plage, help="exercices_base, ex. 20:300:10")
+    parser.add_argument('--scenario', choices=list(SCENARIOS), default=None)
+    parser.add_argument('--debut', type=int, default=2000)
+    parser.add_argument('--fin', type=int, default=2027)
+    parser.add_argument('--critere', choices=list(CRITERES_BALAYAGE), default='Readiness_Operative')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--sortie', help="Fichier de résultats complet (.csv ou .parquet)")
+    parser.add_argument('--lot', type=int, default=20000, help="Combinaisons par tâche")
+    parser.add_argument('--workers', type=int, default=None, help="Process du pool (défaut : nombre de cœurs)")
+    args = parser.parse_args(argv)
+    
+    debut = time.perf_counter()
+    classement = balayer_parametres(args.branches, args.budget, args.personnel, args.exercices,
+                                    args.scenario, args.debut, args.fin, args.sortie, args.critere,
+                                    args.top, args.lot, args.workers)
+    print(classement.to_string(index=False))
+    print(f"\nBalayage terminé en {time.perf_counter() - debut:.2f} s", file=sys.stderr)
+    return 0
+
+
+# Export headless de toutes les sélections (Parquet + HTML, PNG si kaleido est installé)
+
+def _slug(texte):
+    """Nom de fichier ASCII à partir d'un libellé"""
+    texte = unicodedata.normalize('NFKD', texte).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', texte.lower()).strip('-')
+
+
+def _ecrire_figure(fig, chemin, formats, plotlyjs):
+    """Écrit une figure en HTML (et PNG si demandé) ; renvoie les fichiers produits"""
+    fichiers = []
+    if 'html' in formats:
+        fig.write_html(chemin + '.html', include_plotlyjs=plotlyjs, full_html=True)
+        fichiers.append(chemin + '.html')
+    if 'png' in formats:
+        fig.write_image(chemin + '.png')
+        fichiers.append(chemin + '.png')
+    return fichiers
+
+
+def _exporter_selection(selection, scenario, dossier, formats, plotlyjs='cdn'):
+    """Données et figures d'une sélection sous un scénario (exécuté dans un process du pool)"""
+    dashboard = obtenir_dashboard()
+    df, config = dashboard.generate_advanced_data(selection, scenario)
+    cible = os.path.join(dossier, _slug(selection), _slug(scenario))
+    os.makedirs(cible, exist_ok=True)
+    
+    fichiers = []
+    if 'parquet' in formats:
+        df.to_parquet(os.path.join(cible, 'donnees.parquet'), index=False)
+        fichiers.append(os.path.join(cible, 'donnees.parquet'))
+    if 'csv' in formats:
+        df.to_csv(os.path.join(cible, 'donnees.csv'), index=False)
+        fichiers.append(os.path.join(cible, 'donnees.csv'))
+    figures = {
+        'capacites': dashboard.build_capabilities_figure(df),
+        'alliances': dashboard.build_strategic_alliances_figure(df)
+    }
+    for nom, fig in figures.items():
+        if fig is not None:
+            fichiers.extend(_ecrire_figure(fig, os.path.join(cible, nom), formats, plotlyjs))
+    return selection, scenario, fichiers
+
+
+def _exporter_references(dossier, formats, plotlyjs='cdn'):
+    """Figures statiques de référence, communes à toutes les sélections (sources DASHBOARD_REFERENCES incluses)"""
+    initialiser_references(attendre=True)
+    dashboard = obtenir_dashboard()
+    cible = os.path.join(dossier, 'reference')
+    os.makedirs(cible, exist_ok=True)
+    fichiers = []
+    for nom in dashboard.define_reference_figures():
+        fichiers.extend(_ecrire_figure(dashboard.get_reference_figure(nom), os.path.join(cible, nom),
+                                       formats, plotlyjs))
+    return 'Référence', None, fichiers
+
+
+def exporter_tableaux(dossier='export', selections=None, scenarios=None, formats=('parquet', 'html'),
+                      plotlyjs='cdn', n_workers=None):
+    """Exporte toutes les sélections x scénarios en parallèle et écrit un index.html ; renvoie les fichiers"""
+    dashboard = obtenir_dashboard()
+    if selections is None:
+        selections = dashboard.branches_options + dashboard.programmes_options
+    if scenarios is None:
+        scenarios = [SCENARIO_DEFAUT]
+    os.makedirs(dossier, exist_ok=True)
+    
+    resultats = []
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(_exporter_references, dossier, formats, plotlyjs)]
+        futures += [pool.submit(_exporter_selection, selection, scenario, dossier, formats, plotlyjs)
+                    for selection in selections for scenario in scenarios]
+        for future in as_completed(futures):
+            resultats.append(future.result())
+    
+    # Index HTML des fichiers produits, dans l'ordre des sélections
+    ordre = {cle: i for i, cle in enumerate([('Référence', None)] + [(s, sc) for s in selections for sc in scenarios])}
+    resultats.sort(key=lambda r: ordre[(r[0], r[1])])
+    lignes = []
+    for selection, scenario, fichiers in resultats:
+        titre = selection if scenario is None else f"{selection} - {scenario}"
+        liens = ' • '.join(f'<a href="{os.path.relpath(f, dossier)}">{os.path.basename(f)}</a>' for f in fichiers)
+        lignes.append(f"<li><strong>{titre}</strong> : {liens}</li>")
+    index = os.path.join(dossier, 'index.html')
+    with open(index, 'w', encoding='utf-8') as f:
+        f.write('<html><head><meta charset="utf-8"><title>Analyse Stratégique Avancée - Export</title></head>'
+                '<body><h1>🇺🇸 ANALYSE STRATÉGIQUE AVANCÉE - EXPORT</h1><ul>\n'
+                + '\n'.join(lignes) + '\n</ul></body></html>\n')
+    return [index] + [f for _, _, fichiers in resultats for f in fichiers]
+
+
+def commande_export(argv):
+    """Point d'entrée CLI : python Dashboard.py export [options]"""
+    parser = argparse.ArgumentParser(prog='Dashboard.py export',
+                                     description="Export headless de toutes les sélections")
+    parser.add_argument('--dossier', default='export')
+    parser.add_argument('--selections', nargs='+', help="Sélections à exporter (défaut : branches et programmes)")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS),
+                        help="Scénarios à exporter (défaut : scénario de référence)")
+    parser.add_argument('--tous-scenarios', action='store_true', help="Exporter tous les scénarios")
+    parser.add_argument('--formats', nargs='+', choices=['parquet', 'csv', 'html', 'png'],
+                        default=['parquet', 'html'], help="png nécessite le paquet kaleido")
+    parser.add_argument('--plotlyjs', choices=['cdn', 'directory', 'inline'], default='cdn',
+                        help="Inclusion de plotly.js dans les HTML")
+    parser.add_argument('--workers', type=int, default=None, help="Process du pool (défaut : nombre de cœurs)")
+    args = parser.parse_args(argv)
+    
+    plotlyjs = True if args.plotlyjs == 'inline' else args.plotlyjs
+    scenarios = list(SCENARIOS) if args.tous_scenarios else args.scenarios
+    debut = time.perf_counter()
+    fichiers = exporter_tableaux(args.dossier, args.selections, scenarios, args.formats, plotlyjs, args.workers)
+    print(f"{len(fichiers)} fichiers écrits dans {args.dossier} en {time.perf_counter() - debut:.2f} s",
+          file=sys.stderr)
+    return 0
+
+
+# Instantanés Arrow mappés en mémoire, partagés par les workers d'un hôte
+
+def selections_instantane(dashboard):
+    """Toutes les sélections proposées par le sidebar"""
+    return list(dict.fromkeys(dashboard.branches_options + dashboard.programmes_options
+                              + ("Scénarios Géopolitiques",)))
+
+
+def ecrire_instantane(dossier='instantane', selections=None, scenarios=None, annee_debut=HORIZON_MIN,
+                      annee_fin=HORIZON_MAX, granularites=(1,)):
+    """Précalcule toutes les sélections x scénarios x granularités en fichiers Arrow IPC ; renvoie le manifeste
+
+    Chaque fichier est écrit sous un nom temporaire puis renommé, et le manifeste en dernier : un
+    worker qui a déjà mappé l'ancienne version continue de la lire sans incohérence.
+    """
+    pa = importlib.import_module('pyarrow')
+    ipc = importlib.import_module('pyarrow.ipc')
+    dashboard = obtenir_dashboard()
+    selections = selections_instantane(dashboard) if selections is None else list(selections)
+    scenarios = list(SCENARIOS) if scenarios is None else list(scenarios)
+    os.makedirs(dossier, exist_ok=True)
+    
+    entrees = []
+    for granularite in granularites:
+        for selection in selections:
+            for scenario in scenarios:
+                stock, _ = dashboard.generate_advanced_store(selection, scenario, annee_debut, annee_fin, granularite)
+                table = pa.Table.from_pandas(stock.to_dataframe(), preserve_index=False)
+                fichier = f"{_slug(selection)}__{_slug(scenario)}__{granularite}.arrow"
+                temporaire = os.path.join(dossier, fichier + '.tmp')
+                # Sans compression : les tampons du fichier sont directement utilisables une fois mappés
+                with pa.OSFile(temporaire, 'wb') as sortie, ipc.new_file(sortie, table.schema) as ecrivain:
+                    ecrivain.write_table(table)
+                os.replace(temporaire, os.path.join(dossier, fichier))
+                entrees.append({'selection': selection, 'scenario': scenario, 'granularite': granularite,
+                                'fichier': fichier, 'lignes': table.num_rows, 'octets': table.nbytes})
+    
+    manifeste = {
+        'version': VERSION_INSTANTANE,
+        'empreinte': empreinte_moteur(dashboard, selections),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'annee_debut': annee_debut,
+        'annee_fin': annee_fin,
+        'entrees': entrees
+    }
+    temporaire = os.path.join(dossier, 'manifeste.json.tmp')
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(manifeste, f, ensure_ascii=False, indent=1)
+    os.replace(temporaire, os.path.join(dossier, 'manifeste.json'))
+    return manifeste
+
+
+def commande_instantane(argv):
+    """Point d'entrée CLI : python Dashboard.py instantane [options]"""
+    parser = argparse.ArgumentParser(prog='Dashboard.py instantane',
+                                     description="Instantané Arrow de toutes les sélections et de tous les scénarios")
+    parser.add_argument('--dossier', default='instantane')
+    parser.add_argument('--selections', nargs='+', help="Sélections (défaut : toutes celles du sidebar)")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), help="Scénarios (défaut : tous)")
+    parser.add_argument('--debut', type=int, default=HORIZON_MIN)
+    parser.add_argument('--fin', type=int, default=HORIZON_MAX)
+    parser.add_argument('--granularites', nargs='+', choices=list(GRANULARITES), default=['Annuelle'])
+    args = parser.parse_args(argv)
+    
+    debut = time.perf_counter()
+    manifeste = ecrire_instantane(args.dossier, args.selections, args.scenarios, args.debut, args.fin,
+                                  [GRANULARITES[nom] for nom in args.granularites])
+    octets = sum(entree['octets'] for entree in manifeste['entrees'])
+    print(f"{len(manifeste['entrees'])} jeux ({octets / 1e6:.1f} Mo) écrits dans {args.dossier} "
+          f"en {time.perf_counter() - debut:.2f} s", file=sys.stderr)
+    print(f"Servir avec : DASHBOARD_INSTANTANE={args.dossier} streamlit run Dashboard.py", file=sys.stderr)
+    return 0
+
+
+
+# API de requêtes : indicateurs en colonnes sur HTTP/JSON, mêmes moteur et caches que l'interface
+
+# Réponses sérialisées (ETag, corps JSON, corps gzip), partagées par toutes les connexions
+CACHE_REPONSES = CacheLRU(taille_max=256, ttl=None)
+METRIQUES.caches['reponses'] = CACHE_REPONSES
+
+# Taille à partir de laquelle une réponse est aussi conservée compressée (gzip)
+SEUIL_GZIP = 1024
+
+
+def colonne_json(valeurs, decimales=4):
+    """Colonne sérialisable : nombres arrondis (NaN -> null), autres types tels quels"""
+    valeurs = np.asarray(valeurs)
+    if valeurs.dtype.kind in 'iub':
+        return valeurs.tolist()
+    if valeurs.dtype.kind != 'f':
+        return [None if pd.isna(v) else v for v in valeurs.tolist()]
+    valeurs = np.round(valeurs.astype(np.float64), decimales)
+    liste = valeurs.tolist()
+    if not np.isfinite(valeurs).all():
+        liste = [v if np.isfinite(v) else None for v in liste]
+    return liste
+
+
+class ParametreInvalide(ValueError):
+    """Paramètre de requête absent du domaine attendu (réponse 400)"""
+
+
+class RessourceIntrouvable(LookupError):
+    """Route ou table de référence inexistante (réponse 404)"""
+
+
+class RequetesDashboard:
+    """Couche de requêtes programmatique : indicateurs, tables de référence et agrégats pays en colonnes
+
+    Les calculs passent par get_cached_data, get_country_panel et get_country_index : l'API et
+    l'interface partagent les mêmes caches process. Chaque réponse JSON est mise en cache avec son ETag ;
+    un client qui renvoie If-None-Match reçoit 304 sans corps. Seules ParametreInvalide (400) et
+    RessourceIntrouvable (404) décrivent une erreur du client ; toute autre exception donne 500.
+
+    Routes (GET) :
+      /meta                                      sélections, scénarios, granularités, indicateurs, tables
+      /indicateurs?selection=&scenario=&debut=&fin=&granularite=&indicateurs=a,b&decimales=
+      /reference/<table>                         ex. /reference/matrice_menaces
+      /pays?scenario=&debut=&fin=&indicateurs=&pays=
+      /agregats?scenario=&debut=&fin=&indicateur=&annee=&top=
+    """
+
+    def __init__(self, dashboard=None):
+        self.dashboard = dashboard or obtenir_dashboard()
+        self.routes = {
+            '/meta': self.meta,
+            '/indicateurs': self.indicateurs,
+            '/pays': self.pays,
+            '/agregats': self.agregats,
+        }
+        self._serveur = None
+        self._verrou = threading.Lock()
+
+    # Lecture des paramètres ; toute valeur invalide lève ParametreInvalide (réponse 400)
+
+    def _parametre(self, parametres, nom, defaut=None, type_=str):
+        valeurs = parametres.get(nom)
+        if not valeurs:
+            return defaut
+        try:
+            return type_(valeurs[-1])
+        except ValueError:
+            raise ParametreInvalide(f"Paramètre '{nom}' invalide : {valeurs[-1]!r}") from None
+
+    def _liste(self, parametres, nom, valides, defaut):
+        noms = [n.strip() for valeur in parametres.get(nom, []) for n in valeur.split(',') if n.strip()]
+        inconnus = [n for n in noms if n not in valides]
+        if inconnus:
+            raise ParametreInvalide(f"'{nom}' inconnus : {', '.join(inconnus)} ; valeurs possibles : {', '.join(valides)}")
+        return noms or list(defaut)
+
+    def _choix(self, parametres, nom, valides, defaut):
+        valeur = self._parametre(parametres, nom, defaut)
+        if valeur not in valides:
+            raise ParametreInvalide(f"'{nom}' inconnu : {valeur!r} ; valeurs possibles : {', '.join(map(str, valides))}")
+        return valeur
+
+    def _fenetre(self, parametres):
+        debut = self._parametre(parametres, 'debut', 2000, int)
+        fin = self._parametre(parametres, 'fin', 2027, int)
+        if not HORIZON_MIN <= debut <= fin <= HORIZON_MAX:
+            raise ParametreInvalide(f"Fenêtre invalide : {debut}-{fin} (horizon {HORIZON_MIN}-{HORIZON_MAX})")
+        return debut, fin
+
+    def _granularite(self, parametres):
+        valeur = self._parametre(parametres, 'granularite', '1')
+        if valeur in GRANULARITES:
+            return GRANULARITES[valeur]
+        if valeur.isdigit() and int(valeur) in GRANULARITES.values():
+            return int(valeur)
+        raise ParametreInvalide(f"Granularité inconnue : {valeur!r} ; valeurs possibles : "
+                         f"{', '.join(f'{nom} ({n})' for nom, n in GRANULARITES.items())}")
+
+    # Requêtes
+
+    def meta(self, parametres):
+        return {
+            'selections': selections_instantane(self.dashboard),
+            'scenarios': list(SCENARIOS),
+            'granularites': GRANULARITES,
+            'horizon': [HORIZON_MIN, HORIZON_MAX],
+            'indicateurs_pays': INDICATEURS_PAYS,
+            'groupes_pays': list(self.dashboard.define_country_groups(
+                pd.DataFrame(DONNEES_REFERENCE['pays']))),
+            'references': sorted(DONNEES_REFERENCE),
+        }
+
+    def indicateurs(self, parametres):
+        """Séries simulées d'une sélection, une colonne par indicateur"""
+        selections = selections_instantane(self.dashboard)
+        selection = self._choix(parametres, 'selection', selections, selections[0])
+        scenario = self._choix(parametres, 'scenario', list(SCENARIOS), list(SCENARIOS)[0])
+        debut, fin = self._fenetre(parametres)
+        granularite = self._granularite(parametres)
+        decimales = self._parametre(parametres, 'decimales', 4, int)
+        
+        PRECHAUFFAGE.enregistrer_acces((selection, scenario, debut, fin, granularite))
+        df, _ = self.dashboard.get_cached_data(selection, scenario, debut, fin, granularite)
+        disponibles = [colonne for colonne in df.columns if colonne != 'Annee']
+        noms = self._liste(parametres, 'indicateurs', disponibles, disponibles)
+        colonnes = {'Annee': colonne_json(df['Annee'], 6)}
+        colonnes.update({nom: colonne_json(df[nom], decimales) for nom in noms})
+        return {'selection': selection, 'scenario': scenario, 'debut': debut, 'fin': fin,
+                'granularite': granularite, 'lignes': len(df), 'colonnes': colonnes}
+
+    def reference(self, nom, parametres):
+        """Table de référence (intégrée ou chargée depuis DASHBOARD_REFERENCES), en colonnes"""
+        if nom not in DONNEES_REFERENCE:
+            raise RessourceIntrouvable(f"Table de référence inconnue : {nom!r}")
+        if CHARGEUR_REFERENCE.en_attente([nom]):
+            raise RessourceIntrouvable(f"Table de référence en cours de chargement : {nom!r}")
+        table = pd.DataFrame(DONNEES_REFERENCE[nom])
+        return {'table': nom, 'version': VERSIONS_REFERENCE.get(nom, 0), 'lignes': len(table),
+                'colonnes': {str(colonne): colonne_json(table[colonne]) for colonne in table.columns}}
+
+    def pays(self, parametres):
+        """Panel multi-pays : une matrice (pays x années) par indicateur"""
+        scenario = self._choix(parametres, 'scenario', list(SCENARIOS), list(SCENARIOS)[0])
+        debut, fin = self._fenetre(parametres)
+        panel = self.dashboard.get_country_panel(scenario, debut, fin)
+        tous = panel['pays']['Pays'].tolist()
+        noms = self._liste(parametres, 'indicateurs', panel['indicateurs'], panel['indicateurs'])
+        pays = self._liste(parametres, 'pays', tous, tous)
+        lignes = [tous.index(p) for p in pays]
+        return {'scenario': scenario, 'debut': debut, 'fin': fin, 'pays': pays,
+                'annees': panel['annees'].tolist(),
+                'indicateurs': {nom: [colonne_json(ligne) for ligne in
+                                      panel['valeurs'][lignes, :, panel['indicateurs'].index(nom)]]
+                                for nom in noms}}
+
+    def agregats(self, parametres):
+        """Totaux et moyennes par groupe, top-N et part des N premiers pour une année (index précalculé)"""
+        scenario = self._choix(parametres, 'scenario', list(SCENARIOS), list(SCENARIOS)[0])
+        debut, fin = self._fenetre(parametres)
+        indicateur = self._choix(parametres, 'indicateur', list(INDICATEURS_PAYS), list(INDICATEURS_PAYS)[0])
+        annee = self._parametre(parametres, 'annee', fin, int)
+        if not debut <= annee <= fin:
+            raise ParametreInvalide(f"Année {annee} hors de la fenêtre {debut}-{fin}")
+        n = self._parametre(parametres, 'top', 5, int)
+        
+        index = self.dashboard.get_country_index(scenario, debut, fin)
+        entites, valeurs = index.top(max(n, 1), indicateur, annee)
+        return {'scenario': scenario, 'indicateur': indicateur, 'annee': annee,
+                'agregation': INDICATEURS_PAYS[indicateur],
+                'groupes': {groupe: {'total': round(float(index.total(groupe, indicateur, annee)), 4),
+                                     'moyenne': round(float(index.moyenne(groupe, indicateur, annee)), 4),
+                                     'effectif': int(index.effectifs[index.index_groupe[groupe]])}
+                            for groupe in index.groupes},
+                'top': {'pays': entites, 'valeurs': colonne_json(valeurs)},
+                'part_top': round(float(index.part_cumulee(max(n, 1), indicateur, annee)), 6)}
+
+    def executer(self, route, parametres):
+        """Objet JSON d'une requête ; RessourceIntrouvable si la route ou la table n'existe pas"""
+        if route.startswith('/reference/'):
+            return self.reference(route[len('/reference/'):], parametres)
+        if route not in self.routes:
+            raise RessourceIntrouvable(f"Route inconnue : {route} ; routes : {', '.join(self.routes)}, /reference/<table>")
+        return self.routes[route](parametres)
+
+    # HTTP
+
+    def repondre(self, chemin, entetes=None):
+        """(statut, en-têtes, corps) d'une requête GET, servie depuis CACHE_REPONSES si possible"""
+        entetes = entetes or {}
+        url = urllib.parse.urlsplit(chemin)
+        route = urllib.parse.unquote(url.path).rstrip('/') or '/'
+        parametres = urllib.parse.parse_qs(url.query)
+        # Les versions des tables de référence invalident les réponses qui en dépendent
+        cle = (route, tuple(sorted((nom, tuple(valeurs)) for nom, valeurs in parametres.items())),
+               tuple(sorted(VERSIONS_REFERENCE.items())))
+        
+        def calculer():
+            corps = json.dumps(self.executer(route, parametres), ensure_ascii=False,
+                               separators=(',', ':')).encode()
+            etag = '"' + hashlib.blake2b(corps, digest_size=16).hexdigest() + '"'
+            return etag, corps, gzip.compress(corps, 6) if len(corps) >= SEUIL_GZIP else None
+        
+        with METRIQUES.mesurer(f"api:{route.split('/')[1] if route != '/' else route}"):
+            try:
+                etag, corps, corps_gzip = CACHE_REPONSES.get_or_compute(cle, calculer)
+            except RessourceIntrouvable as erreur:
+                return self._erreur(404, erreur)
+            except ParametreInvalide as erreur:
+                return self._erreur(400, erreur)
+            except Exception as erreur:
+                # Défaut interne (colonne absente, calcul en échec...) : détaillé sur stderr, pas au client
+                traceback.print_exc(file=sys.stderr)
+                return self._erreur(500, RuntimeError(f"Erreur interne ({type(erreur).__name__})"))
+        
+        reponse = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        attendus = [valeur.strip() for valeur in entetes.get('If-None-Match', '').split(',')]
+        if etag in attendus or '*' in attendus:
+            return 304, reponse, b''
+        reponse['Content-Type'] = 'application/json; charset=utf-8'
+        if corps_gzip is not None and 'gzip' in entetes.get('Accept-Encoding', ''):
+            reponse['Content-Encoding'] = 'gzip'
+            corps = corps_gzip
+        return 200, reponse, corps
+
+    def _erreur(self, statut, erreur):
+        message = erreur.args[0] if erreur.args else str(erreur)
+        corps = json.dumps({'erreur': message}, ensure_ascii=False).encode()
+        return statut, {'Content-Type': 'application/json; charset=utf-8', 'Cache-Control': 'no-store'}, corps
+
+    def demarrer_serveur(self, port, hote='127.0.0.1'):
+        """Sert l'API sur un thread dédié (une seule fois par process), un thread par connexion"""
+        with self._verrou:
+            if self._serveur is not None:
+                return self._serveur
+            api = self
+
+            class GestionnaireAPI(BaseHTTPRequestHandler):
+                protocol_version = 'HTTP/1.1'  # connexions persistantes
+
+                def do_GET(self, corps_inclus=True):
+                    statut, entetes, corps = api.repondre(self.path, self.headers)
+                    self.send_response(statut)
+                    for nom, valeur in entetes.items():
+                        self.send_header(nom, valeur)
+                    self.send_header('Content-Length', str(len(corps)))
+                    self.end_headers()
+                    if corps_inclus:
+                        self.wfile.write(corps)
+
+                def do_HEAD(self):
+                    self.do_GET(corps_inclus=False)
+
+                def log_message(self, *args):
+                    pass
+
+            self._serveur = ThreadingHTTPServer((hote, port), GestionnaireAPI)
+            threading.Thread(target=self._serveur.serve_forever, daemon=True).start()
+            return self._serveur
+
+
+# Couche de requêtes du process (DASHBOARD_API_PORT ou commande api), créée au premier démarrage
+API_REQUETES = None
+_VERROU_API = threading.Lock()
+
+
+def demarrer_api(port, hote='127.0.0.1'):
+    """Démarre (une seule fois par process) l'API HTTP/JSON partageant les caches du dashboard"""
+    global API_REQUETES
+    with _VERROU_API:
+        if API_REQUETES is None:
+            API_REQUETES = RequetesDashboard()
+    return API_REQUETES.demarrer_serveur(port, hote)
+
+
+def commande_api(argv):
+    """Point d'entrée CLI : python Dashboard.py api [options]"""
+    parser = argparse.ArgumentParser(prog='Dashboard.py api',
+                                     description="API HTTP/JSON locale des indicateurs simulés et des tables de référence")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--hote', default='127.0.0.1')
+    parser.add_argument('--references', help="Dossier de sources de référence (comme DASHBOARD_REFERENCES)")
+    parser.add_argument('--instantane', help="Dossier d'instantané Arrow (comme DASHBOARD_INSTANTANE)")
+    args = parser.parse_args(argv)
+    
+    if args.references:
+        os.environ['DASHBOARD_REFERENCES'] = args.references
+    initialiser_references()
+    ouvrir_instantane(args.instantane)
+    demarrer_prechauffage()
+    serveur = demarrer_api(args.port, args.hote)
+    print(f"API servie sur http://{args.hote}:{serveur.server_address[1]}/meta", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        serveur.shutdown()
+    return 0
+
+
+# Benchmarks des chemins critiques (simulation, DataFrame, construction des figures)
+
+class _StreamlitMuet:
+    """Remplace streamlit pendant les mesures : tout appel est accepté et ignoré"""
+
+    def __getattr__(self, nom):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def columns(self, spec, *args, **kwargs):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def tabs(self, titres, *args, **kwargs):
+        return [self] * len(titres)
+
+
+@contextmanager
+def _streamlit_muet():
+    """Substitue le module streamlit global le temps d'un bloc"""
+    global st
+    original, st = st, _StreamlitMuet()
+    try:
+        yield
+    finally:
+        st = original
+
+
+def _mesurer(fonction, repetitions=5, memoire=True, preparation=None):
+    """Temps (min, médiane) sur plusieurs répétitions et pic mémoire (tracemalloc) d'un appel"""
+    durees = []
+    for _ in range(repetitions):
+        if preparation:
+            preparation()
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    mesure = {'min_s': min(durees), 'median_s': float(np.median(durees)), 'repetitions': repetitions}
+    if memoire:
+        if preparation:
+            preparation()
+        tracemalloc.start()
+        try:
+            fonction()
+            mesure['pic_memoire_ko'] = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return mesure
+
+
+def executer_benchmarks(tailles=(28, 280, 2800, 28000), repetitions=5, memoire=True):
+    """Mesure la génération par sélection, chaque simulate_* par taille de plage et chaque section"""
+    dashboard = obtenir_dashboard()
+    mesures = {}
+    
+    # generate_advanced_data par sélection, hors cache
+    for selection in dashboard.branches_options + dashboard.programmes_options:
+        mesures[f"generate_advanced_data[{selection}]"] = _mesurer(
+            lambda: dashboard.generate_advanced_data(selection), repetitions, memoire)
+    
+    # simulate_* sur des plages d'années croissantes
+    config = dashboard.get_advanced_config("États-Unis - Vue d'Ensemble")
+    simulations = sorted(nom for nom in dir(dashboard) if nom.startswith('simulate_'))
+    for taille in tailles:
+        annees = np.arange(ANNEE_ORIGINE, ANNEE_ORIGINE + taille)
+        for nom in simulations:
+            methode = getattr(dashboard, nom)
+            args = (annees, config) if 'config' in inspect.signature(methode).parameters else (annees,)
+            mesures[f"{nom}[{taille}]"] = _mesurer(lambda: methode(*args), repetitions, memoire)
+        mesures[f"MoteurSimulation.evaluer[{taille}]"] = _mesurer(
+            lambda: dashboard.moteur.evaluer(annees, config), repetitions, memoire)
+        mesures[f"generate_country_panel[{taille}]"] = _mesurer(
+            lambda: dashboard.generate_country_panel(annee_debut=ANNEE_ORIGINE, annee_fin=ANNEE_ORIGINE + taille - 1),
+            repetitions, memoire)
+    
+    # Sections create_*/display_* avec streamlit neutralisé, caches froids puis chauds
+    df, config = dashboard.generate_advanced_data("États-Unis - Vue d'Ensemble")
+    df_quotidien, _ = dashboard.generate_advanced_data("États-Unis - Vue d'Ensemble", granularite=365)
+    controls = {'selection': "États-Unis - Vue d'Ensemble", 'scenario': SCENARIO_DEFAUT,
+                'annee_debut': 2000, 'annee_fin': 2027, 'granularite': 1, **EtatSession.DEFAUTS}
+    sections = {
+        'display_strategic_metrics': lambda: dashboard.display_strategic_metrics(df, config),
+        'create_comprehensive_analysis': lambda: dashboard.create_comprehensive_analysis(df, config),
+        'create_comprehensive_analysis[quotidien]': lambda: dashboard.create_comprehensive_analysis(
+            df_quotidien, config),
+        'compacter_figure[quotidien]': lambda: compacter_figure(dashboard.build_capabilities_figure(df_quotidien)),
+        'create_scenario_comparison': lambda: dashboard.create_scenario_comparison(controls),
+        'create_technical_analysis': lambda: dashboard.create_technical_analysis(df, config),
+        'create_geopolitical_analysis': lambda: dashboard.create_geopolitical_analysis(df, config),
+        'create_branch_analysis': lambda: dashboard.create_branch_analysis(df, config),
+        'create_threat_assessment': lambda: dashboard.create_threat_assessment(df, config),
+        'create_alliance_analysis': lambda: dashboard.create_alliance_analysis(config),
+        'create_alliance_database': lambda: dashboard.create_alliance_database(),
+        'create_strategic_synthesis': lambda: dashboard.create_strategic_synthesis(df, config, controls),
+    }
+    
+    def vider_caches():
+        CACHE_FIGURES.invalider()
+        CACHE_DONNEES.invalider()
+    
+    with _streamlit_muet():
+        for nom, rendu in sections.items():
+            mesures[f"{nom}[froid]"] = _mesurer(rendu, repetitions, memoire, preparation=vider_caches)
+            mesures[f"{nom}[chaud]"] = _mesurer(rendu, repetitions, memoire)
+    
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'tailles': list(tailles),
+            'repetitions': repetitions
+        },
+        'mesures': mesures
+    }
+
+
+def comparer_benchmarks(resultats, reference, seuil=1.25, plancher_s=0.0005):
+    """Régressions : médiane au-delà de seuil x la référence et d'au moins plancher_s en absolu"""
+    regressions = []
+    for nom, mesure in resultats['mesures'].items():
+        ancienne = reference['mesures'].get(nom)
+        if ancienne is None:
+            continue
+        ratio = mesure['median_s'] / ancienne['median_s'] if ancienne['median_s'] > 0 else float('inf')
+        if ratio > seuil and mesure['median_s'] - ancienne['median_s'] > plancher_s:
+            regressions.append({'mesure': nom, 'reference_s': ancienne['median_s'],
+                                'actuel_s': mesure['median_s'], 'ratio': ratio})
+    return regressions
+
+
+def commande_benchmark(argv):
+    """Point d'entrée CLI : python Dashboard.py benchmark [options]"""
+    parser = argparse.ArgumentParser(prog='Dashboard.py benchmark',
+                                     description="Benchmarks des chemins critiques du dashboard")
+    parser.add_argument('--sortie', default='benchmark.json', help="Résultats JSON")
+    parser.add_argument('--reference', help="Résultats de référence JSON pour la détection de régressions")
+    parser.add_argument('--seuil', type=float, default=1.25, help="Ratio médiane actuelle / référence toléré")
+    parser.add_argument('--plancher', type=float, default=0.0005, help="Écart absolu minimal (s) d'une régression")
+    parser.add_argument('--tailles', type=int, nargs='+', default=[28, 280, 2800, 28000],
+                        help="Tailles de plage d'années des simulate_*")
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--sans-memoire', action='store_true', help="Ne pas mesurer le pic mémoire")
+    args = parser.parse_args(argv)
+    
+    resultats = executer_benchmarks(args.tailles, args.repetitions, not args.sans_memoire)
+    with open(args.sortie, 'w', encoding='utf-8') as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"{len(resultats['mesures'])} mesures écrites dans {args.sortie}", file=sys.stderr)
+    
+    if args.reference:
+        with open(args.reference, encoding='utf-8') as f:
+            reference = json.load(f)
+        regressions = comparer_benchmarks(resultats, reference, args.seuil, args.plancher)
+        for r in regressions:
+            print(f"RÉGRESSION {r['mesure']}: {r['reference_s'] * 1e3:.2f} ms -> "
+                  f"{r['actuel_s'] * 1e3:.2f} ms (x{r['ratio']:.2f})", file=sys.stderr)
+        if regressions:
+            return 1
+        print("Aucune régression par rapport à la référence", file=sys.stderr)
+    return 0
+
+
+
+# Profil du temps d'import (démarrage à froid)
+
+def _temps_import(code):
+    """Lignes `-X importtime` d'un interpréteur neuf : liste (module, propre_ms, cumulé_ms)"""
+    sortie = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, check=True).stderr
+    lignes = []
+    for ligne in sortie.splitlines():
+        if not ligne.startswith('import time:') or 'self [us]' in ligne:
+            continue
+        propre, cumule, module = ligne[len('import time:'):].split('|')
+        lignes.append((module.strip(), int(propre) / 1e3, int(cumule) / 1e3))
+    return lignes
+
+
+def profiler_import(top=15):
+    """Coût d'import du module, modules les plus lourds et coût différé de chaque module paresseux"""
+    dossier = os.path.dirname(os.path.abspath(__file__))
+    lignes = _temps_import(f"import sys; sys.path.insert(0, {dossier!r}); import Dashboard")
+    total = next(cumule for module, _, cumule in reversed(lignes) if module == 'Dashboard')
+    plus_lourds = sorted((l for l in lignes if l[0] != 'Dashboard' and '.' not in l[0]),
+                         key=lambda l: l[2], reverse=True)[:top]
+    differes = {}
+    for module in MODULES_DIFFERES:
+        sous_lignes = _temps_import(f"import pandas, numpy; import {module}")
+        differes[module] = next(cumule for nom, _, cumule in reversed(sous_lignes) if nom == module)
+    return {
+        'import_dashboard_ms': total,
+        'modules_plus_lourds': [{'module': m, 'propre_ms': p, 'cumule_ms': c} for m, p, c in plus_lourds],
+        'modules_differes_ms': differes
+    }
+
+
+def commande_profil_import(argv):
+    """Point d'entrée CLI : python Dashboard.py profil-import [--json]"""
+    parser = argparse.ArgumentParser(prog='Dashboard.py profil-import',
+                                     description="Rapport du temps d'import au démarrage à froid")
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--json', action='store_true', help="Rapport JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+    
+    rapport = profiler_import(args.top)
+    if args.json:
+        print(json.dumps(rapport, indent=2, ensure_ascii=False))
+        return 0
+    print(f"Import de Dashboard : {rapport['import_dashboard_ms']:.1f} ms\n")
+    print("Modules importés au démarrage (cumulé) :")
+    for ligne in rapport['modules_plus_lourds']:
+        print(f"  {ligne['module']:<30} {ligne['cumule_ms']:>9.1f} ms")
+    print("\nModules différés (payés au premier rendu qui les utilise) :")
+    for module, duree in rapport['modules_differes_ms'].items():
+        print(f"  {module:<30} {duree:>9.1f} ms")
+    return 0
+
+
+# Sous-commandes headless disponibles via `python Dashboard.py <commande>`
+COMMANDES_CLI = {
+    'balayage': commande_balayage,
+    'export': commande_export,
+    'instantane': commande_instantane,
+    'api': commande_api,
+    'benchmark': commande_benchmark,
+    'profil-import': commande_profil_import,
+}
+
+def lancer_dashboard():
+    """Rendu Streamlit ; /metrics et l'API démarrent si DASHBOARD_METRICS_PORT / DASHBOARD_API_PORT sont définis"""
+    configure_page()
+    port = os.environ.get('DASHBOARD_METRICS_PORT')
+    if port:
+        METRIQUES.demarrer_serveur(int(port))
+    port = os.environ.get('DASHBOARD_API_PORT')
+    if port:
+        demarrer_api(int(port))
+    initialiser_references()
+    ouvrir_instantane()
+    demarrer_prechauffage()
+    dashboard = obtenir_dashboard()
+    dashboard.run_advanced_dashboard()
+
+
 # Lancement du dashboard avancé
 if __name__ == "__main__":
-    dashboard = DefenseUSADashboardAvance()
-    dashboard.run_advanced_dashboard()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDES_CLI:
+        sys.exit(COMMANDES_CLI[sys.argv[1]](sys.argv[2:]))
+    # Streamlit ré-exécute ce script dans un nouveau module à chaque rerun : le rendu passe par
+    # le module importé (chargé une fois par process) pour que caches et métriques soient partagés
+    importlib.import_module(os.path.splitext(os.path.basename(__file__))[0]).lancer_dashboard()
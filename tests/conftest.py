@@ -0,0 +1,9 @@
+import os
+import sys
+import warnings
+
+# Dashboard.py est un module à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Hors `streamlit run`, Streamlit signale l'absence de contexte de script à l'import
+warnings.filterwarnings('ignore', message='.*ScriptRunContext.*')
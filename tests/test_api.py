@@ -0,0 +1,89 @@
+"""API de requêtes : statuts 200/304/400/404/500, ETag et gzip"""
+import gzip
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+import Dashboard as D
+
+
+@pytest.fixture(scope='module')
+def api():
+    return D.RequetesDashboard()
+
+
+def test_indicateurs(api):
+    selection = urllib.parse.quote("États-Unis - Vue d'Ensemble")
+    statut, _, corps = api.repondre(f'/indicateurs?selection={selection}&debut=2010&fin=2020'
+                                    '&indicateurs=Budget_Defense_Mds,Porte_Avions')
+    assert statut == 200
+    donnees = json.loads(corps)
+    assert donnees['lignes'] == 11
+    assert list(donnees['colonnes']) == ['Annee', 'Budget_Defense_Mds', 'Porte_Avions']
+    assert donnees['colonnes']['Annee'][0] == 2010
+
+
+def test_etag_et_304(api):
+    statut, entetes, corps = api.repondre('/reference/matrice_menaces')
+    assert statut == 200 and entetes['ETag']
+    statut, _, corps = api.repondre('/reference/matrice_menaces', {'If-None-Match': entetes['ETag']})
+    assert statut == 304 and corps == b''
+    assert api.repondre('/reference/matrice_menaces', {'If-None-Match': '"autre"'})[0] == 200
+
+
+def test_gzip(api):
+    _, simple, corps = api.repondre('/pays')
+    _, compresse, corps_gzip = api.repondre('/pays', {'Accept-Encoding': 'gzip, deflate'})
+    assert 'Content-Encoding' not in simple
+    assert compresse['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(corps_gzip) == corps
+    assert compresse['ETag'] == simple['ETag']
+
+
+@pytest.mark.parametrize('chemin', ['/indicateurs?indicateurs=Inconnu', '/indicateurs?debut=abc',
+                                    '/indicateurs?debut=2030&fin=2020', '/agregats?annee=1999',
+                                    '/pays?scenario=Aucun', '/indicateurs?granularite=7'])
+def test_parametre_invalide_400(api, chemin):
+    statut, entetes, corps = api.repondre(chemin)
+    assert statut == 400
+    assert entetes['Cache-Control'] == 'no-store'
+    assert json.loads(corps)['erreur']
+
+
+@pytest.mark.parametrize('chemin', ['/inexistante', '/reference/inexistante'])
+def test_ressource_inconnue_404(api, chemin):
+    assert api.repondre(chemin)[0] == 404
+
+
+def test_erreur_interne_500(api, monkeypatch, capsys):
+    # Une KeyError interne n'est pas une ressource introuvable
+    def defaillante(parametres):
+        raise KeyError('colonne absente')
+    monkeypatch.setitem(api.routes, '/meta', defaillante)
+    statut, _, corps = api.repondre('/meta?defaillante=1')
+    assert statut == 500
+    assert 'colonne absente' not in json.loads(corps)['erreur']
+    assert 'KeyError' in capsys.readouterr().err
+
+
+def test_serveur_http(api):
+    serveur = D.RequetesDashboard(api.dashboard).demarrer_serveur(0)
+    try:
+        url = f"http://127.0.0.1:{serveur.server_address[1]}"
+        with urllib.request.urlopen(url + '/meta') as reponse:
+            assert reponse.status == 200
+            etag = reponse.headers['ETag']
+            assert 'scenarios' in json.loads(reponse.read())
+        requete = urllib.request.Request(url + '/meta', headers={'If-None-Match': etag})
+        with pytest.raises(urllib.error.HTTPError) as erreur:
+            urllib.request.urlopen(requete)
+        assert erreur.value.code == 304
+        with pytest.raises(urllib.error.HTTPError) as erreur:
+            urllib.request.urlopen(url + '/inexistante')
+        assert erreur.value.code == 404
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
@@ -0,0 +1,134 @@
+"""Table d'événements : application à tous les indicateurs, règles de cumul et validation au chargement"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import Dashboard as D
+
+ANNEES = np.arange(2000, 2031)
+
+
+def evenement(indicateur, debut, fin, effet, valeur, cumul='cumul', groupe='test', expose=0, nom='test'):
+    return {'Événement': nom, 'Indicateur': indicateur, 'Début': debut, 'Fin': fin, 'Effet': effet,
+            'Valeur': valeur, 'Cumul': cumul, 'Groupe': groupe, 'Exposé': expose}
+
+
+def table(*lignes, defaut=True):
+    base = pd.DataFrame(D.EVENEMENTS_DEFAUT) if defaut else pd.DataFrame(columns=list(D.EVENEMENTS_DEFAUT))
+    return pd.concat([base, pd.DataFrame(list(lignes))], ignore_index=True)
+
+
+@pytest.fixture
+def evenements_restaures():
+    """Remet la table intégrée en place après le test"""
+    origine = D.DONNEES_REFERENCE['evenements']
+    yield
+    D.mettre_a_jour_reference('evenements', origine)
+
+
+@pytest.fixture(scope='module')
+def config():
+    return D.obtenir_dashboard().get_advanced_config("États-Unis - Vue d'Ensemble")
+
+
+def test_evenement_sur_chaque_indicateur(config):
+    reference = D.MoteurSimulation().evaluer(ANNEES, config)
+    for nom in D.MoteurSimulation.indicateurs(config):
+        moteur = D.MoteurSimulation(evenements=table(evenement(nom, 2010, 2015, 'additif', -1.5)))
+        obtenues = moteur.evaluer(ANNEES, config)
+        attendu = reference[nom] - 1.5 * ((ANNEES >= 2010) & (ANNEES <= 2015))
+        np.testing.assert_allclose(obtenues[nom], attendu, rtol=1e-12, err_msg=nom)
+
+
+def test_table_du_process_rechargee(config, evenements_restaures):
+    moteur = D.MoteurSimulation()
+    avant = moteur.evaluer(ANNEES, config)
+    D.mettre_a_jour_reference('evenements', table(
+        evenement('Personnel_Milliers', 2010, np.inf, 'multiplicatif', 2.0),
+        evenement('Cyber_Capabilities', 2015, 2020, 'additif', -20)))
+    apres = moteur.evaluer(ANNEES, config)
+    np.testing.assert_allclose(apres['Personnel_Milliers'], avant['Personnel_Milliers'] * np.where(ANNEES >= 2010, 2, 1))
+    np.testing.assert_allclose(apres['Cyber_Capabilities'] - avant['Cyber_Capabilities'],
+                               np.where((ANNEES >= 2015) & (ANNEES <= 2020), -20, 0))
+    # Chemins par lot, Monte Carlo et séries unitaires du dashboard
+    lot = moteur.evaluer_lot(ANNEES, [config], [D.SCENARIO_DEFAUT], ['Cyber_Capabilities', 'Personnel_Milliers'])
+    np.testing.assert_allclose(lot[0, 0, 0], apres['Cyber_Capabilities'], rtol=1e-6)
+    np.testing.assert_allclose(lot[0, 0, 1], apres['Personnel_Milliers'], rtol=1e-6)
+    bandes = moteur.monte_carlo(ANNEES, config, ['Cyber_Capabilities'], n_runs=200)
+    assert bandes['Cyber_Capabilities'][1][16] < bandes['Cyber_Capabilities'][1][14]
+    np.testing.assert_allclose(D.obtenir_dashboard().simulate_cyber_capabilities(ANNEES), apres['Cyber_Capabilities'])
+
+
+def test_exposition(config):
+    moteur = D.MoteurSimulation(evenements=table(evenement('Budget_Defense_Mds', 2010, np.inf, 'multiplicatif', 1.5,
+                                                           expose=1), defaut=False))
+    annees = np.arange(2009, 2012)
+    for exposition in (0.0, 0.5, 1.0):
+        p = moteur.parametres(dict(config, exposition_regimes=exposition))
+        sans = D.MoteurSimulation(evenements=table(defaut=False)).budget(annees, p)
+        np.testing.assert_allclose(moteur.budget(annees, p), sans * np.array([1, 1.5 ** exposition, 1.5 ** exposition]))
+
+
+def test_plafond_du_scenario_apres_les_evenements(config):
+    moteur = D.MoteurSimulation(evenements=table(evenement('Readiness_Operative', 2000, np.inf, 'additif', 50)))
+    assert moteur.evaluer(ANNEES, config)['Readiness_Operative'].max() == D.SCENARIOS[D.SCENARIO_DEFAUT]['plafond_readiness']
+
+
+def test_exclusif_resolu_avant_l_effet():
+    # Groupe exclusif mêlant un facteur et un terme : seul le premier événement couvrant l'année s'applique
+    evenements = D.TableEvenements(table(
+        evenement('Personnel_Milliers', 2005, 2010, 'multiplicatif', 2.0, cumul='exclusif', groupe='g'),
+        evenement('Personnel_Milliers', 2008, np.inf, 'additif', 100, cumul='exclusif', groupe='g'),
+        defaut=False))
+    annees = np.array([2004, 2005, 2008, 2010, 2011, 2030])
+    np.testing.assert_allclose(evenements.appliquer('Personnel_Milliers', np.full(6, 10.0), annees),
+                               [10, 20, 20, 20, 110, 110])
+
+
+def test_max_garde_l_effet_le_plus_fort():
+    evenements = D.TableEvenements(table(
+        evenement('Capacite_Navale', 2000, 2010, 'additif', 2, cumul='max', groupe='g'),
+        evenement('Capacite_Navale', 2005, 2015, 'additif', 5, cumul='max', groupe='g'),
+        evenement('Capacite_Navale', 2000, 2020, 'additif', 1),
+        defaut=False))
+    annees = np.array([2001, 2006, 2012, 2018, 2021])
+    np.testing.assert_allclose(evenements.appliquer('Capacite_Navale', np.zeros(5), annees), [3, 6, 6, 1, 0])
+
+
+@pytest.mark.parametrize('ligne, message', [
+    (evenement('Inconnu', 2010, 2012, 'additif', 1), 'Indicateur'),
+    (evenement('Personnel_Milliers', 2010, 2012, 'multiplicative', 1), 'Effet'),
+    (evenement('Personnel_Milliers', 2010, 2012, 'additif', 1, cumul='premier'), 'Cumul'),
+    (evenement('Budget_Defense_Mds', 2010, 2012, 'multiplicatif', 1.1, groupe='regimes_budget'), 'cumul'),
+])
+def test_table_invalide_refusee(ligne, message, evenements_restaures):
+    origine = D.DONNEES_REFERENCE['evenements']
+    version = D.VERSIONS_REFERENCE.get('evenements', 0)
+    with pytest.raises(ValueError, match=message):
+        D.mettre_a_jour_reference('evenements', table(ligne))
+    assert D.DONNEES_REFERENCE['evenements'] is origine
+    assert D.VERSIONS_REFERENCE.get('evenements', 0) == version
+
+
+def test_fichier_invalide_garde_la_table_integree(tmp_path, config, evenements_restaures):
+    table(evenement('Personnel_Milliers', 2010, 2012, 'multiplicative', 2)).to_csv(
+        tmp_path / 'evenements.csv', index=False)
+    chargeur = D.ChargeurReference()
+    chargeur.declarer_dossier(str(tmp_path))
+    chargeur.lancer().attendre()
+    assert 'multiplicative' in chargeur.etat()['evenements']['statut']
+    assert D.DONNEES_REFERENCE['evenements'] is D.EVENEMENTS_DEFAUT
+    D.obtenir_dashboard().get_cached_data("US Navy", D.SCENARIO_DEFAUT, 1990, 2000)
+
+
+def test_fin_vide_sans_limite(tmp_path, config, evenements_restaures):
+    avant = D.MoteurSimulation().evaluer(ANNEES, config)
+    source = table(evenement('Personnel_Milliers', 2020, np.nan, 'multiplicatif', 3.0))
+    source.to_csv(tmp_path / 'evenements.csv', index=False)
+    chargeur = D.ChargeurReference()
+    chargeur.declarer_dossier(str(tmp_path))
+    chargeur.lancer().attendre()
+    assert chargeur.etat()['evenements']['statut'] == 'chargée'
+    apres = D.MoteurSimulation().evaluer(ANNEES, config)
+    np.testing.assert_allclose(apres['Personnel_Milliers'], avant['Personnel_Milliers'] * np.where(ANNEES >= 2020, 3, 1))
+    np.testing.assert_allclose(apres['Budget_Defense_Mds'], avant['Budget_Defense_Mds'])
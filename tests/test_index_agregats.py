@@ -0,0 +1,75 @@
+"""Index des agrégats pays : une mise à jour incrémentale équivaut à une reconstruction complète"""
+import numpy as np
+import pytest
+
+import Dashboard as D
+
+
+def construire(entites, annees, indicateurs, valeurs, groupes):
+    return D.IndexAgregats(entites, annees, indicateurs, valeurs, groupes)
+
+
+def assert_index_egaux(index, reference):
+    np.testing.assert_allclose(index.sommes, reference.sommes, rtol=1e-12, atol=1e-9)
+    np.testing.assert_array_equal(index.rangs, reference.rangs)
+    np.testing.assert_array_equal(index.ordre, reference.ordre)
+    np.testing.assert_allclose(index.parts, reference.parts, rtol=1e-12)
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(1)
+    entites = [f"P{k}" for k in range(12)]
+    annees = np.arange(2000, 2010)
+    indicateurs = ['a', 'b', 'c']
+    # Valeurs entières : beaucoup d'égalités, départagées par l'ordre des entités
+    valeurs = rng.integers(0, 6, size=(len(entites), len(annees), len(indicateurs))).astype(float)
+    groupes = {'pairs': np.arange(12) % 2 == 0, 'premiers': np.arange(12) < 5, 'tous': np.ones(12, bool)}
+    return entites, annees, indicateurs, valeurs, groupes
+
+
+def test_mises_a_jour_successives(panel):
+    entites, annees, indicateurs, valeurs, groupes = panel
+    index = construire(*panel)
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        e = int(rng.integers(len(entites)))
+        valeurs = valeurs.copy()
+        valeurs[e] = rng.integers(0, 6, size=valeurs[e].shape)
+        index.mettre_a_jour(entites[e], valeurs[e])
+        assert_index_egaux(index, construire(entites, annees, indicateurs, valeurs, groupes))
+
+
+def test_requetes_apres_mise_a_jour(panel):
+    entites, annees, indicateurs, valeurs, groupes = panel
+    index = construire(*panel).mettre_a_jour('P3', np.full((len(annees), len(indicateurs)), 100.0))
+    assert index.rang('P3', 'b', 2005) == 1
+    noms, top = index.top(2, 'a', 2001)
+    assert noms[0] == 'P3' and top[0] == 100.0
+    assert index.total('premiers', 'c', 2009) == valeurs[:5, 9, 2].sum() - valeurs[3, 9, 2] + 100.0
+    assert index.part_cumulee(len(entites), 'a', 2000) == pytest.approx(1.0)
+
+
+def test_copie_independante(panel):
+    index = construire(*panel)
+    copie = index.copie().mettre_a_jour('P0', np.zeros((10, 3)))
+    assert_index_egaux(index, construire(*panel))
+    assert copie.total('tous', 'a', 2000) == panel[3][1:, 0, 0].sum()
+
+
+def test_ajustement_pays_identique_a_une_reconstruction():
+    dashboard = D.obtenir_dashboard()
+    ajuste = dashboard.get_country_index(D.SCENARIO_DEFAUT, ajustements=(('Allemagne', 1.5),))
+    panel = dashboard.get_country_panel(D.SCENARIO_DEFAUT)
+    _, configs = dashboard.get_country_configs()
+    e = ajuste.position['Allemagne']
+    config = dict(configs[e], budget_base=configs[e]['budget_base'] * 1.5)
+    valeurs = np.array(panel['valeurs'], dtype=np.float64)
+    valeurs[e] = dashboard.moteur.evaluer_pays(panel['annees'], [config], panel['indicateurs'], D.SCENARIO_DEFAUT)[0]
+    reference = construire(panel['pays']['Pays'], panel['annees'], panel['indicateurs'], valeurs,
+                           dashboard.define_country_groups(panel['pays']))
+    assert_index_egaux(ajuste, reference)
+    # L'index partagé n'est pas modifié
+    assert_index_egaux(dashboard.get_country_index(D.SCENARIO_DEFAUT),
+                       construire(panel['pays']['Pays'], panel['annees'], panel['indicateurs'], panel['valeurs'],
+                                  dashboard.define_country_groups(panel['pays'])))
@@ -0,0 +1,109 @@
+"""Moteur vectorisé : mêmes séries que les générateurs année par année d'origine"""
+import numpy as np
+import pytest
+
+import Dashboard as D
+
+
+# Générateurs d'origine (boucles Python), scénario par défaut, t = annee - 2000
+
+def budget_origine(annees, config):
+    budgets = []
+    for annee in annees:
+        base = config.get('budget_base', 850.0) * (1 + 0.045 * (annee - 2000))
+        if 2001 <= annee <= 2003:
+            base *= 1.25
+        elif 2008 <= annee <= 2010:
+            base *= 0.95
+        elif annee >= 2014:
+            base *= 1.08
+        budgets.append(base)
+    return budgets
+
+
+def readiness_origine(annees):
+    return [min(85 + 5 * (annee >= 2001) + 3 * (annee >= 2014) + 2 * (annee >= 2020), 95) for annee in annees]
+
+
+def dissuasion_origine(annees):
+    return [min(90 + 2 * (annee >= 2001) + 3 * (annee >= 2018), 96) for annee in annees]
+
+
+def exercices_conjoints_origine(annees):
+    return [50 if annee < 2001 else 80 + (annee - 2001) if annee < 2010 else 100 + 3 * (annee - 2010)
+            for annee in annees]
+
+
+def series_origine(annees, config):
+    t = [annee - 2000 for annee in annees]
+    series = {
+        'Budget_Defense_Mds': budget_origine(annees, config),
+        'Personnel_Milliers': [config.get('personnel_base', 1346) * (1 + 0.003 * x) for x in t],
+        'PIB_Militaire_Pourcent': [3.0 + 0.08 * x for x in t],
+        'Exercices_Militaires': [config.get('exercices_base', 280) + 8 * x + 12 * np.sin(2 * np.pi * x / 4) for x in t],
+        'Readiness_Operative': readiness_origine(annees),
+        'Capacite_Dissuasion': dissuasion_origine(annees),
+        'Temps_Mobilisation_Jours': [max(30 - 1.0 * x, 7) for x in t],
+        'Exercices_Conjoints': exercices_conjoints_origine(annees),
+        'Developpement_Technologique': [min(80 + 1.5 * x, 95) for x in t],
+        'Capacite_Navale': [min(85 + 1.0 * x, 95) for x in t],
+        'Couverture_AD': [min(80 + 1.2 * x, 94) for x in t],
+        'Cooperation_Alliances': [min(75 + 1.0 * x, 92) for x in t],
+        'Cyber_Capabilities': [min(85 + 1.8 * x, 96) for x in t],
+        'Production_Armements': [min(80 + 1.5 * x, 94) for x in t],
+        'Stock_Ogives_Nucleaires': [min(7000 - 50 * x, 5800) for x in t],
+        'Portee_Missiles_Km': [min(12000 + 100 * x, 15000) for x in t],
+        'Triade_Nucleaire': [min(95 + 0.2 * x, 98) for x in t],
+        'Porte_Avions': [min(11 + 0.1 * x, 12) for x in t],
+        'Sous_Marins': [min(70 + 0.5 * x, 75) for x in t],
+        'Projection_Maritime': [min(90 + 0.5 * x, 96) for x in t],
+        'Recherche_Defense': [min(85 + 1.0 * x, 95) for x in t],
+        'Technologies_Emergentes': [min(80 + 1.8 * x, 94) for x in t],
+        'Exportations_Armes': [min(15 + 0.8 * x, 35) for x in t],
+        # L'original concaténait les années >= 2014 avant le palier : même série, dans l'ordre chronologique
+        'Exercices_OTAN': [min(40 + 2 * (annee - 2014), 80) if annee >= 2014 else 20 for annee in annees],
+        'Partenariats_Strategiques': [min(60 + 1.5 * x, 88) for x in t],
+        'Bases_Etrangeres': [min(700 + 5 * x, 800) for x in t],
+    }
+    return {nom: series[nom] for nom in D.MoteurSimulation.indicateurs(config)}
+
+
+@pytest.fixture(scope='module')
+def dashboard():
+    return D.obtenir_dashboard()
+
+
+@pytest.mark.parametrize('selection', ["États-Unis - Vue d'Ensemble", "US Navy", "US Air Force",
+                                       "Alliances OTAN", "Branche générique"])
+def test_series_identiques_aux_generateurs_origine(dashboard, selection):
+    annees = list(range(2000, 2028))
+    config = dashboard.get_advanced_config(selection)
+    attendues = series_origine(annees, config)
+    obtenues = dashboard.moteur.evaluer(np.array(annees), config)
+    assert list(obtenues) == list(attendues)
+    for nom, valeurs in attendues.items():
+        np.testing.assert_allclose(obtenues[nom], valeurs, rtol=1e-12, err_msg=nom)
+
+
+def test_dataframe_genere(dashboard):
+    df, config = dashboard.generate_advanced_data("États-Unis - Vue d'Ensemble")
+    assert df['Annee'].tolist() == list(range(2000, 2028))
+    attendues = series_origine(list(range(2000, 2028)), config)
+    assert list(df.columns) == ['Annee'] + list(attendues)
+    for nom, valeurs in attendues.items():
+        # Stockage colonnaire float32
+        np.testing.assert_allclose(df[nom], valeurs, rtol=1e-6, err_msg=nom)
+
+
+def test_evaluation_par_lot_identique_a_l_evaluation_unitaire(dashboard):
+    moteur = dashboard.moteur
+    annees = moteur.periodes(1995, 2040, 12)
+    selections = ["États-Unis - Vue d'Ensemble", "US Navy"]
+    configs = [dashboard.get_advanced_config(selection) for selection in selections]
+    noms = D.MoteurSimulation.indicateurs(configs[0])
+    lot = moteur.evaluer_lot(annees, configs, list(D.SCENARIOS), noms)
+    for s, scenario in enumerate(D.SCENARIOS):
+        for c, config in enumerate(configs):
+            unitaire = moteur.evaluer(annees, config, noms, scenario)
+            for j, nom in enumerate(noms):
+                np.testing.assert_allclose(lot[s, c, j], unitaire[nom], rtol=1e-6, err_msg=nom)
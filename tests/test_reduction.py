@@ -0,0 +1,63 @@
+"""Réduction des courbes avant tracé : LTTB et min/max par paquet"""
+import numpy as np
+import pytest
+
+import Dashboard as D
+
+
+@pytest.fixture
+def courbe():
+    x = 2000 + np.arange(20000) / 365
+    rng = np.random.default_rng(0)
+    return x, np.sin(x) * 10 + rng.standard_normal(len(x))
+
+
+def test_lttb_nombre_de_points_et_extremites(courbe):
+    x, y = courbe
+    indices = D.indices_lttb(x, y, 1500)
+    assert len(indices) == 1500
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_un_point_par_paquet(courbe):
+    x, y = courbe
+    n_max = 100
+    indices = D.indices_lttb(x, y, n_max)
+    bords = np.linspace(1, len(x) - 1, n_max - 1).astype(np.intp)
+    for k, indice in enumerate(indices[1:-1]):
+        assert bords[k] <= indice < bords[k + 1]
+
+
+def test_minmax_garde_les_extremes(courbe):
+    x, y = courbe
+    n_max = 1000
+    indices = D.indices_minmax(y, n_max)
+    assert len(indices) <= n_max
+    assert np.all(np.diff(indices) > 0)
+    assert np.argmin(y) in indices and np.argmax(y) in indices
+    # Chaque paquet contribue son minimum et son maximum
+    taille = -(-len(y) // (n_max // 2))
+    for debut in range(0, len(y), taille):
+        paquet = y[debut:debut + taille]
+        assert debut + np.argmin(paquet) in indices and debut + np.argmax(paquet) in indices
+
+
+@pytest.mark.parametrize('methode', ['lttb', 'minmax'])
+def test_reduire_serie(courbe, methode):
+    x, y = courbe
+    xr, yr = D.reduire_serie(x, y, 1500, methode)
+    assert len(xr) == len(yr) <= 1500
+    if methode == 'lttb':
+        assert xr[0] == x[0] and xr[-1] == x[-1]
+    # Les points retenus sont des points de la courbe
+    positions = np.searchsorted(x, xr)
+    np.testing.assert_array_equal(y[positions], yr)
+
+
+@pytest.mark.parametrize('methode', ['lttb', 'minmax'])
+def test_courbe_courte_inchangee(methode):
+    x, y = np.arange(28), np.arange(28) ** 2
+    xr, yr = D.reduire_serie(x, y, 1500, methode)
+    np.testing.assert_array_equal(xr, x)
+    np.testing.assert_array_equal(yr, y)